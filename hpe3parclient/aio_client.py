@@ -0,0 +1,794 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" AsyncHPE3ParClient.
+
+.. module: aio_client
+
+:Description: This is the asyncio version of the 3PAR REST Client. It covers
+ the volume, host, VLUN, CPG, volume set, port, task and system calls of
+ HPE3ParClient with the same arguments, return values and exceptions, as
+ coroutines. It requires Python 3.5+ and the aiohttp package.
+
+.. code-block:: python
+
+    async with AsyncHPE3ParClient(url) as cl:
+        await cl.login(user, password)
+        volumes = await asyncio.gather(*[cl.getVolume(name)
+                                         for name in names])
+        await cl.logout()
+
+"""
+
+import asyncio
+import functools
+
+from hpe3parclient import aio_http
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import metrics
+from hpe3parclient import query
+from hpe3parclient import tracing
+
+
+class AsyncHPE3ParClient(object):
+    """ The 3PAR REST API Client, for asyncio.
+
+    Unlike HPE3ParClient the constructor does not talk to the array, the
+    WSAPI version check is made by :meth:`login`.
+
+    :param api_url: The url to the WSAPI service on 3PAR
+                    ie. http://<3par server>:8080/api/v1
+    :type api_url: str
+    :param concurrency: The maximum number of requests this client has in
+                        flight at once. None for no limit
+    :type concurrency: int
+
+    The remaining parameters are the same as for
+    :class:`~hpe3parclient.client.HPE3ParClient`.
+
+    """
+
+    # Set by setTracer.
+    tracer = None
+
+    def __init__(self, api_url, debug=False, secure=False, timeout=None,
+                 suppress_ssl_warnings=False, pool_maxsize=10,
+                 keep_alive=True, retry_policy=None, concurrency=None,
+                 max_timings=0, response_cache=None, coalesce_gets=True,
+                 session_store=None, session_max_age=None,
+                 circuit_breaker=None):
+        self.api_url = api_url
+        self.metrics = metrics.MetricsHooks()
+        self.http = aio_http.AsyncHTTPJSONRESTClient(
+            self.api_url, secure=secure,
+            timeout=timeout, suppress_ssl_warnings=suppress_ssl_warnings,
+            pool_maxsize=pool_maxsize, keep_alive=keep_alive,
+            retry_policy=retry_policy, max_timings=max_timings,
+            metrics_hooks=self.metrics, response_cache=response_cache,
+            coalesce_gets=coalesce_gets, session_store=session_store,
+            session_max_age=session_max_age,
+            circuit_breaker=circuit_breaker)
+        self.vlun_query_supported = False
+        self.primera_supported = False
+        self.compression_supported = False
+        self.concurrency = concurrency
+        self._semaphore = None
+        self._api_version_checked = False
+
+        self.debug_rest(debug)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def setTracer(self, tracer):
+        """Record tracing spans of the calls made through this client.
+
+        :param tracer: The tracer, None to stop tracing
+        :type tracer: :class:`~hpe3parclient.tracing.Tracer`
+
+        """
+        if self.tracer is not None:
+            self.metrics.unregister(self.tracer)
+        self.tracer = tracer
+        if tracer is not None:
+            self.metrics.register(tracer)
+
+    def debug_rest(self, flag):
+        """This is useful for debugging requests to 3PAR.
+
+        :param flag: set to True to enable debugging
+        :type flag: bool
+
+        """
+        self.http.set_debug_flag(flag)
+
+    def is_primera_array(self):
+        return self.primera_supported
+
+    async def close(self):
+        """This closes every pooled connection held by this client.
+
+        :returns: None
+
+        """
+        await self.http.close()
+
+    async def _get(self, url, **kwargs):
+        return await self._limit(self.http.get(url, **kwargs))
+
+    async def _post(self, url, **kwargs):
+        return await self._limit(self.http.post(url, **kwargs))
+
+    async def _put(self, url, **kwargs):
+        return await self._limit(self.http.put(url, **kwargs))
+
+    async def _delete(self, url, **kwargs):
+        return await self._limit(self.http.delete(url, **kwargs))
+
+    async def _limit(self, coro):
+        if self.concurrency is None:
+            return await coro
+        # The semaphore binds to the running loop, so create it lazily.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await coro
+
+    async def _queryCollection(self, collection, where):
+        collections = client.HPE3ParClient.QUERY_COLLECTIONS
+        vluns = collection != 'vluns' or self.vlun_query_supported
+        supported = collection in collections and vluns
+        url, pushed = query.collection_url(collection, where, supported)
+        response, body = await self._get(url)
+        if not pushed:
+            body = query.select(body, where)
+        return body
+
+    async def getWsApiVersion(self):
+        """Get the 3PAR WS API version.
+
+        :returns: Version dict
+
+        """
+        # remove everything down to host:port
+        host_url = self.api_url.split('/api')
+        http = aio_http.AsyncHTTPJSONRESTClient(
+            host_url[0], secure=self.http.secure, timeout=self.http.timeout,
+            retry_policy=self.http.retry_policy)
+        try:
+            # get the api version
+            response, body = await http.get('/api')
+            return body
+        finally:
+            await http.close()
+
+    async def _checkWsApiVersion(self):
+        try:
+            api_version = await self.getWsApiVersion()
+        except exceptions.ClientException as ex:
+            ex_desc = ex.get_description()
+            if ex_desc and "SSL Certificate Verification Failed" in ex_desc:
+                raise exceptions.SSLCertFailed()
+            msg = ('Error: \'%s\' - Error communicating with the 3PAR WS. '
+                   'Check proxy settings. If error persists, either the '
+                   '3PAR WS is not running or the version of the WS is '
+                   'not supported.') % ex_desc
+            raise exceptions.UnsupportedVersion(msg)
+
+        (self.vlun_query_supported, self.primera_supported,
+         self.compression_supported) = \
+            client.HPE3ParClient._checkWsApiVersion(api_version)
+        self._api_version_checked = True
+
+    async def login(self, username, password, optional=None):
+        """This checks the WSAPI version, then authenticates against the
+           3PAR wsapi server and creates a session.
+
+        :param username: The username
+        :type username: str
+        :param password: The Password
+        :type password: str
+
+        :returns: None
+        :raises: :class:`~hpe3parclient.exceptions.UnsupportedVersion`
+            - The WSAPI is not running or is too old
+
+        """
+        if not self._api_version_checked:
+            await self._checkWsApiVersion()
+        await self.http.authenticate(username, password, optional)
+
+    async def logout(self):
+        """This destroys the session and logs out from the 3PAR server.
+
+        :returns: None
+
+        """
+        await self.http.unauthenticate()
+
+    async def getStorageSystemInfo(self):
+        """Get the Storage System Information
+
+        :returns: Dictionary of Storage System Info
+
+        """
+        response, body = await self._get('/system')
+        return body
+
+    async def getWSAPIConfigurationInfo(self):
+        """Get the WSAPI Configuration Information.
+
+        :returns: Dictionary of WSAPI configurations
+
+        """
+        response, body = await self._get('/wsapiconfiguration')
+        return body
+
+    async def getOverallSystemCapacity(self):
+        """Get the overall system capacity for the 3PAR server.
+
+        :returns: Dictionary of system capacity information
+
+        """
+        response, body = await self._get('/capacity')
+        return body
+
+    # Volume methods
+    async def getVolumes(self, fields=None):
+        """Get the list of Volumes
+
+        :param fields: Keep only these keys of every Volume. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: list of Volumes
+
+        """
+        if fields is not None:
+            return await self._limit(self.http.get_members('/volumes', fields))
+        response, body = await self._get('/volumes')
+        return body
+
+    async def getVolume(self, name):
+        """Get information about a volume.
+
+        :param name: The name of the volume to find
+        :type name: str
+
+        :returns: volume
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_VOL - volume doesn't exist
+
+        """
+        response, body = await self._get('/volumes/%s' % name)
+        return body
+
+    async def createVolume(self, name, cpgName, sizeMiB, optional=None):
+        """Create a new volume.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.createVolume`.
+
+        :param name: the name of the volume
+        :type name: str
+        :param cpgName: the name of the destination CPG
+        :type cpgName: str
+        :param sizeMiB: size in MiB for the volume
+        :type sizeMiB: int
+        :param optional: dict of other optional items
+        :type optional: dict
+
+        """
+        info = {'name': name, 'cpg': cpgName, 'sizeMiB': sizeMiB}
+        if not optional and self.primera_supported:
+            optional = {'tpvv': True}
+        if optional:
+            if self.primera_supported:
+                client.HPE3ParClient._convertPrimeraVolumeOptions(optional)
+            info = client.HPE3ParClient._mergeDict(info, optional)
+
+        response, body = await self._post('/volumes', body=info)
+        return body
+
+    async def deleteVolume(self, name):
+        """Delete a volume.
+
+        :param name: the name of the volume
+        :type name: str
+
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_VOL - The volume does not exist
+        :raises: :class:`~hpe3parclient.exceptions.HTTPConflict`
+            - IN_USE - The volume is in use by VV set, VLUN, etc
+
+        """
+        response, body = await self._delete('/volumes/%s' % name)
+        return body
+
+    async def modifyVolume(self, name, volumeMods):
+        """Modify a volume.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.modifyVolume`.
+
+        :param name: the name of the volume
+        :type name: str
+        :param volumeMods: dictionary of volume attributes to change
+        :type volumeMods: dict
+
+        """
+        response, body = await self._put('/volumes/%s' % name,
+                                         body=volumeMods)
+        return body
+
+    async def growVolume(self, name, amount):
+        """Grow an existing volume by 'amount' Mebibytes.
+
+        :param name: the name of the volume
+        :type name: str
+        :param amount: the additional size in MiB to add, rounded up to the
+                       next chunklet size (e.g. 256 or 1000 MiB)
+        :type amount: int
+
+        """
+        info = {'action': client.HPE3ParClient.GROW_VOLUME,
+                'sizeMiB': int(amount)}
+
+        response, body = await self._put('/volumes/%s' % name, body=info)
+        return body
+
+    async def copyVolume(self, src_name, dest_name, dest_cpg, optional=None):
+        """Copy/Clone a volume.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.copyVolume`.
+
+        :param src_name: the source volume name
+        :type src_name: str
+        :param dest_name: the destination volume name
+        :type dest_name: str
+        :param dest_cpg: the destination CPG
+        :type dest_cpg: str
+        :param optional: Dictionary of optional params
+        :type optional: dict
+
+        """
+        # Virtual volume sets are not supported with the -online option
+        parameters = {'destVolume': dest_name,
+                      'destCPG': dest_cpg}
+        if optional:
+            if self.primera_supported:
+                client.HPE3ParClient._convertPrimeraVolumeOptions(optional)
+            parameters = client.HPE3ParClient._mergeDict(parameters,
+                                                         optional)
+        if 'online' not in parameters or not parameters['online']:
+            # 3Par won't allow destCPG to be set if it's not an online copy.
+            parameters.pop('destCPG', None)
+
+        info = {'action': 'createPhysicalCopy',
+                'parameters': parameters}
+
+        try:
+            response, body = await self._post('/volumes/%s' % src_name,
+                                              body=info)
+            return body
+        except exceptions.HTTPBadRequest as ex:
+            if self.primera_supported:
+                raise client.HPE3ParClient._convertPrimeraCopyError(ex)
+            raise ex
+
+    async def createSnapshot(self, name, copyOfName, optional=None):
+        """Create a snapshot of an existing Volume.
+
+        :param name: Name of the Snapshot
+        :type name: str
+        :param copyOfName: The volume you want to snapshot
+        :type copyOfName: str
+        :param optional: Dictionary of optional params
+        :type optional: dict
+
+        """
+        parameters = {'name': name}
+        if optional:
+            parameters = client.HPE3ParClient._mergeDict(parameters,
+                                                         optional)
+
+        info = {'action': 'createSnapshot',
+                'parameters': parameters}
+
+        response, body = await self._post('/volumes/%s' % copyOfName,
+                                          body=info)
+        return body
+
+    # Task methods
+    async def getAllTasks(self):
+        """Get the list of all Tasks
+
+        :returns: list of all Tasks
+
+        """
+        response, body = await self._get('/tasks')
+        return body
+
+    async def getTask(self, taskId):
+        """Get the status of a task.
+
+        :param taskId: the task id
+        :type taskId: int
+
+        :returns: the status of the task
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_TASK - Task with the specified task ID does not
+            exist.
+
+        """
+        response, body = await self._get('/tasks/%s' % taskId)
+        return body
+
+    # Host methods
+    async def getHosts(self, fields=None):
+        """Get information about every Host on the 3Par array.
+
+        :param fields: Keep only these keys of every Host. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: list of Hosts
+
+        """
+        if fields is not None:
+            return await self._limit(self.http.get_members('/hosts', fields))
+        response, body = await self._get('/hosts')
+        return body
+
+    async def getHost(self, name):
+        """Get information about a Host.
+
+        :param name: The name of the Host to find
+        :type name: str
+
+        :returns: host dict
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_HOST - HOST doesn't exist
+
+        """
+        response, body = await self._get('/hosts/%s' % name)
+        return body
+
+    async def createHost(self, name, iscsiNames=None, FCWwns=None,
+                         optional=None):
+        """Create a new Host entry.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.createHost`.
+
+        :param name: The name of the host
+        :type name: str
+        :param iscsiNames: Array if iscsi iqns
+        :type name: array
+        :param FCWwns: Array if Fibre Channel World Wide Names
+        :type name: array
+        :param optional: The optional stuff
+        :type optional: dict
+
+        """
+        info = {'name': name}
+
+        if iscsiNames:
+            info['iSCSINames'] = iscsiNames
+
+        if FCWwns:
+            info['FCWWNs'] = FCWwns
+
+        if optional:
+            info = client.HPE3ParClient._mergeDict(info, optional)
+
+        response, body = await self._post('/hosts', body=info)
+        return body
+
+    async def modifyHost(self, name, mod_request):
+        """Modify an existing Host entry.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.modifyHost`.
+
+        :param name: The name of the host
+        :type name: str
+        :param mod_request: Objects for Host Modification Request
+        :type mod_request: dict
+
+        """
+        response = await self._put('/hosts/%s' % name, body=mod_request)
+        return response
+
+    async def deleteHost(self, name):
+        """Delete a Host.
+
+        :param name: Host Name
+        :type name: str
+
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_HOST - HOST Not Found
+
+        """
+        response, body = await self._delete('/hosts/%s' % name)
+
+    async def getHostVLUNs(self, hostName):
+        """Get all of the VLUNs on a specific Host.
+
+        :param hostName: Host name
+        :type hostNane: str
+
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_HOST - HOST Not Found
+
+        """
+        # calling getHost to see if the host exists and raise not found
+        # exception if it's not found.
+        await self.getHost(hostName)
+
+        body = await self._queryCollection('vluns',
+                                           query.Eq('hostname', hostName))
+        vluns = body.get('members', [])
+
+        if len(vluns) < 1:
+            raise exceptions.HTTPNotFound(
+                {'code': 'NON_EXISTENT_VLUNS',
+                 'desc': "No VLUNs for host '%s' found" % hostName})
+        return vluns
+
+    # Port methods
+    async def getPorts(self):
+        """Get the list of ports on the 3PAR.
+
+        The iSCSI VLAN information that HPE3ParClient merges in over SSH is
+        not available here.
+
+        :returns: list of Ports
+
+        """
+        response, body = await self._get('/ports')
+        return body
+
+    # CPG methods
+    async def getCPGs(self, fields=None):
+        """Get entire list of CPGs.
+
+        :param fields: Keep only these keys of every CPG. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: list of cpgs
+
+        """
+        if fields is not None:
+            return await self._limit(self.http.get_members('/cpgs', fields))
+        response, body = await self._get('/cpgs')
+        return body
+
+    async def getCPG(self, name):
+        """Get information about a CPG.
+
+        :param name: The name of the CPG to find
+        :type name: str
+
+        :returns: cpg dict
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            -  NON_EXISTENT_CPG - CPG doesn't exist
+
+        """
+        response, body = await self._get('/cpgs/%s' % name)
+        return body
+
+    async def getCPGAvailableSpace(self, name):
+        """Get available space information about a CPG.
+
+        :param name: The name of the CPG to find
+        :type name: str
+
+        :returns: Available space dict
+
+        """
+        info = {'cpg': name}
+
+        response, body = await self._post('/spacereporter', body=info)
+        return body
+
+    # VLUN methods
+    async def getVLUNs(self, fields=None):
+        """Get VLUNs.
+
+        :param fields: Keep only these keys of every VLUN. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: Array of VLUNs
+
+        """
+        if fields is not None:
+            return await self._limit(self.http.get_members('/vluns', fields))
+        response, body = await self._get('/vluns')
+        return body
+
+    async def getVLUN(self, volumeName):
+        """Get information about a VLUN.
+
+        :param volumeName: The volume name of the VLUN to find
+        :type name: str
+
+        :returns: VLUN
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            -  NON_EXISTENT_VLUN - VLUN doesn't exist
+
+        """
+        body = await self._queryCollection(
+            'vluns', query.Eq('volumeName', volumeName))
+        # Return the first VLUN found for the volume.
+        for vlun in body.get('members', []):
+            return vlun
+
+        raise exceptions.HTTPNotFound({'code': 'NON_EXISTENT_VLUN',
+                                       'desc': "VLUN '%s' was not found" %
+                                               volumeName})
+
+    async def createVLUN(self, volumeName, lun=None, hostname=None,
+                         portPos=None, noVcn=None,
+                         overrideLowerPriority=None, auto=False):
+        """Create a new VLUN.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.createVLUN`.
+
+        :returns: the location of the VLUN
+
+        """
+        info = {'volumeName': volumeName}
+
+        if lun is not None:
+            info['lun'] = lun
+
+        if hostname:
+            info['hostname'] = hostname
+
+        if portPos:
+            info['portPos'] = portPos
+
+        if noVcn:
+            info['noVcn'] = noVcn
+
+        if overrideLowerPriority:
+            info['overrideLowerPriority'] = overrideLowerPriority
+
+        if auto:
+            info['autoLun'] = True
+            info['maxAutoLun'] = 0
+            info['lun'] = 0
+
+        headers, body = await self._post('/vluns', body=info)
+        if headers:
+            location = headers['location'].replace('/api/v1/vluns/', '')
+            return location
+        else:
+            return None
+
+    async def deleteVLUN(self, volumeName, lunID, hostname=None, port=None):
+        """Delete a VLUN.
+
+        See :meth:`~hpe3parclient.client.HPE3ParClient.deleteVLUN`.
+
+        :param volumeName: the volume name of the VLUN
+        :type name: str
+        :param lunID: The LUN ID
+        :type lunID: int
+        :param hostname: Name of the host which the volume is exported.
+                         For VLUN of port type,the value is empty
+        :type hostname: str
+        :param port: The system port of the VLUN export
+        :type port: dict
+
+        """
+        vlun = "%s,%s" % (volumeName, lunID)
+
+        if hostname:
+            vlun += ",%s" % hostname
+        else:
+            if port:
+                vlun += ","
+
+        if port:
+            vlun += ",%s:%s:%s" % (port['node'],
+                                   port['slot'],
+                                   port['cardPort'])
+
+        response, body = await self._delete('/vluns/%s' % vlun)
+
+    # VolumeSet methods
+    async def getVolumeSets(self):
+        """Get Volume Sets
+
+        :returns: Array of Volume Sets
+
+        """
+        response, body = await self._get('/volumesets')
+        return body
+
+    async def getVolumeSet(self, name):
+        """Get information about a Volume Set
+
+        :param name: The name of the Volume Set to find
+        :type name: str
+
+        :returns: Volume Set
+        :raises: :class:`~hpe3parclient.exceptions.HTTPNotFound`
+            - NON_EXISTENT_SET - The set doesn't exist
+
+        """
+        response, body = await self._get('/volumesets/%s' % name)
+        return body
+
+    async def createVolumeSet(self, name, domain=None, comment=None,
+                              setmembers=None):
+        """This creates a new volume set
+
+        :param name: the volume set to create
+        :type set_name: str
+        :param domain: the domain where the set lives
+        :type domain: str
+        :param comment: the comment for on the vv set
+        :type comment: str
+        :param setmembers: the vv(s) to add to the set, the existence of the
+                           vv(s) will not be checked
+        :type setmembers: array
+
+        """
+        info = {'name': name}
+
+        if domain:
+            info['domain'] = domain
+
+        if comment:
+            info['comment'] = comment
+
+        if setmembers:
+            info['setmembers'] = setmembers
+
+        response, body = await self._post('/volumesets', body=info)
+
+    async def deleteVolumeSet(self, name):
+        """This removes a volume set. You must clear all QOS rules before a
+           volume set can be deleted.
+
+        :param name: the volume set to remove
+        :type name: str
+
+        """
+        response, body = await self._delete('/volumesets/%s' % name)
+
+
+def _traced_async(func):
+    """The coroutine version of :func:`~hpe3parclient.tracing.traced`."""
+    if not asyncio.iscoroutinefunction(func):
+        return tracing.traced(func)
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return await func(self, *args, **kwargs)
+        with tracer.start_span(name):
+            return await func(self, *args, **kwargs)
+    return wrapper
+
+
+tracing.trace_methods(AsyncHPE3ParClient, decorator=_traced_async,
+                      exclude=('setTracer',))
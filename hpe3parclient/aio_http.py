@@ -0,0 +1,618 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" AsyncHTTPJSONRESTClient.
+
+.. module: aio_http
+
+:Description: This is the asyncio version of the HTTP Client. It sends the
+ same requests and raises the same exceptions as HTTPJSONRESTClient, but
+ over aiohttp so that many calls can be in flight from one event loop.
+ It requires Python 3.5+ and the aiohttp package.
+
+"""
+
+import asyncio
+import collections
+import contextvars
+import threading
+import time
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import jsonstream
+from hpe3parclient import metrics
+from hpe3parclient import retry
+
+
+class AsyncHTTPJSONRESTClient(http.HTTPJSONRESTClient):
+    """
+    An asyncio HTTP REST Client that sends and recieves JSON data as the body
+    of the HTTP request.
+
+    The aiohttp session is created on the first request, from inside the
+    running event loop, and must be released with :meth:`close`.
+
+    :param api_url: The url to the WSAPI service on 3PAR
+                    ie. http://<3par server>:8080
+    :type api_url: str
+    :param secure: Validate SSL cert? Default will not validate
+    :type secure: bool
+    :param http_log_debug: Turns on http log debugging. Default will not log
+    :type http_log_debug: bool
+    :param suppress_ssl_warnings: Unused, kept for signature compatibility
+                                  with HTTPJSONRESTClient
+    :type suppress_ssl_warnings: bool
+    :param timeout: The total timeout in seconds of a single attempt
+    :type timeout: float
+    :param pool_maxsize: The maximum number of connections kept open per
+                         host. Default is 10
+    :type pool_maxsize: int
+    :param keep_alive: Reuse TCP connections (and therefore their TLS
+                       sessions) between requests. Default is True
+    :type keep_alive: bool
+    :param retry_policy: How failed requests are retried. Default is a
+                         :class:`~hpe3parclient.retry.RetryPolicy` with its
+                         default settings
+    :type retry_policy: RetryPolicy
+    :param max_timings: Keep the raw timings of the last max_timings
+                        requests for get_timings. Default keeps none
+    :type max_timings: int
+    :param metrics_hooks: The hooks every request reports to. Default is a
+                          new :class:`~hpe3parclient.metrics.MetricsHooks`
+    :type metrics_hooks: MetricsHooks
+    :param response_cache: Cache GET responses in this cache, writes made
+                           through this client evict the entries they
+                           affect. Default does not cache
+    :type response_cache: :class:`~hpe3parclient.cache.ResponseCache`
+    :param coalesce_gets: Let concurrent identical GETs share one request
+                          to the array. Default is True
+    :type coalesce_gets: bool
+    :param session_store: Share session keys with the other clients using
+                          this store. Default does not share them
+    :type session_store: :class:`~hpe3parclient.session_store.SessionStore`
+    :param session_max_age: Log in again before sending a request once the
+                            session is this many seconds old. Default only
+                            logs in again after a 401 or 403
+    :type session_max_age: float
+    :param circuit_breaker: Fail requests at once while this breaker is
+                            open. Default never fails fast
+    :type circuit_breaker: :class:`~hpe3parclient.breaker.CircuitBreaker`
+
+    """
+
+    # The connection was never established, retry any verb.
+    safe_exceptions = (aiohttp.ClientConnectorError,)
+
+    # The connection dropped after the request may have been sent, only
+    # retry idempotent verbs.
+    idempotent_exceptions = (aiohttp.ServerDisconnectedError,
+                             aiohttp.ClientOSError)
+
+    circuit_exceptions = safe_exceptions + idempotent_exceptions
+    circuit_exceptions += (asyncio.TimeoutError,)
+
+    def __init__(self, api_url, secure=False, http_log_debug=False,
+                 suppress_ssl_warnings=False, timeout=None,
+                 pool_maxsize=10, keep_alive=True, retry_policy=None,
+                 max_timings=0, metrics_hooks=None,
+                 response_cache=None, coalesce_gets=True,
+                 session_store=None, session_max_age=None,
+                 circuit_breaker=None):
+        self.session_key = None
+        self.session_store = session_store
+        self._session_id = None
+        self.session_time = None
+        self.session_max_age = session_max_age
+        # The task logging in again while the others wait, if any.
+        self._refresher = None
+        self._refresh_done = None
+        self.session = None
+        self.keep_alive = keep_alive
+        self.pool_maxsize = pool_maxsize
+        self._pool_stats = {'hits': 0, 'misses': 0}
+
+        if retry_policy is None:
+            retry_policy = retry.RetryPolicy()
+        self.retry_policy = retry_policy
+        self._retry_lock = threading.Lock()
+        self._retry_stats = {'requests': 0, 'attempts': 0, 'retries': 0,
+                             'exhausted': 0}
+        self._last_retry_state = contextvars.ContextVar(
+            'hpe3parclient_retry_state', default=None)
+
+        # should be http://<Server:Port>/api/v1
+        self.set_url(api_url)
+        self.set_debug_flag(http_log_debug)
+
+        # [("item", starttime, endtime), ...], only the most recent ones.
+        self.times = collections.deque(maxlen=max_timings)
+        self.latency = metrics.LatencyRecorder()
+        self.decode_latency = metrics.LatencyRecorder()
+        if metrics_hooks is None:
+            metrics_hooks = metrics.MetricsHooks()
+        self.metrics = metrics_hooks
+        self.response_cache = response_cache
+        # The concurrency of the async client is limited by
+        # AsyncHPE3ParClient.
+        self.concurrency_limiter = None
+        self.circuit_breaker = circuit_breaker
+        # {url: _InFlightGet}, the GETs currently awaited.
+        self.coalesce_gets = coalesce_gets
+        self._in_flight_lock = threading.Lock()
+        self._in_flight = {}
+        self._coalesce_stats = {'requests': 0, 'coalesced': 0}
+        self.secure = secure
+        self.timeout = timeout
+
+    def _get_session(self):
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.pool_maxsize,
+                force_close=not self.keep_alive,
+                ssl=None if self.secure else False)
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(
+                self._on_connection_create)
+            trace_config.on_connection_reuseconn.append(
+                self._on_connection_reuse)
+            self.session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[trace_config])
+        return self.session
+
+    async def _on_connection_create(self, session, context, params):
+        self._pool_stats['misses'] += 1
+
+    async def _on_connection_reuse(self, session, context, params):
+        self._pool_stats['hits'] += 1
+
+    async def close(self):
+        """
+        This closes every pooled connection held by this client.
+
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def get_pool_stats(self):
+        """
+        This gives the connection pool counters of this client.
+
+        A hit is a request that was sent over an already open connection,
+        a miss is a request that had to open a new connection first.
+
+        :returns: dict - {'hits': int, 'misses': int, 'pools': int}
+
+        """
+        stats = dict(self._pool_stats)
+        stats['pools'] = 1 if self.session is not None else 0
+        return stats
+
+    def get_last_retry_state(self):
+        """
+        This gives the retry bookkeeping of the last request made by the
+        calling task, including the latency of every attempt.
+
+        :returns: :class:`~hpe3parclient.retry.RetryState` or None
+
+        """
+        return self._last_retry_state.get()
+
+    def _record_retry_state(self, retry_state):
+        self._last_retry_state.set(retry_state)
+        with self._retry_lock:
+            self._retry_stats['requests'] += 1
+            self._retry_stats['attempts'] += len(retry_state.attempts)
+            self._retry_stats['retries'] += retry_state.retries
+            if retry_state.exhausted:
+                self._retry_stats['exhausted'] += 1
+
+    async def authenticate(self, user, password, optional=None):
+        """
+        This tries to create an authenticated session with the 3PAR server
+
+        :param user: The username
+        :type user: str
+        :param password: Password
+        :type password: str
+
+        """
+        # this prevens re-auth attempt if auth fails
+        self.auth_try = 1
+        self.session_key = None
+
+        info = {'user': user, 'password': password}
+        self._auth_optional = None
+
+        if optional:
+            self._auth_optional = optional
+            info.update(optional)
+
+        if not self._use_stored_session(user, password, optional):
+            resp, body = await self.post('/credentials', body=info)
+            self.session_time = time.time()
+            if body and 'key' in body:
+                self.session_key = body['key']
+                unused_key = self._store_session()
+                if unused_key is not None:
+                    await self._delete_session(unused_key)
+        self.auth_try = 0
+        self.user = user
+        self.password = password
+
+    async def _delete_session(self, key):
+        try:
+            await self._time_request(self.api_url + '/credentials/%s' % key,
+                                     'DELETE')
+        except exceptions.ClientException as ex:
+            AsyncHTTPJSONRESTClient._logger.warning(
+                "Failed to delete an unused session: %s", ex)
+
+    async def _reauth(self):
+        await self.authenticate(self.user, self.password,
+                                self._auth_optional)
+
+    async def _wait_for_refresh(self):
+        current = asyncio.current_task()
+        while self._refresher not in (None, current):
+            await self._refresh_done.wait()
+
+    async def _refresh_session(self, old_key, method, url, proactive=False):
+        await self._wait_for_refresh()
+        if self.session_key != old_key:
+            return False
+        self._refresher = asyncio.current_task()
+        self._refresh_done = asyncio.Event()
+        try:
+            self.metrics.emit(metrics.MetricsHooks.HTTP_REAUTH,
+                              method=method, route=self._route(url),
+                              proactive=proactive)
+            old_key = self._drop_session(proactive)
+            await self._reauth()
+            if old_key is not None:
+                await self._delete_session(old_key)
+        finally:
+            self._refresher = None
+            self._refresh_done.set()
+        return True
+
+    async def unauthenticate(self):
+        """
+        This clears the authenticated session with the 3PAR server. With
+        a session store, only the last client holding the session deletes
+        it on the array.
+
+        """
+        if self._release_stored_session():
+            # delete the session on the 3Par
+            await self.delete('/credentials/%s' % self.session_key)
+        self.session_key = None
+
+    async def request(self, *args, **kwargs):
+        """
+        This makes an HTTP Request to the 3Par server.
+        You should use get, post, delete instead.
+
+        With stream=True the body of a successful response is not read,
+        the aiohttp response it is read from is returned in its place.
+
+        """
+        stream = kwargs.pop('stream', False)
+        payload = self._prepare_request(kwargs)
+
+        # args[0] contains the URL, args[1] contains the HTTP verb/method
+        http_url = args[0]
+        http_method = args[1]
+
+        self._http_log_req(args, kwargs)
+        session = self._get_session()
+        request_timeout = None
+        if self.timeout:
+            request_timeout = aiohttp.ClientTimeout(total=self.timeout)
+        retry_state = self.retry_policy.new_state(http_method)
+        retry_state.session_key = kwargs['headers'].get(
+            self.SESSION_COOKIE_NAME)
+        retry_exceptions = self.safe_exceptions + self.idempotent_exceptions
+        retry_exceptions += self.retry_policy.safe_exceptions
+        while True:
+            try:
+                # Waits for the backoff delay if this is a retry, without
+                # blocking the event loop.
+                if retry_state.pending_delay:
+                    await asyncio.sleep(retry_state.pending_delay)
+                retry_state.begin_attempt()
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.allow_request()
+
+                r = await session.request(http_method, http_url,
+                                          data=payload,
+                                          headers=kwargs['headers'],
+                                          timeout=request_timeout)
+                # The caller reads the body, see iter_members.
+                streamed = stream and r.status < 400
+                try:
+                    body = None if streamed else await r.read()
+                finally:
+                    if not streamed:
+                        r.release()
+                status = r.status
+                url = str(r.url)
+                headers = CaseInsensitiveDict(r.headers)
+                retry_state.end_attempt(status=status)
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_success()
+                retry_state.bytes_sent = len(payload) if payload else 0
+                if not streamed:
+                    retry_state.bytes_received = len(body)
+
+                resp, body = self._process_response(headers, status, url,
+                                                    body, retry_state)
+                if streamed:
+                    body = r
+                break
+            except aiohttp.ClientSSLError as err:
+                AsyncHTTPJSONRESTClient._logger.error(
+                    "SSL certificate verification failed: (%s). You must have "
+                    "a valid SSL certificate or disable SSL "
+                    "verification.", err)
+                raise exceptions.SSLCertFailed("SSL Certificate Verification "
+                                               "Failed.")
+            except retry_exceptions as ex:
+                if retry_state.in_attempt:
+                    retry_state.end_attempt(error=ex)
+                    self._record_circuit_failure(ex)
+
+                # ClientConnectorError is also a ClientOSError, so the
+                # safe exceptions are looked at first. The others are the
+                # policy's, which classifies them itself.
+                safe = None
+                if isinstance(ex, self.safe_exceptions):
+                    safe = True
+                elif isinstance(ex, self.idempotent_exceptions):
+                    safe = False
+                if not retry_state.should_retry(ex, safe=safe):
+                    self._record_retry_state(retry_state)
+                    if isinstance(ex, exceptions.ClientException):
+                        raise
+                    raise exceptions.RequestException(
+                        "Request Exception: %s" % ex)
+            except exceptions.ClientException:
+                self._record_retry_state(retry_state)
+                raise
+            except asyncio.TimeoutError as err:
+                self._record_circuit_failure(err)
+                raise exceptions.Timeout("Timeout: %s" % err)
+            except aiohttp.TooManyRedirects as err:
+                raise exceptions.TooManyRedirects(
+                    "Too Many Redirects: %s" % err)
+            except aiohttp.InvalidURL as err:
+                raise exceptions.URLRequired("URL Required: %s" % err)
+            except aiohttp.ClientResponseError as err:
+                raise exceptions.HTTPError("HTTP Error: %s" % err)
+            except aiohttp.ClientError as err:
+                raise exceptions.RequestException(
+                    "Request Exception: %s" % err)
+        self._record_retry_state(retry_state)
+        return resp, body
+
+    async def _time_request(self, url, method, **kwargs):
+        start_time = time.time()
+        try:
+            resp, body = await self.request(url, method, **kwargs)
+        except exceptions.ClientException as ex:
+            # Not every ClientException has an http_status.
+            self._record_request(url, method, start_time,
+                                 getattr(ex, 'http_status', None) or None)
+            raise
+        except Exception:
+            self._record_request(url, method, start_time, None)
+            raise
+        self._record_request(url, method, start_time, resp.status)
+        self.times.append(("%s %s" % (method, url),
+                           start_time, time.time()))
+        return resp, body
+
+    async def _do_reauth(self, url, method, ex, **kwargs):
+        # auth_try is 1 while another task logs in again.
+        await self._wait_for_refresh()
+        try:
+            if self.auth_try != 1:
+                await self._refresh_session(self._sent_session_key(), method,
+                                            url)
+                resp, body = await self._time_request(self.api_url + url,
+                                                      method, **kwargs)
+                return resp, body
+            else:
+                raise ex
+        except exceptions.HTTPUnauthorized:
+            raise ex
+
+    async def _cs_request(self, url, method, **kwargs):
+        if method == 'GET':
+            if self.response_cache is not None:
+                cached = self.response_cache.get(url)
+                if cached is not None:
+                    return cached
+                # Not cached if a write evicts it while the GET is sent.
+                generation = self.response_cache.get_generation(url)
+            if self.coalesce_gets and not kwargs:
+                resp, body, shared = await self._coalesced_get(url)
+            else:
+                resp, body = await self._cs_request_uncached(url, method,
+                                                             **kwargs)
+                shared = False
+            # The caller whose request it was has already cached it.
+            if self.response_cache is not None and not shared:
+                self.response_cache.put(url, resp, body, generation)
+            return resp, body
+
+        try:
+            return await self._cs_request_uncached(url, method, **kwargs)
+        finally:
+            # Even a failed write may have changed something on the array.
+            if self.response_cache is not None:
+                self.response_cache.invalidate(url)
+            self._forget_in_flight(url)
+
+    async def _coalesced_get(self, url):
+        while True:
+            call, leader = self._join_in_flight(url, asyncio.Event)
+            if leader:
+                break
+            await call.done.wait()
+            shared = self._shared_result(call)
+            # None if the leader was cancelled, so try again.
+            if shared is not None:
+                return shared
+
+        try:
+            call.result = await self._cs_request_uncached(url, 'GET')
+        except Exception as ex:
+            call.error = ex
+            raise
+        finally:
+            followers = self._leave_in_flight(url, call)
+        return self._leader_result(call, followers)
+
+    async def _cs_request_uncached(self, url, method, **kwargs):
+        await self._wait_for_refresh()
+        if self._session_expiring(url):
+            await self._refresh_session(self.session_key, method, url,
+                                        proactive=True)
+
+        # Perform the request once. If we get a 401 back then it
+        # might be because the auth token expired, so try to
+        # re-authenticate and try again. If it still fails, bail.
+        try:
+            resp, body = await self._time_request(self.api_url + url, method,
+                                                  **kwargs)
+            return resp, body
+        except (exceptions.HTTPUnauthorized,
+                exceptions.HTTPForbidden) as ex:
+            resp, body = await self._do_reauth(url, method, ex, **kwargs)
+            return resp, body
+
+    async def iter_members(self, url, chunk_size=65536, fields=None):
+        """
+        GET a collection and yield its members one at a time, as the
+        response is read, see
+        :meth:`~hpe3parclient.http.HTTPJSONRESTClient.iter_members`.
+
+        .. code-block:: python
+
+            async for volume in http.iter_members('/volumes'):
+                print(volume['name'])
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+        :param chunk_size: The bytes read from the socket at a time
+        :type chunk_size: int
+        :param fields: Trim every member to these keys. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: async generator of the members of the collection
+        """
+        parser = jsonstream.MembersParser(fields=fields)
+        async for member in self._stream_members(url, parser, chunk_size):
+            yield member
+
+    async def get_members(self, url, fields=None, chunk_size=65536):
+        """
+        GET a collection, trimming every member to the given keys as the
+        response is read, see
+        :meth:`~hpe3parclient.http.HTTPJSONRESTClient.get_members`.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+        :param fields: The keys to keep. Default keeps every key
+        :type fields: list
+        :param chunk_size: The bytes read from the socket at a time
+        :type chunk_size: int
+
+        :returns: dict - the collection, ie. {'total': 2, 'members': [...]}
+        """
+        parser = jsonstream.MembersParser(fields=fields)
+        members = [member async for member in
+                   self._stream_members(url, parser, chunk_size)]
+        body = dict(parser.values)
+        body['members'] = members
+        return body
+
+    async def _stream_members(self, url, parser, chunk_size):
+        resp, r = await self._cs_request_uncached(url, 'GET', stream=True)
+        try:
+            async for chunk in r.content.iter_chunked(chunk_size):
+                for member in parser.feed(chunk):
+                    yield member
+            for member in parser.close():
+                yield member
+        finally:
+            r.release()
+
+    async def get(self, url, **kwargs):
+        """
+        Make an HTTP GET request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'GET', **kwargs)
+
+    async def post(self, url, **kwargs):
+        """
+        Make an HTTP POST request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'POST', **kwargs)
+
+    async def put(self, url, **kwargs):
+        """
+        Make an HTTP PUT request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'PUT', **kwargs)
+
+    async def delete(self, url, **kwargs):
+        """
+        Make an HTTP DELETE request to the server.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+
+        :returns: headers - dict of HTTP Response headers
+        :returns: body - the body of the response.  If the body was JSON, it
+                         will be an object
+        """
+        return await self._cs_request(url, 'DELETE', **kwargs)
@@ -0,0 +1,246 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Concurrent batches of client calls.
+
+.. module: batch
+
+:Description: A Batch queues client calls and runs them from a bounded
+ pool of threads, instead of one round trip after the other. Every call
+ gets a :class:`CallResult`, with its value or the exception it raised,
+ and the results keep the order the calls were queued in. One call
+ failing does not stop the others.
+
+ Calls queued on a batch run in no particular order, so only batch calls
+ that do not depend on each other, ie. create the volumes in one batch
+ and export them in the next.
+
+.. code-block:: python
+
+    with cl.batch(max_workers=16) as batch:
+        for i in range(500):
+            batch.createVolume('tenant1-%d' % i, 'CPG1', 1024)
+
+    failed = [result for result in batch.results if not result.ok]
+
+"""
+
+import collections
+import logging
+import threading
+import time
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+LOG = logging.getLogger(__name__)
+
+
+def run_calls(calls, max_workers):
+    """
+    Run calls from up to max_workers threads and wait for all of them.
+
+    Every call runs in a copy of the caller's context, so a tracing span
+    open in the caller is the parent of the spans of the calls.
+
+    :param calls: [(func, args, kwargs)]
+    :type calls: list
+    :param max_workers: The number of calls run at once
+    :type max_workers: int
+
+    :returns: list - [(value, error, duration)], in the order of calls
+
+    """
+    pending = collections.deque(enumerate(calls))
+    outcomes = [None] * len(calls)
+    contexts = None
+    if contextvars is not None:
+        # A context can only be entered by one thread at a time.
+        contexts = [contextvars.copy_context() for call in calls]
+
+    def worker():
+        while True:
+            try:
+                index, (func, args, kwargs) = pending.popleft()
+            except IndexError:
+                return
+            start = time.time()
+            try:
+                if contexts is not None:
+                    value = contexts[index].run(func, *args, **kwargs)
+                else:
+                    value = func(*args, **kwargs)
+            except Exception as ex:
+                outcomes[index] = (None, ex, time.time() - start)
+            else:
+                outcomes[index] = (value, None, time.time() - start)
+
+    threads = [threading.Thread(target=worker,
+                                name='hpe3parclient-batch-%d' % i)
+               for i in range(min(max_workers, len(calls)))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+class CallResult(object):
+    """
+    The outcome of one call of a batch, filled in once the batch has run.
+
+    :param method: The client method name
+    :type method: str
+    :param args: The positional arguments of the call
+    :type args: tuple
+    :param kwargs: The keyword arguments of the call
+    :type kwargs: dict
+
+    """
+
+    def __init__(self, method, args, kwargs):
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.done = False
+        # What the call returned, or the exception it raised.
+        self.value = None
+        self.error = None
+        self.duration = None
+
+    @property
+    def ok(self):
+        return self.done and self.error is None
+
+    def get(self):
+        """
+        :returns: the value of the call, or raises the error it failed with
+
+        """
+        if not self.done:
+            raise RuntimeError("The batch of %s has not run yet" %
+                               self.method)
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        if not self.done:
+            state = 'pending'
+        elif self.error is not None:
+            state = 'error=%r' % self.error
+        else:
+            state = 'ok'
+        return '<CallResult %s %s>' % (self.method, state)
+
+
+class Batch(object):
+    """
+    Queues calls of a client's methods, run runs them all at once.
+
+    Any public client method can be queued by calling it on the batch,
+    which returns the :class:`CallResult` the outcome goes to. Leaving a
+    with block runs the batch, unless the block raised.
+
+    .. code-block:: python
+
+        batch = cl.batch(max_workers=8)
+        created = batch.createVolume('vol1', 'CPG1', 1024)
+        batch.submit('setVolumeMetaData', 'vol1', 'tenant', 'tenant1')
+        batch.run()
+        created.get()
+
+    :param client: The client the calls are made on
+    :type client: :class:`~hpe3parclient.client.HPE3ParClient`
+    :param max_workers: The number of calls run at once. Keep it at or
+                        below the client's pool_maxsize, more threads than
+                        pooled connections open throwaway connections.
+                        Default is 8
+    :type max_workers: int
+
+    """
+
+    def __init__(self, client, max_workers=8):
+        self.client = client
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._queued = []
+        # Every result of the batch, in the order the calls were queued.
+        self.results = []
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Queue a call.
+
+        :param method: The client method name
+        :type method: str
+
+        The remaining arguments are passed to the method.
+
+        :returns: :class:`CallResult`
+
+        """
+        # Fail now on a typo, rather than once per call in run.
+        func = getattr(self.client, method)
+        result = CallResult(method, args, kwargs)
+        with self._lock:
+            self._queued.append((func, result))
+            self.results.append(result)
+        return result
+
+    def __getattr__(self, name):
+        if name.startswith('_') or not callable(
+                getattr(self.client, name, None)):
+            raise AttributeError(name)
+
+        def queue(*args, **kwargs):
+            return self.submit(name, *args, **kwargs)
+        queue.__name__ = name
+        return queue
+
+    def run(self):
+        """
+        Run the calls queued since the last run and wait for all of them.
+
+        :returns: list - the :class:`CallResult` of every call run, in the
+                  order they were queued
+
+        """
+        with self._lock:
+            queued = self._queued
+            self._queued = []
+
+        outcomes = run_calls([(func, result.args, result.kwargs)
+                              for func, result in queued],
+                             self.max_workers)
+        results = []
+        for (func, result), outcome in zip(queued, outcomes):
+            result.value, result.error, result.duration = outcome
+            result.done = True
+            if result.error is not None:
+                LOG.debug("Batch call %s failed: %s", result.method,
+                          result.error)
+            results.append(result)
+        return results
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.run()
+        return False
@@ -0,0 +1,161 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Circuit breaker for an unreachable array.
+
+.. module: breaker
+
+:Description: A CircuitBreaker stops the clients of an array from sending
+ requests, and sitting out their retries, while the array is unreachable.
+
+ The breaker is closed while requests get responses. After
+ failure_threshold attempts in a row fail with a connection error or a
+ timeout it opens, and every request fails at once with
+ :class:`~hpe3parclient.exceptions.CircuitOpen`, including the retries of
+ requests already in flight. Once reset_timeout seconds have passed the
+ breaker is half open and lets a single probe request through: a response
+ closes it again, a failure opens it for another reset_timeout.
+
+ Share one breaker between all the clients of an array.
+
+.. code-block:: python
+
+    array_breaker = breaker.CircuitBreaker(reset_timeout=30)
+    cl = client.HPE3ParClient(url, circuit_breaker=array_breaker)
+
+    # Health check
+    healthy = array_breaker.state == breaker.CircuitBreaker.CLOSED
+
+"""
+
+import logging
+import threading
+import time
+
+from hpe3parclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+class CircuitBreaker(object):
+    """
+    :param failure_threshold: The number of consecutive failed attempts
+                              that opens the breaker. Default is 5
+    :type failure_threshold: int
+    :param reset_timeout: Seconds the breaker stays open before a probe is
+                          let through. Default is 30
+    :type reset_timeout: float
+
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._open = False
+        self._failures = 0
+        self._opened_at = None
+        # When the probe of a half open breaker was let through, None if
+        # there is no probe in flight.
+        self._probe_start = None
+        self._stats = {'trips': 0, 'rejected': 0}
+
+    def _state(self):
+        if not self._open:
+            return self.CLOSED
+        if time.time() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    @property
+    def state(self):
+        """CLOSED, OPEN or HALF_OPEN."""
+        with self._lock:
+            return self._state()
+
+    def allow_request(self):
+        """
+        Called before every attempt to send a request.
+
+        :raises: :class:`~hpe3parclient.exceptions.CircuitOpen` if the
+                 breaker is open, or half open with its probe in flight
+
+        """
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return
+            now = time.time()
+            # A probe that never reported back does not block the breaker
+            # forever.
+            probe_start = self._probe_start
+            timeout = self.reset_timeout
+            probe_lost = probe_start is None or now - probe_start >= timeout
+            if state == self.HALF_OPEN and probe_lost:
+                self._probe_start = now
+                return
+            self._stats['rejected'] += 1
+            retry_in = max(self._opened_at + self.reset_timeout - now, 0)
+        raise exceptions.CircuitOpen(
+            "The array is unreachable, not sending requests for another "
+            "%.0f seconds" % retry_in)
+
+    def record_success(self):
+        """The attempt got a response, whatever its status."""
+        with self._lock:
+            self._failures = 0
+            if self._open:
+                self._open = False
+                self._opened_at = None
+                self._probe_start = None
+                LOG.info("Circuit breaker closed, the array is reachable")
+
+    def record_failure(self):
+        """The attempt failed with a connection error or a timeout."""
+        with self._lock:
+            self._failures += 1
+            state = self._state()
+            if state == self.OPEN:
+                # A request sent before the breaker opened.
+                return
+            tripped = self._failures >= self.failure_threshold
+            if state == self.HALF_OPEN or tripped:
+                self._open = True
+                self._opened_at = time.time()
+                self._probe_start = None
+                self._stats['trips'] += 1
+                LOG.warning("Circuit breaker opened after %d consecutive "
+                            "failed attempts", self._failures)
+
+    def get_stats(self):
+        """
+        :returns: dict - {'state': str, 'failures': int,
+                          'opened_at': float, 'trips': int,
+                          'rejected': int}
+
+                  failures counts the consecutive failed attempts, trips
+                  the times the breaker opened and rejected the requests
+                  it failed without sending
+
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['state'] = self._state()
+            stats['failures'] = self._failures
+            stats['opened_at'] = self._opened_at
+        return stats
@@ -0,0 +1,235 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Response cache for WSAPI GETs.
+
+.. module: cache
+
+:Description: A read-through cache of successful GET responses, kept per
+ WSAPI collection (volumes, hosts, cpgs, ...) with its own TTL and size
+ bound. Any other verb sent through the same client evicts the object it
+ targets and the collection listing, ie. a PUT to /volumes/vol1 evicts
+ /volumes/vol1, anything below it and every /volumes listing or query.
+ Writes that change other collections too evict those as a whole, ie. a
+ VLUN created or removed evicts every cached /hosts and /volumes entry.
+
+ A GET sent before a write to its collection may answer after the write
+ has evicted the collection, with what the array held before it. Every
+ write bumps the generation of the collections it evicts, and the answer
+ of a GET sent under an older generation is not cached.
+
+ Changes made by other clients, or by the array itself, are only picked up
+ once the entries expire, so keep the TTLs short.
+
+"""
+
+import copy
+import threading
+import time
+
+from collections import OrderedDict
+
+
+class ResponseCache(object):
+    """
+    A TTL and LRU bounded cache of GET responses.
+
+    :param ttl: Seconds a response stays valid. Default is 5
+    :type ttl: float
+    :param max_entries: The most responses kept per collection. Default is
+                        256
+    :type max_entries: int
+    :param collections: Overrides per collection, ie.
+                        {'volumes': {'ttl': 10, 'max_entries': 1024}}.
+                        A ttl of 0 disables caching for that collection
+    :type collections: dict
+
+    """
+
+    # Task status is polled for changes, credentials are secrets.
+    DEFAULT_COLLECTIONS = {'tasks': {'ttl': 0},
+                           'credentials': {'ttl': 0}}
+
+    # {collection: other collections a write to it may change}. A VLUN
+    # changes the paths of its host and the exports of its volume, a
+    # deleted volume or host leaves its sets, and volumes take their space
+    # from CPGs.
+    AFFECTED_COLLECTIONS = {'vluns': ('hosts', 'volumes'),
+                            'volumes': ('volumesets', 'vluns', 'cpgs',
+                                        'remotecopygroups'),
+                            'hosts': ('hostsets', 'vluns'),
+                            'remotecopygroups': ('volumes',)}
+
+    def __init__(self, ttl=5, max_entries=256, collections=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.collections = dict(self.DEFAULT_COLLECTIONS)
+        if collections:
+            self.collections.update(collections)
+        self._lock = threading.Lock()
+        # {collection: OrderedDict(url: (expires, resp, body))}
+        self._entries = {}
+        # {collection: writes that evicted it}
+        self._generations = {}
+        self._stats = {'hits': 0, 'misses': 0, 'expired': 0,
+                       'evictions': 0, 'invalidations': 0, 'stale': 0}
+
+    @staticmethod
+    def get_collection(url):
+        """The collection a url belongs to, ie. volumes for /volumes/vol1."""
+        return url.split('?', 1)[0].strip('/').split('/', 1)[0]
+
+    @classmethod
+    def affects(cls, written_url, url):
+        """
+        Whether a write to written_url may change what a GET of url
+        returns, see invalidate.
+
+        :param written_url: The url, relative to the api_url, written to
+        :type written_url: str
+        :param url: The url, relative to the api_url, of the GET
+        :type url: str
+
+        :returns: bool
+
+        """
+        path = written_url.split('?', 1)[0].rstrip('/')
+        collection = cls.get_collection(path)
+        affected_collections = cls.AFFECTED_COLLECTIONS.get(collection, ())
+        if cls.get_collection(url) in affected_collections:
+            return True
+        got_path = url.split('?', 1)[0].rstrip('/')
+        below = got_path.startswith(path + '/')
+        return below or got_path in ('/' + collection, path)
+
+    def _get_setting(self, collection, name):
+        return self.collections.get(collection, {}).get(
+            name, getattr(self, name))
+
+    def get(self, url):
+        """
+        :param url: The url, relative to the api_url
+        :type url: str
+
+        :returns: (resp, body) - a copy of the cached response, or None
+
+        """
+        collection = self.get_collection(url)
+        with self._lock:
+            entries = self._entries.get(collection)
+            entry = entries.get(url) if entries else None
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            expires, resp, body = entry
+            if expires <= time.time():
+                del entries[url]
+                self._stats['expired'] += 1
+                self._stats['misses'] += 1
+                return None
+            # Most recently used last.
+            entries[url] = entries.pop(url)
+            self._stats['hits'] += 1
+        # Callers are free to modify what they get back.
+        return resp, copy.deepcopy(body)
+
+    def get_generation(self, url):
+        """
+        :param url: The url, relative to the api_url
+        :type url: str
+
+        :returns: int - the generation of the collection of url, to pass
+                  to put once the GET sent now has answered
+
+        """
+        with self._lock:
+            return self._generations.get(self.get_collection(url), 0)
+
+    def put(self, url, resp, body, generation=None):
+        """
+        :param url: The url, relative to the api_url
+        :type url: str
+        :param resp: The response headers
+        :type resp: dict
+        :param body: The response body
+        :type body: dict
+        :param generation: The generation of the collection when the GET
+                           was sent. The response is not cached if a write
+                           has evicted the collection since. Default always
+                           caches it
+        :type generation: int
+
+        """
+        collection = self.get_collection(url)
+        ttl = self._get_setting(collection, 'ttl')
+        if not ttl:
+            return
+        max_entries = self._get_setting(collection, 'max_entries')
+        body = copy.deepcopy(body)
+        with self._lock:
+            current = self._generations.get(collection, 0)
+            if generation is not None and generation != current:
+                self._stats['stale'] += 1
+                return
+            entries = self._entries.setdefault(collection, OrderedDict())
+            entries.pop(url, None)
+            entries[url] = (time.time() + ttl, resp, body)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, url):
+        """
+        Evict everything a write to url may have changed: the object
+        itself, anything below it, the listings of its collection and
+        every entry of the collections it affects.
+
+        :param url: The url, relative to the api_url, that was written to
+        :type url: str
+
+        """
+        collection = self.get_collection(url)
+        affected_collections = self.AFFECTED_COLLECTIONS.get(collection, ())
+        with self._lock:
+            for evicted in (collection,) + affected_collections:
+                self._generations[evicted] = (
+                    self._generations.get(evicted, 0) + 1)
+            for affected in affected_collections:
+                entries = self._entries.pop(affected, None)
+                if entries:
+                    self._stats['invalidations'] += len(entries)
+            entries = self._entries.get(collection)
+            if not entries:
+                return
+            for cached_url in list(entries):
+                if self.affects(url, cached_url):
+                    del entries[cached_url]
+                    self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
+    def get_stats(self):
+        """
+        :returns: dict - {'hits': int, 'misses': int, 'expired': int,
+                          'evictions': int, 'invalidations': int,
+                          'stale': int, 'entries': int}
+
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = sum(len(entries)
+                                   for entries in self._entries.values())
+        return stats
@@ -28,18 +28,12 @@ This client requires and works with 3PAR InForm 3.1.3 MU1 firmware
 """
 import copy
 import re
-import time
 import uuid
 import logging
 
-try:
-    # For Python 3.0 and later
-    from urllib.parse import quote
-except ImportError:
-    # Fall back to Python 2's urllib2
-    from urllib2 import quote
-
-from hpe3parclient import exceptions, http, ssh
+from hpe3parclient import batch, copyscheduler, exceptions, hostindex, http
+from hpe3parclient import metrics, portinventory, query, setindex, ssh
+from hpe3parclient import taskwatcher, tracing, vlunindex
 from hpe3parclient import showport_parser
 
 logger = logging.getLogger(__name__)
@@ -50,6 +44,72 @@ class HPE3ParClient(object):
     :param api_url: The url to the WSAPI service on 3PAR
                     ie. http://<3par server>:8080/api/v1
     :type api_url: str
+    :param pool_connections: The number of per-host HTTP connection pools to
+                             cache
+    :type pool_connections: int
+    :param pool_maxsize: The maximum number of keep-alive connections kept
+                         open to the WSAPI server
+    :type pool_maxsize: int
+    :param pool_block: Wait for a pooled connection instead of opening a
+                       throwaway one when the pool is exhausted
+    :type pool_block: bool
+    :param keep_alive: Reuse connections, and their TLS sessions, between
+                       WSAPI calls
+    :type keep_alive: bool
+    :param retry_policy: How failed WSAPI calls are retried
+    :type retry_policy: :class:`~hpe3parclient.retry.RetryPolicy`
+    :param max_timings: The number of raw request timings kept for
+                        http.get_timings(). Per-route latency percentiles
+                        are always available from http.get_latency_stats()
+    :type max_timings: int
+    :param response_cache: Serve repeated GETs from this cache. Writes made
+                           through this client evict what they change
+    :type response_cache: :class:`~hpe3parclient.cache.ResponseCache`
+    :param coalesce_gets: Let concurrent identical GETs share one request
+                          to the array. Default is True
+    :type coalesce_gets: bool
+    :param session_store: Reuse the session keys of other processes on this
+                          host that log in as the same user, see
+                          :mod:`~hpe3parclient.session_store`
+    :type session_store: :class:`~hpe3parclient.session_store.SessionStore`
+    :param session_max_age: Log in again once the session is this many
+                            seconds old, before the array rejects it
+    :type session_max_age: float
+    :param concurrency_limiter: Limit the WSAPI requests in flight, across
+                                all threads of the client, see
+                                :mod:`~hpe3parclient.limiter`
+    :type concurrency_limiter:
+        :class:`~hpe3parclient.limiter.AdaptiveLimiter`
+    :param circuit_breaker: Fail requests at once while the array is
+                            unreachable, see :mod:`~hpe3parclient.breaker`
+    :type circuit_breaker: :class:`~hpe3parclient.breaker.CircuitBreaker`
+    :param set_index_ttl: Answer findAllVolumeSets and findHostSet from an
+                          index of the set members, rebuilt after this many
+                          seconds, see :mod:`~hpe3parclient.setindex`.
+                          Default None looks the sets up on every call
+    :type set_index_ttl: float
+    :param host_index_ttl: Answer findHost and queryHost from an index of
+                           the host initiators, rebuilt after this many
+                           seconds, see :mod:`~hpe3parclient.hostindex`.
+                           Default None looks the hosts up on every call
+    :type host_index_ttl: float
+    :param vlun_index_ttl: Answer getVLUN and getHostVLUNs from an index of
+                           the VLUNs by host, volume and LUN, rebuilt after
+                           this many seconds, see
+                           :mod:`~hpe3parclient.vlunindex`. Default None
+                           looks the VLUNs up on every call
+    :type vlun_index_ttl: float
+    :param port_inventory_ttl: Answer getPorts, getFCPorts, getiSCSIPorts
+                               and getIPPorts from an inventory of the
+                               ports, loaded again after this many seconds,
+                               see :mod:`~hpe3parclient.portinventory`.
+                               Default None loads the ports on every call
+    :type port_inventory_ttl: float
+
+    The WSAPI calls and SSH commands of the client report to the
+    :class:`~hpe3parclient.metrics.MetricsHooks` in its metrics attribute.
+    Every public method records a tracing span once a
+    :class:`~hpe3parclient.tracing.Tracer` is set with :meth:`setTracer`.
 
     """
 
@@ -129,6 +189,10 @@ class HPE3ParClient(object):
     TASK_CANCELLED = 3
     TASK_FAILED = 4
 
+    TASK_PRIORITY_HIGH = 1
+    TASK_PRIORITY_MED = 2
+    TASK_PRIORITY_LOW = 3
+
     # build contains major minor mj=3 min=01 main=03 build=230
     # When updating these, make sure desc is appropriate for error messages
     # and make sure the version overrides in file_client are still OK.
@@ -144,6 +208,11 @@ class HPE3ParClient(object):
 
     WSAPI_MIN_VERSION_COMPRESSION_SUPPORT = '1.6.0'
 
+    # The collections the WSAPI filters with ?query=, the VLUNs only from
+    # HPE3PAR_WS_MIN_BUILD_VERSION_VLUN_QUERY on. The others are filtered
+    # here, see _queryCollection.
+    QUERY_COLLECTIONS = ('hosts', 'volumes', 'vluns')
+
     VLUN_TYPE_EMPTY = 1
     VLUN_TYPE_PORT = 2
     VLUN_TYPE_HOST = 3
@@ -200,12 +269,42 @@ class HPE3ParClient(object):
     RC_ACTION_CHANGE_TO_NATURUAL_DIRECTION = 10
     RC_ACTION_OVERRIDE_FAIL_SAFE = 11
 
+    # Set by setTracer.
+    tracer = None
+
     def __init__(self, api_url, debug=False, secure=False, timeout=None,
-                 suppress_ssl_warnings=False):
+                 suppress_ssl_warnings=False, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=True,
+                 retry_policy=None, max_timings=0, response_cache=None,
+                 coalesce_gets=True, session_store=None,
+                 session_max_age=None, concurrency_limiter=None,
+                 circuit_breaker=None, set_index_ttl=None,
+                 host_index_ttl=None, vlun_index_ttl=None,
+                 port_inventory_ttl=None):
         self.api_url = api_url
+        self.metrics = metrics.MetricsHooks()
         self.http = http.HTTPJSONRESTClient(
             self.api_url, secure=secure,
-            timeout=timeout, suppress_ssl_warnings=suppress_ssl_warnings)
+            timeout=timeout, suppress_ssl_warnings=suppress_ssl_warnings,
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, keep_alive=keep_alive,
+            retry_policy=retry_policy, max_timings=max_timings,
+            metrics_hooks=self.metrics, response_cache=response_cache,
+            coalesce_gets=coalesce_gets, session_store=session_store,
+            session_max_age=session_max_age,
+            concurrency_limiter=concurrency_limiter,
+            circuit_breaker=circuit_breaker)
+        self.volume_set_index = setindex.SetIndex(
+            self.getVolumeSets, self.getVolumeSet, set_index_ttl)
+        self.host_set_index = setindex.SetIndex(
+            self.getHostSets, self.getHostSet, set_index_ttl)
+        self.host_index = hostindex.InitiatorIndex(
+            self.getHosts, self.getHost, host_index_ttl)
+        self.vlun_index = vlunindex.VLUNIndex(
+            self.getVLUNs, self._getVolumeVLUNs, vlun_index_ttl)
+        self.port_inventory = portinventory.PortInventory(
+            self._loadPorts, port_inventory_ttl)
+        self.task_watcher = taskwatcher.TaskWatcher(self.getAllTasks)
         api_version = None
         self.ssh = None
         self.vlun_query_supported = False
@@ -231,32 +330,74 @@ class HPE3ParClient(object):
                        'not supported.') % ex_desc
                 raise exceptions.UnsupportedVersion(msg)
 
+        (self.vlun_query_supported, self.primera_supported,
+         self.compression_supported) = self._checkWsApiVersion(api_version)
+
+    @classmethod
+    def _checkWsApiVersion(cls, api_version):
+        """
+        Check the WSAPI version against the minimum supported build and
+        work out which optional features it supports.
+
+        :param api_version: The version dict returned by getWsApiVersion
+        :type api_version: dict
+
+        :returns: tuple - (vlun_query_supported, primera_supported,
+                           compression_supported)
+        :raises: :class:`~hpe3parclient.exceptions.UnsupportedVersion`
+            - The WSAPI build is older than the minimum supported one
+
+        """
         # Note the build contains major, minor, maintenance and build
         # e.g. 30102422 is 3 01 02 422
         # therefore all we need to compare is the build
         if (api_version is None or
-                api_version['build'] < self.HPE3PAR_WS_MIN_BUILD_VERSION):
+                api_version['build'] < cls.HPE3PAR_WS_MIN_BUILD_VERSION):
             raise exceptions.UnsupportedVersion(
                 'Invalid 3PAR WS API, requires version, %s' %
-                self.HPE3PAR_WS_MIN_BUILD_VERSION_DESC)
+                cls.HPE3PAR_WS_MIN_BUILD_VERSION_DESC)
 
         # Check for VLUN query support.
-        if (api_version['build'] >=
-                self.HPE3PAR_WS_MIN_BUILD_VERSION_VLUN_QUERY):
-            self.vlun_query_supported = True
-        if (api_version['build'] >=
-                self.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION):
-            self.primera_supported = True
+        build = api_version['build']
+        vlun_query_supported = (
+            build >= cls.HPE3PAR_WS_MIN_BUILD_VERSION_VLUN_QUERY)
+        primera_supported = (
+            build >= cls.HPE3PAR_WS_PRIMERA_MIN_BUILD_VERSION)
 
         current_wsapi_version = '{}.{}.{}'.format(api_version.get('major'),
                                                   api_version.get('minor'),
                                                   api_version.get('revision'))
-        if current_wsapi_version >= self.WSAPI_MIN_VERSION_COMPRESSION_SUPPORT:
-            self.compression_supported = True
+        compression_supported = (
+            current_wsapi_version >= cls.WSAPI_MIN_VERSION_COMPRESSION_SUPPORT)
+
+        return (vlun_query_supported, primera_supported,
+                compression_supported)
 
     def is_primera_array(self):
         return self.primera_supported
 
+    def _queryCollection(self, collection, where):
+        """Get the members of a collection that a query selects.
+
+        The array filters the collection when its WSAPI can, otherwise the
+        whole collection is fetched and filtered here.
+
+        :param collection: The collection, ie. volumes
+        :type collection: str
+        :param where: The query
+        :type where: :class:`~hpe3parclient.query.Query`
+
+        :returns: dict - the collection, with only the matching members
+
+        """
+        vluns = collection != 'vluns' or self.vlun_query_supported
+        supported = collection in self.QUERY_COLLECTIONS and vluns
+        url, pushed = query.collection_url(collection, where, supported)
+        response, body = self.http.get(url)
+        if not pushed:
+            body = query.select(body, where)
+        return body
+
     def setSSHOptions(self, ip, login, password, port=22,
                       conn_timeout=None, privatekey=None,
                       **kwargs):
@@ -269,6 +410,64 @@ class HPE3ParClient(object):
         self.ssh = ssh.HPE3PARSSHClient(ip, login, password, port,
                                         conn_timeout, privatekey,
                                         **kwargs)
+        # SSH commands report to the same hooks as the WSAPI calls.
+        self.ssh.metrics = self.metrics
+        # The iSCSI VLANs are only merged into the ports over SSH.
+        self.port_inventory.clear()
+
+    def setTracer(self, tracer):
+        """Record tracing spans of the calls made through this client.
+
+        :param tracer: The tracer, None to stop tracing
+        :type tracer: :class:`~hpe3parclient.tracing.Tracer`
+
+        """
+        if self.tracer is not None:
+            self.metrics.unregister(self.tracer)
+        self.tracer = tracer
+        if tracer is not None:
+            self.metrics.register(tracer)
+
+    def batch(self, max_workers=8):
+        """Queue calls of this client's methods and run them concurrently.
+
+        .. code-block:: python
+
+            with cl.batch(max_workers=16) as vols:
+                for name in names:
+                    vols.createVolume(name, 'CPG1', 1024)
+            errors = [r.error for r in vols.results if not r.ok]
+
+        :param max_workers: The number of calls run at once. Default is 8
+        :type max_workers: int
+
+        :returns: :class:`~hpe3parclient.batch.Batch`
+
+        """
+        return batch.Batch(self, max_workers)
+
+    def copyScheduler(self, max_active=4, max_per_cpg=2):
+        """Queue volume copies and start them as array task slots free up.
+
+        .. code-block:: python
+
+            scheduler = cl.copyScheduler(max_active=8, max_per_cpg=4)
+            for name in names:
+                scheduler.submit(name, name + '-clone', 'CPG1',
+                                 priority=cl.TASK_PRIORITY_LOW)
+            scheduler.wait()
+
+        :param max_active: The most copy tasks active on the array at once.
+                           Default is 4
+        :type max_active: int
+        :param max_per_cpg: The most copy tasks active into one CPG at once.
+                            Default is 2
+        :type max_per_cpg: int
+
+        :returns: :class:`~hpe3parclient.copyscheduler.CopyScheduler`
+
+        """
+        return copyscheduler.CopyScheduler(self, max_active, max_per_cpg)
 
     def _run(self, cmd):
         if self.ssh is None:
@@ -439,15 +638,35 @@ class HPE3ParClient(object):
         return body
 
     # Volume methods
-    def getVolumes(self):
+    def getVolumes(self, fields=None):
         """Get the list of Volumes
 
+        :param fields: Keep only these keys of every Volume, ie. ['name',
+                       'wwn']. The other keys are dropped as the response
+                       is read. Default keeps every key
+        :type fields: list
+
         :returns: list of Volumes
 
         """
+        if fields is not None:
+            return self.http.get_members('/volumes', fields)
         response, body = self.http.get('/volumes')
         return body
 
+    def iterVolumes(self, fields=None):
+        """Iterate over the Volumes, reading them from the response one at
+           a time instead of loading the whole list.
+
+        :param fields: Keep only these keys of every Volume. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: generator of Volumes
+
+        """
+        return self.http.iter_members('/volumes', fields=fields)
+
     def getVolume(self, name):
         """Get information about a volume.
 
@@ -531,44 +750,7 @@ class HPE3ParClient(object):
             optional = {'tpvv': True}
         if optional:
             if self.primera_supported:
-                for key in ['tpvv', 'compression', 'tdvv']:
-                    option = optional.get(key)
-                    if option and option not in [True, False]:
-                        # raising exception for junk compression input
-                        ex_desc = "39 - invalid input: wrong type for key "\
-                            "[%s]. Valid values are [True, False]" % key
-                        raise exceptions.HTTPBadRequest(ex_desc)
-
-                if optional.get('compression') is True:
-                    combination = ['tdvv', 'compression']
-                    len_diff = len(set(combination) - set(optional.keys()))
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and " \
-                          "'tdvv' must be specified as true"
-                    if len_diff == 1:
-                        raise exceptions.HTTPBadRequest(msg)
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is True:
-                        optional['reduce'] = True
-
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is True:
-                        raise exceptions.HTTPBadRequest(msg)
-                else:
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and "\
-                          "'tdvv' must be specified as true"
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is False:
-                        optional['reduce'] = False
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is False:
-                        raise exceptions.HTTPBadRequest(msg)
-
-                if 'compression' in optional:
-                    optional.pop('compression')
-                if 'tdvv' in optional:
-                    optional.pop('tdvv')
+                self._convertPrimeraVolumeOptions(optional)
             info = self._mergeDict(info, optional)
         logger.debug("Parameters passed for create volume %s" % info)
 
@@ -610,7 +792,9 @@ class HPE3ParClient(object):
             - IN_USE - The volume is in use by VV set, VLUN, etc
 
         """
-        response, body = self.http.delete('/volumes/%s' % name)
+        with self.volume_set_index.changing():
+            response, body = self.http.delete('/volumes/%s' % name)
+        self.volume_set_index.discard_member(name)
         return body
 
     def modifyVolume(self, name, volumeMods, appType=None):
@@ -724,7 +908,12 @@ class HPE3ParClient(object):
             snapshot.
 
         """
-        response = self.http.put('/volumes/%s' % name, body=volumeMods)
+        with self.volume_set_index.changing(), self.vlun_index.changing():
+            response = self.http.put('/volumes/%s' % name, body=volumeMods)
+        if volumeMods.get('newName'):
+            self.volume_set_index.rename_member(name, volumeMods['newName'])
+            self.vlun_index.rename(volume=name,
+                                   new_volume=volumeMods['newName'])
 
         if appType is not None:
             if 'newName' in volumeMods and volumeMods['newName']:
@@ -888,6 +1077,28 @@ class HPE3ParClient(object):
         response, body = self.http.put('/volumes/%s' % snapshot, body=info)
         return body
 
+    def promoteVirtualCopyAsync(self, snapshot, optional=None, timeout=None,
+                                callback=None):
+        """Revert a volume to snapshot, without waiting for the task.
+
+        Takes the same parameters and raises the same errors as
+        :meth:`promoteVirtualCopy`.
+
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture` of the
+                  promote task
+
+        """
+        body = self.promoteVirtualCopy(snapshot, optional)
+        return self._taskFuture(body, timeout=timeout, callback=callback)
+
     def copyVolume(self, src_name, dest_name, dest_cpg, optional=None):
         """Copy/Clone a volume.
 
@@ -1009,43 +1220,7 @@ class HPE3ParClient(object):
         # has to be taken care by caller side
         if optional:
             if self.primera_supported:
-                for key in ['tpvv', 'compression', 'tdvv']:
-                    option = optional.get(key)
-                    if option and option not in [True, False]:
-                        # raising exception for junk compression input
-                        ex_desc = "39 - invalid input: wrong type for key " \
-                            "[%s]. Valid values are [True, False]" % key
-                        raise exceptions.HTTPBadRequest(ex_desc)
-                if optional.get('compression') is True:
-                    combination = ['tdvv', 'compression']
-                    len_diff = len(set(combination) - set(optional.keys()))
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and " \
-                          "'tdvv' must be specified as true"
-                    if len_diff == 1:
-                        raise exceptions.HTTPBadRequest(msg)
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is True:
-                        optional['reduce'] = True
-
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is True:
-                        raise exceptions.HTTPBadRequest(msg)
-                else:
-                    msg = "invalid input: For compressed and deduplicated "\
-                          "volumes both 'compression' and "\
-                          "'tdvv' must be specified as true"
-                    if optional.get('tdvv') is False \
-                            and optional.get('compression') is False:
-                        optional['reduce'] = False
-                    if optional.get('tdvv') is True \
-                            and optional.get('compression') is False:
-                        raise exceptions.HTTPBadRequest(msg)
-
-                if 'compression' in optional:
-                    optional.pop('compression')
-                if 'tdvv' in optional:
-                    optional.pop('tdvv')
+                self._convertPrimeraVolumeOptions(optional)
             parameters = self._mergeDict(parameters, optional)
         if 'online' not in parameters or not parameters['online']:
             # 3Par won't allow destCPG to be set if it's not an online copy.
@@ -1060,19 +1235,33 @@ class HPE3ParClient(object):
             return body
         except exceptions.HTTPBadRequest as ex:
             if self.primera_supported:
-                ex_desc = 'invalid input: one of the parameters is required'
-                ex_code = ex.get_code()
-                # INV_INPUT_ONE_REQUIRED => 78
-                if ex_code == 78 and \
-                   ex.get_description() == ex_desc and \
-                   ex.get_ref() == 'tpvv,reduce':
-                    new_ex_desc = "invalid input: Either tpvv must be true "\
-                                  "OR for compressed and deduplicated "\
-                                  "volumes both 'compression' and 'tdvv' "\
-                                  "must be specified as true."
-                    raise exceptions.HTTPBadRequest(new_ex_desc)
+                raise self._convertPrimeraCopyError(ex)
             raise ex
 
+    def copyVolumeAsync(self, src_name, dest_name, dest_cpg, optional=None,
+                        timeout=None, callback=None):
+        """Copy/Clone a volume, without waiting for the copy task.
+
+        Takes the same parameters and raises the same errors as
+        :meth:`copyVolume`. An offline copy is watched by the task id the
+        array returns, an online copy by the destination volume name.
+
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture` of the
+                  copy task
+
+        """
+        body = self.copyVolume(src_name, dest_name, dest_cpg, optional)
+        return self._taskFuture(body, name=dest_name, timeout=timeout,
+                                callback=callback)
+
     def isOnlinePhysicalCopy(self, name):
         """Is the volume being created by process of online copy?
 
@@ -1086,11 +1275,16 @@ class HPE3ParClient(object):
         else:
             return True
 
-    def stopOnlinePhysicalCopy(self, name):
+    def stopOnlinePhysicalCopy(self, name, timeout=600):
         """Stopping a online physical copy operation.
 
         :param name: the name of the volume
         :type name: str
+        :param timeout: Seconds to wait for the copy task to be cancelled
+        :type timeout: float
+
+        :raises: :class:`~hpe3parclient.exceptions.Timeout` if the copy task
+                 is not over after timeout seconds
 
         """
         # first we have to find the active copy
@@ -1114,12 +1308,19 @@ class HPE3ParClient(object):
 
         # we have to make sure the task is cancelled
         # before moving on. This can sometimes take a while.
-        ready = False
-        while not ready:
-            time.sleep(1)
-            task = self._findTask(name, True)
-            if task is None:
-                ready = True
+        # Any outcome of the task will do, but an error reading /tasks
+        # is raised.
+        try:
+            self.task_watcher.watch(task_id, timeout=timeout).result()
+        except (exceptions.TaskCancelled, exceptions.TaskFailed):
+            pass
+        except exceptions.Timeout:
+            msg = ("The copy task %s for '%s' is not over %s seconds after "
+                   "it was cancelled" % (task_id, name, timeout))
+            raise exceptions.Timeout(error={'desc': msg})
+        except exceptions.HTTPNotFound as ex:
+            if ex.get_code() != 'NON_EXISTENT_TASK':
+                raise
 
         # now cleanup the dead snapshots
         vol = self.getVolume(name)
@@ -1164,6 +1365,49 @@ class HPE3ParClient(object):
         response, body = self.http.get('/tasks/%s' % taskId)
         return body
 
+    def watchTask(self, taskId=None, name=None, callback=None,
+                  timeout=None):
+        """Wait on a task in the background, until it is over.
+
+        The tasks watched share one poll of /tasks, see
+        :mod:`~hpe3parclient.taskwatcher`.
+
+        :param taskId: the task id
+        :type taskId: int
+        :param name: the task name, instead of the id. The most recent task
+                     with the name is watched
+        :type name: str
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture`, whose
+                  result is the task once it is done
+
+        """
+        return self.task_watcher.watch(taskId, name, callback, timeout,
+                                       self._cancelTask)
+
+    def _taskFuture(self, body, name=None, timeout=None, callback=None):
+        # The future of the task a call started, from the task id in its
+        # response, or else the task name.
+        task_id = (body or {}).get('taskid')
+        if task_id not in (None, ''):
+            return self.watchTask(int(task_id), callback=callback,
+                                  timeout=timeout)
+        if name is not None:
+            return self.watchTask(name=name, callback=callback,
+                                  timeout=timeout)
+        # The call did not start a task, it is already over.
+        future = taskwatcher.done_future(body)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
     def _findTask(self, name, active=True):
         uri = '/tasks'
         response, body = self.http.get(uri)
@@ -1387,8 +1631,13 @@ class HPE3ParClient(object):
 
         host_set_name = None
 
+        if self.host_set_index.enabled:
+            host_sets = self.host_set_index.find(name)
+            if host_sets:
+                host_set_name = host_sets[0]['name']
+
         # If ssh isn't available search all host sets for this host
-        if self.ssh is None:
+        elif self.ssh is None:
             host_sets = self.getHostSets()
             if host_sets is not None and 'members' in host_sets:
                 for host_set in host_sets['members']:
@@ -1473,7 +1722,9 @@ class HPE3ParClient(object):
             members = {'setmembers': setmembers}
             info = self._mergeDict(info, members)
 
-        response, body = self.http.post('/hostsets', body=info)
+        with self.host_set_index.changing():
+            response, body = self.http.post('/hostsets', body=info)
+        self.host_set_index.refresh(name)
         if response is not None and 'location' in response:
             host_set_id = response['location'].rsplit(
                 '/api/v1/hostsets/', 1)[-1]
@@ -1493,7 +1744,9 @@ class HPE3ParClient(object):
         :raises: :class:`~hpe3parclient.exceptions.HTTPConflict`
             - EXPORTED_VLUN - The host set has exported VLUNs.
         """
-        self.http.delete('/hostsets/%s' % name)
+        with self.host_set_index.changing():
+            self.http.delete('/hostsets/%s' % name)
+        self.host_set_index.discard(name)
 
     def modifyHostSet(self, name, action=None, newName=None, comment=None,
                       setmembers=None):
@@ -1556,7 +1809,9 @@ class HPE3ParClient(object):
             members = {'setmembers': setmembers}
             info = self._mergeDict(info, members)
 
-        response = self.http.put('/hostsets/%s' % name, body=info)
+        with self.host_set_index.changing():
+            response = self.http.put('/hostsets/%s' % name, body=info)
+        self.host_set_index.refresh(name, newName)
         return response
 
     def addHostToHostSet(self, set_name, name):
@@ -1616,14 +1871,33 @@ class HPE3ParClient(object):
 
         return self.removeHostFromHostSet(host_set_name, name)
 
-    def getHosts(self):
+    def getHosts(self, fields=None):
         """Get information about every Host on the 3Par array.
 
+        :param fields: Keep only these keys of every Host, ie. ['name',
+                       'id']. The other keys are dropped as the response is
+                       read. Default keeps every key
+        :type fields: list
+
         :returns: list of Hosts
         """
+        if fields is not None:
+            return self.http.get_members('/hosts', fields)
         response, body = self.http.get('/hosts')
         return body
 
+    def iterHosts(self, fields=None):
+        """Iterate over the Hosts, reading them from the response one at a
+           time instead of loading the whole list.
+
+        :param fields: Keep only these keys of every Host. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: generator of Hosts
+        """
+        return self.http.iter_members('/hosts', fields=fields)
+
     def getHost(self, name):
         """Get information about a Host.
 
@@ -1715,7 +1989,9 @@ class HPE3ParClient(object):
         if optional:
             info = self._mergeDict(info, optional)
 
-        response, body = self.http.post('/hosts', body=info)
+        with self.host_index.changing():
+            response, body = self.http.post('/hosts', body=info)
+        self.host_index.refresh(name)
         return body
 
     def modifyHost(self, name, mod_request):
@@ -1812,7 +2088,13 @@ class HPE3ParClient(object):
             - INV_INPUT_DUP_PATH - Duplicate path specified.
 
         """
-        response = self.http.put('/hosts/%s' % name, body=mod_request)
+        with self.host_set_index.changing(), self.host_index.changing(), \
+                self.vlun_index.changing():
+            response = self.http.put('/hosts/%s' % name, body=mod_request)
+        if mod_request.get('newName'):
+            self.host_set_index.rename_member(name, mod_request['newName'])
+            self.vlun_index.rename(host=name, new_host=mod_request['newName'])
+        self.host_index.refresh(name, mod_request.get('newName'))
         return response
 
     def deleteHost(self, name):
@@ -1829,7 +2111,10 @@ class HPE3ParClient(object):
             - PERM_DENIED - Permission denied
 
         """
-        response, body = self.http.delete('/hosts/%s' % name)
+        with self.host_set_index.changing(), self.host_index.changing():
+            response, body = self.http.delete('/hosts/%s' % name)
+        self.host_set_index.discard_member(name)
+        self.host_index.discard(name)
 
     def findHost(self, iqn=None, wwn=None):
         """Find a host from an iSCSI initiator or FC WWN.
@@ -1839,7 +2124,11 @@ class HPE3ParClient(object):
         :param wwn: lookup based on WWN
         :type wwn: str
 
+        :returns: the name of the host, or None
+
         """
+        if self.host_index.enabled:
+            return self.host_index.find(iqn=iqn, wwn=wwn)
 
         # for now there is no search in the REST API
         # so we can do a create looking for a specific
@@ -1898,34 +2187,18 @@ class HPE3ParClient(object):
             - INV_INPUT_ILLEGAL_CHAR - Host name contains invalid character.
 
         """
-        wwnsQuery = ''
-        if wwns:
-            tmpQuery = []
-            for wwn in wwns:
-                tmpQuery.append('wwn==%s' % wwn)
-            wwnsQuery = ('FCPaths[%s]' % ' OR '.join(tmpQuery))
+        if self.host_index.enabled:
+            return self.host_index.query(iqns=iqns, wwns=wwns)
 
-        iqnsQuery = ''
+        paths = []
+        if wwns:
+            paths.append(query.Has('FCPaths', query.Or(
+                *[query.Eq('wwn', wwn) for wwn in wwns])))
         if iqns:
-            tmpQuery = []
-            for iqn in iqns:
-                tmpQuery.append('name==%s' % iqn)
-            iqnsQuery = ('iSCSIPaths[%s]' % ' OR '.join(tmpQuery))
-
-        query = ''
-        if wwnsQuery and iqnsQuery:
-            query = ('%(wwns)s OR %(iqns)s' % ({'wwns': wwnsQuery,
-                                                'iqns': iqnsQuery}))
-        elif wwnsQuery:
-            query = wwnsQuery
-        elif iqnsQuery:
-            query = iqnsQuery
-
-        query = '"%s"' % query
-
-        response, body = self.http.get('/hosts?query=%s' %
-                                       quote(query.encode("utf8")))
-        return body
+            paths.append(query.Has('iSCSIPaths', query.Or(
+                *[query.Eq('name', iqn) for iqn in iqns])))
+
+        return self._queryCollection('hosts', query.Or(*paths))
 
     def getHostVLUNs(self, hostName):
         """Get all of the VLUNs on a specific Host.
@@ -1937,27 +2210,19 @@ class HPE3ParClient(object):
             - NON_EXISTENT_HOST - HOST Not Found
 
         """
-        # calling getHost to see if the host exists and raise not found
-        # exception if it's not found.
-        self.getHost(hostName)
-
-        vluns = []
-        # Check if the WSAPI supports VLUN querying. If it is supported
-        # request only the VLUNs that are associated with the host.
-        if self.vlun_query_supported:
-            query = '"hostname EQ %s"' % hostName
-            response, body = self.http.get('/vluns?query=%s' %
-                                           quote(query.encode("utf8")))
-
-            for vlun in body.get('members', []):
-                vluns.append(vlun)
+        if self.vlun_index.enabled:
+            vluns = self.vlun_index.find_host(hostName)
+            # A host with VLUNs exists, only look it up when there are none.
+            if not vluns:
+                self.getHost(hostName)
         else:
-            allVLUNs = self.getVLUNs()
+            # calling getHost to see if the host exists and raise not found
+            # exception if it's not found.
+            self.getHost(hostName)
 
-            if allVLUNs:
-                for vlun in allVLUNs['members']:
-                    if 'hostname' in vlun and vlun['hostname'] == hostName:
-                        vluns.append(vlun)
+            body = self._queryCollection('vluns',
+                                         query.Eq('hostname', hostName))
+            vluns = body.get('members', [])
 
         if len(vluns) < 1:
             raise exceptions.HTTPNotFound(
@@ -1972,34 +2237,72 @@ class HPE3ParClient(object):
         :returns: list of Ports
 
         """
+        if self.port_inventory.enabled:
+            return self.port_inventory.ports()
+        return self._loadPorts()
+
+    def _loadPorts(self):
         response, body = self.http.get('/ports')
         # if any of the ports are iSCSI ports and
         # are vlan tagged (as shown by showport -iscsivlans), then
         # the port information is merged with the WSAPI
         # returned port information.
         if self.ssh is not None:
-            if any([port['protocol'] == self.PORT_PROTO_ISCSI and
-                    'iSCSIPortInfo' in port and
-                    port['iSCSIPortInfo']['vlan'] == 1
-                    for port in body['members']]):
+            tagged_ports = self._vlanTaggedISCSIPorts(body)
+            if tagged_ports:
                 iscsi_vlan_data = self._run(['showport', '-iscsivlans'])
                 port_parser = showport_parser.ShowportParser()
                 iscsi_ports = port_parser.parseShowport(iscsi_vlan_data)
-                expanded_ports = self._cloneISCSIPorts(body, iscsi_ports)
-                for cli_port in expanded_ports:
-                    for wsapi_port in body[u'members']:
-                        if wsapi_port['portPos']['node'] == \
-                                cli_port['portPos']['node']  \
-                           and wsapi_port['portPos']['slot'] == \
-                                cli_port['portPos']['slot'] \
-                           and wsapi_port['portPos']['cardPort'] == \
-                                cli_port['portPos']['cardPort']:
-                            port_parser._merge_dict(wsapi_port, cli_port)
+                self._mergeISCSIVlans(body, tagged_ports, iscsi_ports)
                 body['total'] = len(body['members'])
 
         return body
 
+    def _vlanTaggedISCSIPorts(self, real_ports):
+        # The vlan tagged iSCSI ports, by (node, slot, cardPort).
+        tagged_ports = {}
+        for port in real_ports['members']:
+            is_iscsi = port['protocol'] == self.PORT_PROTO_ISCSI
+            info = port.get('iSCSIPortInfo') if is_iscsi else None
+            if info is not None and info['vlan'] == 1:
+                tagged_ports.setdefault(
+                    portinventory.port_key(port['portPos']), []).append(port)
+        return tagged_ports
+
+    def _matchISCSIPort(self, tagged_ports, vlan_port):
+        matching_ports = tagged_ports.get(
+            portinventory.port_key(vlan_port['portPos']), [])
+
+        # should only be one
+        if len(matching_ports) > 1:
+            err = ("Found {} matching ports for vlan tagged iSCSI port "
+                   "{}.  There should only be one.")
+            raise exceptions.\
+                NoUniqueMatch(err.format(len(matching_ports), vlan_port))
+
+        return matching_ports[0] if matching_ports else None
+
+    def _mergeISCSIVlans(self, real_ports, tagged_ports, vlan_ports):
+        # Merges the showport -iscsivlans data into the ports at the same
+        # portPos, in place. Every port is cloned before any is merged, so
+        # the VLAN rows of one port never share or change each other.
+        ports_by_pos = {}
+        for port in real_ports['members']:
+            ports_by_pos.setdefault(
+                portinventory.port_key(port['portPos']), []).append(port)
+
+        expanded_ports = self._cloneISCSIPorts(real_ports, vlan_ports,
+                                               tagged_ports)
+        port_parser = showport_parser.ShowportParser()
+        for cli_port in expanded_ports:
+            key = portinventory.port_key(cli_port['portPos'])
+            for wsapi_port in ports_by_pos[key]:
+                port_parser._merge_dict(wsapi_port, cli_port)
+
     def _getProtocolPorts(self, protocol, state=None):
+        if self.port_inventory.enabled:
+            return self.port_inventory.protocol_ports(protocol, state)
+
         return_ports = []
         ports = self.getPorts()
         if ports:
@@ -2012,26 +2315,17 @@ class HPE3ParClient(object):
 
         return return_ports
 
-    def _cloneISCSIPorts(self, real_ports, vlan_ports):
+    def _cloneISCSIPorts(self, real_ports, vlan_ports, tagged_ports=None):
         cloned_ports = []
+        if tagged_ports is None:
+            tagged_ports = self._vlanTaggedISCSIPorts(real_ports)
         for port in vlan_ports:
-            matching_ports = [
-                x for x in real_ports['members']
-                if (x['protocol'] == self.PORT_PROTO_ISCSI and
-                    x['iSCSIPortInfo']['vlan'] == 1 and
-                    x['portPos'] == port['portPos'])
-            ]
-
-            # should only be one
-            if len(matching_ports) > 1:
-                err = ("Found {} matching ports for vlan tagged iSCSI port "
-                       "{}.  There should only be one.")
-                raise exceptions.\
-                    NoUniqueMatch(err.format(len(matching_ports), port))
-
-            if len(matching_ports) == 1:
-                new_port = copy.deepcopy(matching_ports[0])
-                new_port.update(port)
+            matching_port = self._matchISCSIPort(tagged_ports, port)
+            if matching_port is not None:
+                # Only the row's own keys, iSCSIPortInfo among them, are
+                # copied deep; the rest of the port is shared.
+                new_port = dict(matching_port)
+                new_port.update(copy.deepcopy(port))
                 cloned_ports.append(new_port)
 
         return cloned_ports
@@ -2061,12 +2355,19 @@ class HPE3ParClient(object):
         return self._getProtocolPorts(4, state)
 
     # CPG methods
-    def getCPGs(self):
+    def getCPGs(self, fields=None):
         """Get entire list of CPGs.
 
+        :param fields: Keep only these keys of every CPG, ie. ['name',
+                       'domain']. The other keys are dropped as the
+                       response is read. Default keeps every key
+        :type fields: list
+
         :returns: list of cpgs
 
         """
+        if fields is not None:
+            return self.http.get_members('/cpgs', fields)
         response, body = self.http.get('/cpgs')
         return body
 
@@ -2195,15 +2496,35 @@ class HPE3ParClient(object):
     # LUN-host, LUN-port, or LUN-host-port combination by establishing the
     # export rule or the manner in which the Volume is exported.
 
-    def getVLUNs(self):
+    def getVLUNs(self, fields=None):
         """Get VLUNs.
 
+        :param fields: Keep only these keys of every VLUN, ie.
+                       ['volumeName', 'lun']. The other keys are dropped as
+                       the response is read. Default keeps every key
+        :type fields: list
+
         :returns: Array of VLUNs
 
         """
+        if fields is not None:
+            return self.http.get_members('/vluns', fields)
         response, body = self.http.get('/vluns')
         return body
 
+    def iterVLUNs(self, fields=None):
+        """Iterate over the VLUNs, reading them from the response one at a
+           time instead of loading the whole list.
+
+        :param fields: Keep only these keys of every VLUN. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: generator of VLUNs
+
+        """
+        return self.http.iter_members('/vluns', fields=fields)
+
     def getVLUN(self, volumeName):
         """Get information about a VLUN.
 
@@ -2216,27 +2537,22 @@ class HPE3ParClient(object):
             -  NON_EXISTENT_VLUN - VLUN doesn't exist
 
         """
-        # Check if the WSAPI supports VLUN querying. If it is supported
-        # request only the VLUNs that are associated with the volume.
-        if self.vlun_query_supported:
-            query = '"volumeName EQ %s"' % volumeName
-            response, body = self.http.get('/vluns?query=%s' %
-                                           quote(query.encode("utf8")))
-
-            # Return the first VLUN found for the volume.
-            for vlun in body.get('members', []):
-                return vlun
+        if self.vlun_index.enabled:
+            vluns = self.vlun_index.find_volume(volumeName)
         else:
-            vluns = self.getVLUNs()
-            if vluns:
-                for vlun in vluns['members']:
-                    if vlun['volumeName'] == volumeName:
-                        return vlun
+            vluns = self._getVolumeVLUNs(volumeName).get('members', [])
+        # Return the first VLUN found for the volume.
+        for vlun in vluns:
+            return vlun
 
         raise exceptions.HTTPNotFound({'code': 'NON_EXISTENT_VLUN',
                                        'desc': "VLUN '%s' was not found" %
                                                volumeName})
 
+    def _getVolumeVLUNs(self, volumeName):
+        return self._queryCollection('vluns',
+                                     query.Eq('volumeName', volumeName))
+
     def createVLUN(self, volumeName, lun=None, hostname=None, portPos=None,
                    noVcn=None, overrideLowerPriority=None, auto=False):
         """Create a new VLUN.
@@ -2295,7 +2611,9 @@ class HPE3ParClient(object):
             info['maxAutoLun'] = 0
             info['lun'] = 0
 
-        headers, body = self.http.post('/vluns', body=info)
+        with self.vlun_index.changing():
+            headers, body = self.http.post('/vluns', body=info)
+        self.vlun_index.refresh_volume(volumeName)
         if headers:
             location = headers['location'].replace('/api/v1/vluns/', '')
             return location
@@ -2354,7 +2672,9 @@ class HPE3ParClient(object):
                                    port['slot'],
                                    port['cardPort'])
 
-        response, body = self.http.delete('/vluns/%s' % vlun)
+        with self.vlun_index.changing():
+            response, body = self.http.delete('/vluns/%s' % vlun)
+        self.vlun_index.discard(volumeName, lunID, hostname, port)
 
     # VolumeSet methods
     def findVolumeSet(self, name):
@@ -2411,12 +2731,11 @@ class HPE3ParClient(object):
         :raises: :class:`~hpe3parclient.exceptions.HTTPForbidden`
             - INV_OPERATION_VV_INTERNAL_VOLUME - Illegal op on internal vol
         """
-        vvset_names = []
-        volume_sets = self.getVolumeSets()
-        for volume_set in volume_sets['members']:
-            if 'setmembers' in volume_set and name in volume_set['setmembers']:
-                vvset_names.append(volume_set)
-        return vvset_names
+        if self.volume_set_index.enabled:
+            return self.volume_set_index.find(name)
+        volume_sets = self._queryCollection('volumesets',
+                                            query.Eq('setmembers', name))
+        return volume_sets['members']
 
     def getVolumeSets(self):
         """
@@ -2496,7 +2815,9 @@ class HPE3ParClient(object):
             members = {'setmembers': setmembers}
             info = self._mergeDict(info, members)
 
-        response, body = self.http.post('/volumesets', body=info)
+        with self.volume_set_index.changing():
+            response, body = self.http.post('/volumesets', body=info)
+        self.volume_set_index.refresh(name)
 
     def deleteVolumeSet(self, name):
         """
@@ -2514,7 +2835,9 @@ class HPE3ParClient(object):
         :raises: :class:`~hpe3parclient.exceptions.HTTPConflict`
             - VVSET_QOS_TARGET - The object is already part of the set.
         """
-        response, body = self.http.delete('/volumesets/%s' % name)
+        with self.volume_set_index.changing():
+            response, body = self.http.delete('/volumesets/%s' % name)
+        self.volume_set_index.discard(name)
 
     def modifyVolumeSet(self, name, action=None, newName=None, comment=None,
                         flashCachePolicy=None, setmembers=None):
@@ -2589,7 +2912,9 @@ class HPE3ParClient(object):
             members = {'setmembers': setmembers}
             info = self._mergeDict(info, members)
 
-        response = self.http.put('/volumesets/%s' % name, body=info)
+        with self.volume_set_index.changing():
+            response = self.http.put('/volumesets/%s' % name, body=info)
+        self.volume_set_index.refresh(name, newName)
         return response
 
     # QoS Priority Optimization methods
@@ -4221,8 +4546,7 @@ class HPE3ParClient(object):
         :returns: List of snapshot names
         """
 
-        uri = '/volumes?query="copyOf EQ %s"' % (name)
-        response, body = self.http.get(uri)
+        body = self._queryCollection('volumes', query.Eq('copyOf', name))
 
         if live_test:
             snapshots = []
@@ -4241,7 +4565,85 @@ class HPE3ParClient(object):
 
             return snapshots
 
-    def _mergeDict(self, dict1, dict2):
+    @staticmethod
+    def _convertPrimeraVolumeOptions(optional):
+        """
+        Validate the tpvv/tdvv/compression volume options for a Primera
+        array and replace tdvv and compression with the reduce key, in place.
+
+        :param optional: The optional volume parameters
+        :type optional: dict
+
+        :raises: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+            - An invalid combination of tpvv, tdvv and compression
+
+        """
+        for key in ['tpvv', 'compression', 'tdvv']:
+            option = optional.get(key)
+            if option and option not in [True, False]:
+                # raising exception for junk compression input
+                ex_desc = "39 - invalid input: wrong type for key "\
+                    "[%s]. Valid values are [True, False]" % key
+                raise exceptions.HTTPBadRequest(ex_desc)
+
+        if optional.get('compression') is True:
+            combination = ['tdvv', 'compression']
+            len_diff = len(set(combination) - set(optional.keys()))
+            msg = "invalid input: For compressed and deduplicated "\
+                  "volumes both 'compression' and " \
+                  "'tdvv' must be specified as true"
+            if len_diff == 1:
+                raise exceptions.HTTPBadRequest(msg)
+            if optional.get('tdvv') is True \
+                    and optional.get('compression') is True:
+                optional['reduce'] = True
+
+            if optional.get('tdvv') is False \
+                    and optional.get('compression') is True:
+                raise exceptions.HTTPBadRequest(msg)
+        else:
+            msg = "invalid input: For compressed and deduplicated "\
+                  "volumes both 'compression' and "\
+                  "'tdvv' must be specified as true"
+            if optional.get('tdvv') is False \
+                    and optional.get('compression') is False:
+                optional['reduce'] = False
+            if optional.get('tdvv') is True \
+                    and optional.get('compression') is False:
+                raise exceptions.HTTPBadRequest(msg)
+
+        if 'compression' in optional:
+            optional.pop('compression')
+        if 'tdvv' in optional:
+            optional.pop('tdvv')
+
+    @staticmethod
+    def _convertPrimeraCopyError(ex):
+        """
+        Reword the error a Primera array gives a copy that is neither tpvv
+        nor reduced.
+
+        :param ex: The error the copy request failed with
+        :type ex: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+
+        :returns: :class:`~hpe3parclient.exceptions.HTTPBadRequest`
+
+        """
+        ex_desc = 'invalid input: one of the parameters is required'
+        ex_code = ex.get_code()
+        # INV_INPUT_ONE_REQUIRED => 78
+        if ex_code == 78 and \
+           ex.get_description() == ex_desc and \
+           ex.get_ref() == 'tpvv,reduce':
+            new_ex_desc = "invalid input: Either tpvv must be true "\
+                          "OR for compressed and deduplicated "\
+                          "volumes both 'compression' and 'tdvv' "\
+                          "must be specified as true."
+            return exceptions.HTTPBadRequest(new_ex_desc)
+        return ex
+
+    @staticmethod
+    def _mergeDict(dict1, dict2):
         """
         Safely merge 2 dictionaries together
 
@@ -4342,8 +4744,8 @@ class HPE3ParClient(object):
         :returns: list of snapshots of volName
 
         """
-        uri = '/volumes?query="snapCPG EQ %s"' % (snapcpgName)
-        response, body = self.http.get(uri)
+        body = self._queryCollection('volumes',
+                                     query.Eq('snapCPG', snapcpgName))
         snapshots = []
         for volume in body['members']:
             if 'copyOf' in volume:
@@ -4393,6 +4795,28 @@ class HPE3ParClient(object):
         response, body = self.http.post('/', body=info)
         return body
 
+    def createFlashCacheAsync(self, sizeInGib, mode, timeout=None,
+                              callback=None):
+        """Creates a new FlashCache, without waiting for the task.
+
+        Takes the same parameters and raises the same errors as
+        :meth:`createFlashCache`. When the array does not return a task
+        id the Flash Cache is created and the future is already done.
+
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture`
+
+        """
+        body = self.createFlashCache(sizeInGib, mode)
+        return self._taskFuture(body, timeout=timeout, callback=callback)
+
     def deleteFlashCache(self):
         """Deletes an existing Flash Cache
         :raises: :class:`~hpe3parclient.exceptions.HTTPForbidden`
@@ -4415,6 +4839,27 @@ class HPE3ParClient(object):
         response = self.http.put("/volumes/%s" % (volume_name), body=info)
         return response[1]
 
+    def resyncPhysicalCopyAsync(self, volume_name, timeout=None,
+                                callback=None):
+        """Resynchronizes a physical copy, without waiting for the task.
+
+        :param volume_name: The name of the volume
+        :type volume_name: str
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture` of the
+                  resync task
+
+        """
+        body = self.resyncPhysicalCopy(volume_name)
+        return self._taskFuture(body, timeout=timeout, callback=callback)
+
     def admitRemoteCopyLinks(
             self, targetName, source_port, target_port_wwn_or_ip):
         """Adding remote copy link from soure to target.
@@ -5090,6 +5535,28 @@ class HPE3ParClient(object):
             '/volumes/%s' % volName, body=info)
         return body
 
+    def tuneVolumeAsync(self, volName, tune_operation, optional=None,
+                        timeout=None, callback=None):
+        """Tune a volume, without waiting for the tune task.
+
+        Takes the same parameters and raises the same errors as
+        :meth:`tuneVolume`.
+
+        :param timeout: Seconds the task may run. Once they are over the
+                        task is cancelled and the future fails with
+                        :class:`~hpe3parclient.exceptions.Timeout`. Default
+                        waits for ever
+        :type timeout: float
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+
+        :returns: :class:`~hpe3parclient.taskwatcher.TaskFuture` of the
+                  tune task
+
+        """
+        body = self.tuneVolume(volName, tune_operation, optional)
+        return self._taskFuture(body, timeout=timeout, callback=callback)
+
     def _cancelTask(self, taskId):
         info = {'action': 1}
         try:
@@ -5098,3 +5565,7 @@ class HPE3ParClient(object):
             # it means task cannot be cancelled,
             # because it is 'done' or already 'cancelled'
             pass
+
+
+tracing.trace_methods(HPE3ParClient,
+                      exclude=('setTracer', 'batch', 'copyScheduler'))
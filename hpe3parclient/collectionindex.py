@@ -0,0 +1,114 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" In memory indexes of WSAPI collections.
+
+.. module: collectionindex
+
+:Description: The base of the indexes a client keeps of a collection, ie.
+ :class:`~hpe3parclient.setindex.SetIndex`. An index is built from one GET
+ of the collection on the first lookup and rebuilt ttl seconds later. In
+ between the client keeps it up to date with the changes it makes itself.
+
+"""
+
+import contextlib
+import threading
+import time
+
+
+class CollectionIndex(object):
+    """
+    :param ttl: Seconds before the index is rebuilt from the array. None
+                disables the index, see :attr:`enabled`
+    :type ttl: float
+
+    Subclasses implement _reset, which drops the indexed data, and _load,
+    which fetches the collection and indexes it. Both are called with the
+    lock held.
+
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._built_at = None
+        self.builds = 0
+        self.hits = 0
+        self._reset()
+
+    @property
+    def enabled(self):
+        """Whether the client answers lookups from the index."""
+        return self.ttl is not None
+
+    @property
+    def built(self):
+        """Whether the index holds the collection."""
+        return self._built_at is not None
+
+    def _reset(self):
+        raise NotImplementedError()
+
+    def _load(self):
+        raise NotImplementedError()
+
+    def _ensure_built(self):
+        # Called with the lock held, before a lookup.
+        built_at = self._built_at
+        if built_at is None or time.time() - built_at >= self.ttl:
+            self._built_at = None
+            self._reset()
+            self._load()
+            self._built_at = time.time()
+            self.builds += 1
+        else:
+            self.hits += 1
+
+    @contextlib.contextmanager
+    def changing(self):
+        """
+        Wraps a change made by the client. If it fails without an error
+        response from the array, the change may or may not have been made,
+        so the index is cleared and rebuilt on the next lookup.
+
+        """
+        try:
+            yield
+        except Exception as ex:
+            if getattr(ex, 'http_status', None) is None:
+                self.clear()
+            raise
+
+    def clear(self):
+        """Drop the index, the next lookup rebuilds it."""
+        with self._lock:
+            self._built_at = None
+            self._reset()
+
+    def _stats(self):
+        return {}
+
+    def get_stats(self):
+        """
+        :returns: dict - {'built': bool, 'builds': int, 'hits': int} and the
+                  sizes of the index
+
+        """
+        with self._lock:
+            stats = {'built': self.built,
+                     'builds': self.builds,
+                     'hits': self.hits}
+            stats.update(self._stats())
+            return stats
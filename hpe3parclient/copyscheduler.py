@@ -0,0 +1,348 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Scheduler of volume copies.
+
+.. module: copyscheduler
+
+:Description: A CopyScheduler queues volume copies and keeps only so many
+ of their tasks active on the array at once, and so many per destination
+ CPG, instead of starting them all and letting the array queue them. The
+ next copy is started as soon as one completes, the highest priority
+ first, then in the order they were submitted. Copies are started from
+ the thread that submits them, or from a thread of the scheduler once a
+ copy completes, so the shared poll of the task watcher never waits on
+ the requests that start a copy.
+
+ Every copy submitted gets a :class:`CopyJob`, a
+ :class:`~hpe3parclient.taskwatcher.TaskFuture` resolved once its copy
+ task is over. The copy tasks are watched by the client's task watcher.
+
+.. code-block:: python
+
+    scheduler = cl.copyScheduler(max_active=8, max_per_cpg=4)
+    jobs = [scheduler.submit(name, name + '-clone', 'CPG1')
+            for name in names]
+    scheduler.submit('db1', 'db1-clone', 'CPG2',
+                     priority=scheduler.TASK_PRIORITY_HIGH)
+    scheduler.wait()
+    scheduler.get_stats()    # queued, active, mib_per_sec...
+
+"""
+
+import bisect
+import itertools
+import logging
+import threading
+import time
+
+from hpe3parclient import exceptions
+from hpe3parclient import taskwatcher
+
+LOG = logging.getLogger(__name__)
+
+
+class CopyJob(taskwatcher.TaskFuture):
+    """
+    A copy submitted to a :class:`CopyScheduler`. It is resolved with the
+    copy task once the task is over, like the future of copyVolumeAsync.
+
+    :param scheduler: The scheduler the copy was submitted to
+    :type scheduler: :class:`CopyScheduler`
+
+    The other parameters are those of :meth:`CopyScheduler.submit`.
+
+    """
+
+    def __init__(self, scheduler, src_name, dest_name, dest_cpg, optional,
+                 priority, size_mib):
+        super(CopyJob, self).__init__(name=dest_name)
+        self.scheduler = scheduler
+        self.src_name = src_name
+        self.dest_cpg = dest_cpg
+        self.optional = optional
+        self.priority = priority
+        self.size_mib = size_mib
+        # The future of the copy task, once the copy is started.
+        self.copy = None
+        self.queued_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def progress(self):
+        copy = self.copy
+        if copy is not None and not self.done():
+            return copy.progress
+        return super(CopyJob, self).progress
+
+    def cancel(self):
+        """
+        Drop the copy if it is queued, or cancel its task if it is active.
+
+        :returns: bool - False if the copy is over
+
+        """
+        return self.scheduler._cancel(self)
+
+    def __repr__(self):
+        return '<CopyJob %s to %s priority=%s>' % (self.src_name, self.name,
+                                                   self.priority)
+
+
+class CopyScheduler(object):
+    """
+    :param client: The client the copies are made with
+    :type client: :class:`~hpe3parclient.client.HPE3ParClient`
+    :param max_active: The most copy tasks active on the array at once
+    :type max_active: int
+    :param max_per_cpg: The most copy tasks active into one CPG at once
+    :type max_per_cpg: int
+
+    """
+
+    # taskPriorityEnum, as in HPE3ParClient.TASK_PRIORITY_HIGH etc. A lower
+    # value is a higher priority.
+    TASK_PRIORITY_HIGH = 1
+    TASK_PRIORITY_MED = 2
+    TASK_PRIORITY_LOW = 3
+
+    def __init__(self, client, max_active=4, max_per_cpg=2):
+        self.client = client
+        self.max_active = max_active
+        self.max_per_cpg = max_per_cpg
+        self._cond = threading.Condition()
+        # (priority, submit order, job), kept sorted.
+        self._queue = []
+        self._order = itertools.count()
+        self._active = set()
+        self._active_per_cpg = {}
+        # The thread starting queued jobs, None while none is.
+        self._starter = None
+        # The jobs over but not yet resolved, wait() waits for them too.
+        self._resolving = 0
+        self.completed = 0
+        self.failed = 0
+        self.mib_copied = 0
+        self._first_start = None
+        self._last_finish = None
+
+    def submit(self, src_name, dest_name, dest_cpg, optional=None,
+               priority=None, size_mib=None, callback=None):
+        """
+        Queue a copy, it is started once there is a free task slot.
+
+        :param src_name: the source volume name
+        :type src_name: str
+        :param dest_name: the destination volume name
+        :type dest_name: str
+        :param dest_cpg: the destination CPG
+        :type dest_cpg: str
+        :param optional: The optional params of copyVolume
+        :type optional: dict
+        :param priority: TASK_PRIORITY_HIGH, MED or LOW. It orders the
+                         queue, and is the task priority of an offline
+                         copy unless optional sets one. Default is
+                         optional['priority'], else TASK_PRIORITY_MED
+        :type priority: int
+        :param size_mib: The size of the source volume, for the throughput.
+                         Default reads it from the array as the copy starts
+        :type size_mib: int
+        :param callback: Called with the job once the copy is over
+        :type callback: callable
+
+        :returns: :class:`CopyJob`
+
+        """
+        optional = dict(optional or {})
+        if priority is None:
+            priority = optional.get('priority', self.TASK_PRIORITY_MED)
+        elif not optional.get('online'):
+            optional.setdefault('priority', priority)
+        job = CopyJob(self, src_name, dest_name, dest_cpg, optional,
+                      priority, size_mib)
+        if callback is not None:
+            job.add_done_callback(callback)
+        with self._cond:
+            bisect.insort(self._queue, (priority, next(self._order), job))
+        self._dispatch()
+        return job
+
+    def _next(self):
+        # Called with the lock held. Takes the first queued job with a free
+        # slot, None if there is none.
+        if len(self._active) >= self.max_active:
+            return None
+        for index, (priority, order, job) in enumerate(self._queue):
+            cpg_active = self._active_per_cpg.get(job.dest_cpg, 0)
+            if cpg_active < self.max_per_cpg:
+                del self._queue[index]
+                self._active.add(job)
+                self._active_per_cpg[job.dest_cpg] = cpg_active + 1
+                job.started_at = time.time()
+                if self._first_start is None:
+                    self._first_start = job.started_at
+                return job
+        return None
+
+    def _dispatch(self, background=False):
+        # Starts jobs while there are free slots, from this thread or, with
+        # background, from a new one. A copy that is over calls this from
+        # the task watcher thread, which must not wait on the requests that
+        # start the next copy. Only one thread starts jobs at a time, the
+        # others leave the slots they freed to it.
+        with self._cond:
+            if self._starter is not None or not self._queue:
+                return
+            if background:
+                self._starter = threading.Thread(
+                    target=self._start_queued,
+                    name='hpe3parclient-copyscheduler')
+                self._starter.daemon = True
+                self._starter.start()
+                return
+            self._starter = threading.current_thread()
+        self._start_queued()
+
+    def _start_queued(self):
+        try:
+            while True:
+                with self._cond:
+                    job = self._next()
+                    if job is None:
+                        self._starter = None
+                        return
+                self._start(job)
+        except Exception:
+            with self._cond:
+                self._starter = None
+            raise
+
+    def _start(self, job):
+        if job.size_mib is None:
+            try:
+                job.size_mib = self.client.getVolume(
+                    job.src_name).get('sizeMiB')
+            except Exception as ex:
+                LOG.debug("Could not read the size of %s: %s",
+                          job.src_name, ex)
+
+        def finished(copy):
+            self._finished(job, copy.task, copy.error)
+
+        try:
+            copy = self.client.copyVolumeAsync(
+                job.src_name, job.name, job.dest_cpg, job.optional,
+                callback=finished)
+        except Exception as ex:
+            LOG.debug("Could not start the copy of %s: %s", job.src_name, ex)
+            self._finished(job, None, ex)
+            return
+        job.copy = copy
+        job.task_id = copy.task_id
+
+    def _finished(self, job, task, error):
+        with self._cond:
+            if job not in self._active:
+                return
+            self._active.discard(job)
+            self._active_per_cpg[job.dest_cpg] -= 1
+            if not self._active_per_cpg[job.dest_cpg]:
+                del self._active_per_cpg[job.dest_cpg]
+            job.finished_at = self._last_finish = time.time()
+            if error is None:
+                self.completed += 1
+                self.mib_copied += job.size_mib or 0
+            else:
+                self.failed += 1
+            self._resolving += 1
+        self._resolve(job, task, error)
+        self._dispatch(background=True)
+
+    def _resolve(self, job, task, error):
+        # The job is counted in _resolving, so that wait() only returns once
+        # it is resolved and its callbacks have run.
+        try:
+            job._resolve(task, error)
+        finally:
+            with self._cond:
+                self._resolving -= 1
+                self._cond.notify_all()
+
+    def _cancel(self, job):
+        with self._cond:
+            queued = [item for item in self._queue if item[2] is job]
+            if queued:
+                self._queue.remove(queued[0])
+                self._resolving += 1
+            copy = job.copy
+        if queued:
+            self._resolve(job, None, exceptions.TaskCancelled(
+                {'desc': "The copy to %s was cancelled before it started" %
+                         job.name}))
+            return True
+        if copy is not None:
+            return copy.cancel()
+        return False
+
+    def wait(self, timeout=None):
+        """
+        Wait for every copy submitted to be over.
+
+        :param timeout: Seconds to wait. Default waits until they are over
+        :type timeout: float
+
+        :returns: bool - whether they are all over
+
+        """
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self._cond:
+            while self._queue or self._active or self._resolving:
+                if deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_stats(self):
+        """
+        :returns: dict - {'queued': int, 'active': int,
+                  'active_per_cpg': dict, 'completed': int, 'failed': int,
+                  'mib_copied': int, 'mib_per_sec': float}. The throughput
+                  is the MiB of the completed copies over the time since
+                  the first copy started, up to the last one completing
+                  once none is active
+
+        """
+        with self._cond:
+            mib_per_sec = 0.0
+            if self._first_start is not None:
+                if self._queue or self._active:
+                    end = time.time()
+                else:
+                    end = self._last_finish or time.time()
+                if end > self._first_start:
+                    mib_per_sec = self.mib_copied / (end - self._first_start)
+            return {'queued': len(self._queue),
+                    'active': len(self._active),
+                    'active_per_cpg': dict(self._active_per_cpg),
+                    'completed': self.completed,
+                    'failed': self.failed,
+                    'mib_copied': self.mib_copied,
+                    'mib_per_sec': mib_per_sec}
@@ -175,6 +175,30 @@ class Timeout(ClientException):
     pass
 
 
+class CircuitOpen(ClientException):
+    """
+    The request was not sent, the circuit breaker of the array is open
+    """
+    http_status = ""
+    message = "Circuit Breaker Open"
+
+
+class TaskFailed(ClientException):
+    """
+    The array task being waited on failed
+    """
+    http_status = ""
+    message = "Task Failed"
+
+
+class TaskCancelled(ClientException):
+    """
+    The array task being waited on was cancelled
+    """
+    http_status = ""
+    message = "Task Cancelled"
+
+
 # 400 Errors
 
 
@@ -29,6 +29,7 @@ from functools import wraps
 
 from hpe3parclient import client
 from hpe3parclient import tcl_parser
+from hpe3parclient import tracing
 
 TCL = tcl_parser.HPE3ParTclParser()
 LOG = logging.getLogger(__name__)
@@ -1643,3 +1644,6 @@ class HPE3ParFilePersonaClient(client.HPE3ParClient):
             }
 
         """
+
+
+tracing.trace_methods(HPE3ParFilePersonaClient)
@@ -0,0 +1,273 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Fan-out of client calls across many arrays.
+
+.. module: fleet
+
+:Description: An HPE3ParFleet holds a logged in client per array and runs a
+ client method on all of them at once, from a bounded pool of threads, so a
+ sweep of the fleet takes about as long as its slowest array. Every call
+ returns an :class:`ArrayResult` per array, one array failing does not stop
+ the others.
+
+.. code-block:: python
+
+    arrays = fleet.HPE3ParFleet(max_workers=8)
+    arrays.add_array('array1', 'https://array1:8080/api/v1', user, password)
+    arrays.add_array('array2', 'https://array2:8080/api/v1', user, password)
+    arrays.login()
+
+    for name, result in arrays.run('getCPGs').items():
+        if result.ok:
+            print(name, result.value['total'])
+        else:
+            print(name, 'failed:', result.error)
+
+"""
+
+import collections
+import logging
+import threading
+
+from hpe3parclient import batch
+from hpe3parclient import client
+from hpe3parclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+class ArrayResult(object):
+    """
+    The outcome of a call on one array.
+
+    :param name: The array name
+    :type name: str
+    :param value: What the call returned, None if it failed
+    :param error: The exception the call raised, None if it succeeded
+    :type error: Exception
+    :param duration: Seconds the call took
+    :type duration: float
+
+    """
+
+    def __init__(self, name, value=None, error=None, duration=0.0):
+        self.name = name
+        self.value = value
+        self.error = error
+        self.duration = duration
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def get(self):
+        """
+        :returns: the value of the call, or raises the error it failed with
+
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        if self.error is not None:
+            return '<ArrayResult %s error=%r>' % (self.name, self.error)
+        return '<ArrayResult %s ok>' % self.name
+
+
+class HPE3ParFleet(object):
+    """
+    :param max_workers: The number of arrays called at once. Default is 8
+    :type max_workers: int
+    :param client_class: The class of the clients add_array creates.
+                         Default is
+                         :class:`~hpe3parclient.client.HPE3ParClient`
+    :type client_class: class
+
+    """
+
+    def __init__(self, max_workers=8, client_class=client.HPE3ParClient):
+        self.max_workers = max_workers
+        self.client_class = client_class
+        self._lock = threading.Lock()
+        # {name: (api_url, username, password, client kwargs)}, in the
+        # order the arrays were added.
+        self._arrays = collections.OrderedDict()
+        # {name: client}, of the arrays logged in to.
+        self._clients = {}
+
+    @property
+    def names(self):
+        """The names of the arrays, in the order they were added."""
+        with self._lock:
+            return list(self._arrays)
+
+    def add_array(self, name, api_url, username, password, **kwargs):
+        """
+        Add an array, login creates its client and logs in.
+
+        :param name: The name results are keyed by
+        :type name: str
+        :param api_url: The url of the array's WSAPI
+        :type api_url: str
+        :param username: The username
+        :type username: str
+        :param password: The password
+        :type password: str
+
+        The remaining keyword arguments are passed to the client
+        constructor, ie. secure or timeout.
+
+        :raises: ValueError if an array of that name is already in the fleet
+
+        """
+        with self._lock:
+            if name in self._arrays:
+                raise ValueError("Array %s is already in the fleet" % name)
+            self._arrays[name] = (api_url, username, password, kwargs)
+
+    def add_client(self, name, array_client):
+        """
+        Add an array by a client that is already logged in.
+
+        :param name: The name results are keyed by
+        :type name: str
+        :param array_client: The client of the array
+        :type array_client: :class:`~hpe3parclient.client.HPE3ParClient`
+
+        :raises: ValueError if an array of that name is already in the fleet
+
+        """
+        with self._lock:
+            if name in self._arrays:
+                raise ValueError("Array %s is already in the fleet" % name)
+            self._arrays[name] = None
+            self._clients[name] = array_client
+
+    def remove_array(self, name):
+        """Remove an array, without logging out of it."""
+        with self._lock:
+            del self._arrays[name]
+            self._clients.pop(name, None)
+
+    def get_client(self, name):
+        """
+        :returns: the client of the array, None if it is not logged in
+
+        """
+        with self._lock:
+            return self._clients.get(name)
+
+    def login(self):
+        """
+        Create the clients of the arrays added with add_array and log in,
+        for every array not logged in yet.
+
+        :returns: dict - {name: :class:`ArrayResult`}, the value is the
+                  client
+
+        """
+        with self._lock:
+            # Arrays added by their client have nothing to log in with.
+            pending = [(name, array) for name, array in self._arrays.items()
+                       if array is not None and name not in self._clients]
+
+        def connect(name, array):
+            api_url, username, password, kwargs = array
+            array_client = self.client_class(api_url, **kwargs)
+            array_client.login(username, password)
+            with self._lock:
+                if name in self._arrays:
+                    self._clients[name] = array_client
+            return array_client
+
+        return self._map([(name, connect, (name, array))
+                          for name, array in pending])
+
+    def logout(self):
+        """
+        Log out of every array.
+
+        :returns: dict - {name: :class:`ArrayResult`}
+
+        """
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients = {}
+        return self._map([(name, array_client.logout, ())
+                          for name, array_client in clients])
+
+    def run(self, method, *args, **kwargs):
+        """
+        Call a client method on every array at once.
+
+        .. code-block:: python
+
+            results = arrays.run('getVolume', 'vol1')
+            results = arrays.run(lambda cl: cl.getHost('host1')['id'])
+
+        :param method: The client method name, or a callable taking the
+                       client of an array
+        :type method: str or callable
+
+        The remaining arguments are passed to the client method.
+
+        :returns: dict - {name: :class:`ArrayResult`}, with a result for
+                  every array in the fleet. Arrays not logged in fail with
+                  :class:`~hpe3parclient.exceptions.AuthorizationFailure`
+        :raises: ValueError if method is not a method of the client class
+
+        """
+        # Checked before any array is called, rather than failing on each.
+        if not callable(method) and not callable(
+                getattr(self.client_class, method, None)):
+            raise ValueError("%s has no method %s" %
+                             (self.client_class.__name__, method))
+
+        with self._lock:
+            arrays = [(name, self._clients.get(name))
+                      for name in self._arrays]
+
+        calls = []
+        for name, array_client in arrays:
+            if array_client is None:
+                calls.append((name, self._not_logged_in(name), args))
+            elif callable(method):
+                calls.append((name, method, (array_client,) + args))
+            else:
+                calls.append((name, getattr(array_client, method), args))
+        return self._map(calls, kwargs)
+
+    @staticmethod
+    def _not_logged_in(name):
+        # Stands in for the client method, so takes any arguments.
+        def fail(*args, **kwargs):
+            raise exceptions.AuthorizationFailure(
+                "Not logged in to array %s" % name)
+        return fail
+
+    def _map(self, calls, kwargs=None):
+        # calls is [(name, func, args)], run from up to max_workers threads.
+        kwargs = kwargs or {}
+        outcomes = batch.run_calls([(func, args, kwargs)
+                                    for name, func, args in calls],
+                                   self.max_workers)
+        results = {}
+        for (name, func, args), (value, error, duration) in zip(calls,
+                                                                outcomes):
+            if error is not None:
+                LOG.debug("Call on array %s failed: %s", name, error)
+            results[name] = ArrayResult(name, value, error, duration)
+        return results
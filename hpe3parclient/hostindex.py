@@ -0,0 +1,217 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Host initiator index.
+
+.. module: hostindex
+
+:Description: An InitiatorIndex maps the FC WWNs and iSCSI names of the
+ hosts of an array to the host that has them, from the FCPaths and
+ iSCSIPaths of one GET of /hosts. It lets findHost and queryHost look a
+ host up in memory, instead of over SSH or with a query.
+
+ The client reads every host it creates or modifies back from the array,
+ and drops the hosts it deletes. A change made by anything else only
+ shows once the index is rebuilt, ttl seconds after it was built.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(url, host_index_ttl=300)
+    cl.login(user, password)
+    cl.findHost(wwn='10:00:00:00:C9:12:34:56')    # GET /hosts
+    cl.findHost(iqn='iqn.1993-08.org.debian:01')  # no request
+
+"""
+
+import copy
+import logging
+
+from hpe3parclient import collectionindex
+from hpe3parclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+
+def normalize_wwn(wwn):
+    """
+    :param wwn: A WWN, with or without colons
+    :type wwn: str
+
+    :returns: str - the WWN as the WSAPI returns it, ie. 10000000C9123456
+
+    """
+    return wwn.replace(':', '').upper()
+
+
+def normalize_iqn(iqn):
+    """
+    :param iqn: An iSCSI name, they are not case sensitive
+    :type iqn: str
+
+    :returns: str - the iSCSI name in lower case
+
+    """
+    return iqn.lower()
+
+
+class InitiatorIndex(collectionindex.CollectionIndex):
+    """
+    :param get_hosts: Returns the host collection, ie. {'members': [...]}
+    :type get_hosts: callable
+    :param get_host: Returns the host with the given name
+    :type get_host: callable
+    :param ttl: Seconds before the index is rebuilt from the array. None
+                disables the index
+    :type ttl: float
+
+    """
+
+    def __init__(self, get_hosts, get_host, ttl=None):
+        self.get_hosts = get_hosts
+        self.get_host = get_host
+        super(InitiatorIndex, self).__init__(ttl)
+
+    def _reset(self):
+        # Host name to (position in the collection, host).
+        self._hosts = {}
+        # Normalized WWN or iSCSI name to host name.
+        self._wwns = {}
+        self._iqns = {}
+        self._next_position = 0
+
+    def _load(self):
+        for host in self.get_hosts().get('members', []):
+            self._add(host)
+
+    @staticmethod
+    def _initiators(host):
+        wwns = [normalize_wwn(path['wwn'])
+                for path in host.get('FCPaths') or [] if path.get('wwn')]
+        iqns = [normalize_iqn(path['name'])
+                for path in host.get('iSCSIPaths') or [] if path.get('name')]
+        return wwns, iqns
+
+    def _add(self, host, position=None):
+        name = host['name']
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._hosts[name] = (position, host)
+        wwns, iqns = self._initiators(host)
+        for wwn in wwns:
+            self._wwns[wwn] = name
+        for iqn in iqns:
+            self._iqns[iqn] = name
+
+    def _remove(self, name):
+        # Returns the position of the host, None if it is not indexed.
+        if name not in self._hosts:
+            return None
+        position, host = self._hosts.pop(name)
+        wwns, iqns = self._initiators(host)
+        for wwn in wwns:
+            if self._wwns.get(wwn) == name:
+                del self._wwns[wwn]
+        for iqn in iqns:
+            if self._iqns.get(iqn) == name:
+                del self._iqns[iqn]
+        return position
+
+    def find(self, iqn=None, wwn=None):
+        """
+        :param iqn: An iSCSI name
+        :type iqn: str
+        :param wwn: A FC WWN, with or without colons
+        :type wwn: str
+
+        :returns: str - the name of the host with the initiator, or None.
+                  The iSCSI name is looked up first
+
+        """
+        with self._lock:
+            self._ensure_built()
+            if iqn:
+                return self._iqns.get(normalize_iqn(iqn))
+            if wwn:
+                return self._wwns.get(normalize_wwn(wwn))
+            return None
+
+    def query(self, iqns=None, wwns=None):
+        """
+        :param iqns: iSCSI names
+        :type iqns: list
+        :param wwns: FC WWNs, with or without colons
+        :type wwns: list
+
+        :returns: dict - {'total': int, 'members': [...]}, copies of the
+                  hosts with any of the initiators, in the order of the
+                  collection
+
+        """
+        with self._lock:
+            self._ensure_built()
+            names = set()
+            for iqn in iqns or []:
+                names.add(self._iqns.get(normalize_iqn(iqn)))
+            for wwn in wwns or []:
+                names.add(self._wwns.get(normalize_wwn(wwn)))
+            names.discard(None)
+            hosts = [copy.deepcopy(host) for position, host in
+                     sorted(self._hosts[name] for name in names)]
+        return {'total': len(hosts), 'members': hosts}
+
+    def refresh(self, name, new_name=None):
+        """
+        Read a host the client created or modified back from the array.
+
+        :param name: The host name
+        :type name: str
+        :param new_name: The name the host was renamed to
+        :type new_name: str
+
+        """
+        if not self.built:
+            return
+        try:
+            host = self.get_host(new_name or name)
+        except exceptions.HTTPNotFound:
+            host = None
+        except Exception as ex:
+            LOG.debug("Could not read host %s back, clearing the index: %s",
+                      new_name or name, ex)
+            self.clear()
+            return
+        with self._lock:
+            if not self.built:
+                return
+            # A host read back keeps its place in the collection.
+            position = self._remove(name)
+            if host is not None:
+                self._remove(host['name'])
+                self._add(host, position)
+
+    def discard(self, name):
+        """
+        Drop a host the client deleted.
+
+        :param name: The host name
+        :type name: str
+
+        """
+        with self._lock:
+            self._remove(name)
+
+    def _stats(self):
+        return {'hosts': len(self._hosts), 'wwns': len(self._wwns),
+                'iqns': len(self._iqns)}
@@ -26,15 +26,52 @@
 
 import logging
 import requests
+import threading
 import time
 import ast
+import collections
+import copy
 
 try:
     import json
 except ImportError:
     import simplejson as json
 
+try:
+    # Optional, decodes large listings several times faster than json.
+    import orjson
+except ImportError:
+    orjson = None
+
+from hpe3parclient import cache
 from hpe3parclient import exceptions
+from hpe3parclient import jsonstream
+from hpe3parclient import metrics
+from hpe3parclient import retry
+
+JSON_BACKEND = 'orjson' if orjson is not None else json.__name__
+
+
+def json_loads(data):
+    """
+    Decode a JSON document straight from the bytes of a response body,
+    without decoding it to text first.
+
+    Uses orjson when it is installed and falls back to json for what
+    orjson rejects, ie. NaN.
+
+    :param data: The JSON document
+    :type data: bytes
+
+    :raises: ValueError if data is not JSON
+
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            pass
+    return json.loads(data)
 
 
 class HTTPJSONRESTClient(object):
@@ -52,6 +89,60 @@ class HTTPJSONRESTClient(object):
     :param suppress_ssl_warnings: Suppresses log warning messages if True.
                                   Default will not suppress warnings.
     :type suppress_ssl_warnings: bool
+    :param pool_connections: The number of per-host connection pools to
+                             cache. Default is 10
+    :type pool_connections: int
+    :param pool_maxsize: The maximum number of keep-alive connections kept
+                         open per host. Default is 10
+    :type pool_maxsize: int
+    :param pool_block: Block when no free connection is available in the pool
+                       instead of opening a throwaway one. Default will not
+                       block
+    :type pool_block: bool
+    :param keep_alive: Reuse TCP connections (and therefore their TLS
+                       sessions) between requests. Default is True
+    :type keep_alive: bool
+    :param retry_policy: How failed requests are retried. Default is a
+                         :class:`~hpe3parclient.retry.RetryPolicy` with its
+                         default settings
+    :type retry_policy: RetryPolicy
+    :param max_timings: Keep the raw timings of the last max_timings
+                        requests for get_timings. Default keeps none, the
+                        latency histograms are always kept
+    :type max_timings: int
+    :param metrics_hooks: The hooks every request reports to. Default is a
+                          new :class:`~hpe3parclient.metrics.MetricsHooks`
+    :type metrics_hooks: MetricsHooks
+    :param response_cache: Cache GET responses in this cache, writes made
+                           through this client evict the entries they
+                           affect. Default does not cache
+    :type response_cache: :class:`~hpe3parclient.cache.ResponseCache`
+    :param coalesce_gets: Let concurrent identical GETs share one request
+                          to the array, every caller gets its own copy of
+                          the response. Default is True
+    :type coalesce_gets: bool
+    :param session_store: Share session keys with the other clients using
+                          this store, ie. other processes on this host.
+                          Default does not share them
+    :type session_store: :class:`~hpe3parclient.session_store.SessionStore`
+    :param session_max_age: Log in again before sending a request once the
+                            session is this many seconds old, instead of
+                            waiting for the array to reject it. Set it a
+                            little below the array's session timeout.
+                            Default only logs in again after a 401 or 403
+    :type session_max_age: float
+    :param concurrency_limiter: Queue the requests this client makes over
+                                the limit's current concurrency. Default
+                                does not limit
+    :type concurrency_limiter:
+        :class:`~hpe3parclient.limiter.AdaptiveLimiter`
+    :param circuit_breaker: Fail requests at once while this breaker is
+                            open, instead of retrying them. Default never
+                            fails fast
+    :type circuit_breaker: :class:`~hpe3parclient.breaker.CircuitBreaker`
+
+    Threads share the session of the client. When it expires only one of
+    them logs in again, the others wait for it and then retry.
 
     """
 
@@ -60,25 +151,70 @@ class HTTPJSONRESTClient(object):
     http_log_debug = False
     _logger = logging.getLogger(__name__)
 
-    # Retry constants
-    retry_exceptions = (exceptions.HTTPServiceUnavailable,
-                        requests.exceptions.ConnectionError)
-    tries = 5
-    delay = 0
-    backoff = 2
+    # The attempt failures that count against the circuit breaker, the
+    # array did not answer.
+    circuit_exceptions = (requests.exceptions.ConnectionError,
+                          requests.exceptions.Timeout)
 
     def __init__(self, api_url, secure=False, http_log_debug=False,
-                 suppress_ssl_warnings=False, timeout=None):
+                 suppress_ssl_warnings=False, timeout=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 keep_alive=True, retry_policy=None, max_timings=0,
+                 metrics_hooks=None, response_cache=None,
+                 coalesce_gets=True, session_store=None,
+                 session_max_age=None, concurrency_limiter=None,
+                 circuit_breaker=None):
         if suppress_ssl_warnings:
             requests.packages.urllib3.disable_warnings()
 
         self.session_key = None
+        self.session_store = session_store
+        self._session_id = None
+        # When the session key was obtained.
+        self.session_time = None
+        self.session_max_age = session_max_age
+        # The thread logging in again while the others wait, if any.
+        self._auth_cond = threading.Condition()
+        self._refresher = None
+
+        # Each client owns its own connection pool so that the TCP
+        # connection and TLS handshake are paid once, not per request.
+        self.keep_alive = keep_alive
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if retry_policy is None:
+            retry_policy = retry.RetryPolicy()
+        self.retry_policy = retry_policy
+        self._retry_lock = threading.Lock()
+        self._retry_stats = {'requests': 0, 'attempts': 0, 'retries': 0,
+                             'exhausted': 0}
+        self._local = threading.local()
 
         # should be http://<Server:Port>/api/v1
         self.set_url(api_url)
         self.set_debug_flag(http_log_debug)
 
-        self.times = []  # [("item", starttime, endtime), ...]
+        # [("item", starttime, endtime), ...], only the most recent ones.
+        self.times = collections.deque(maxlen=max_timings)
+        self.latency = metrics.LatencyRecorder()
+        self.decode_latency = metrics.LatencyRecorder()
+        if metrics_hooks is None:
+            metrics_hooks = metrics.MetricsHooks()
+        self.metrics = metrics_hooks
+        self.response_cache = response_cache
+        self.concurrency_limiter = concurrency_limiter
+        self.circuit_breaker = circuit_breaker
+        # {url: _InFlightGet}, the GETs currently on the wire.
+        self.coalesce_gets = coalesce_gets
+        self._in_flight_lock = threading.Lock()
+        self._in_flight = {}
+        self._coalesce_stats = {'requests': 0, 'coalesced': 0}
         self.secure = secure
         self.timeout = timeout
 
@@ -86,6 +222,74 @@ class HTTPJSONRESTClient(object):
         # should be http://<Server:Port>/api/v1
         self.api_url = api_url.rstrip('/')
 
+    def close(self):
+        """
+        This closes every pooled connection held by this client.
+
+        """
+        self.session.close()
+
+    def get_pool_stats(self):
+        """
+        This gives the connection pool counters for every host this client
+        has talked to.
+
+        A hit is a request that was sent over an already open connection,
+        a miss is a request that had to open a new connection first.
+
+        :returns: dict - {'hits': int, 'misses': int, 'pools': int}
+
+        """
+        hits = 0
+        misses = 0
+        pools = 0
+        seen = set()
+        for adapter in self.session.adapters.values():
+            if id(adapter) in seen:
+                continue
+            seen.add(id(adapter))
+            pool_manager = adapter.poolmanager
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools += 1
+                misses += pool.num_connections
+                hits += max(pool.num_requests - pool.num_connections, 0)
+
+        return {'hits': hits, 'misses': misses, 'pools': pools}
+
+    def get_retry_stats(self):
+        """
+        This gives the retry counters summed over every request made since
+        the client was created.
+
+        :returns: dict - {'requests': int, 'attempts': int, 'retries': int,
+                          'exhausted': int}
+
+        """
+        with self._retry_lock:
+            return dict(self._retry_stats)
+
+    def get_last_retry_state(self):
+        """
+        This gives the retry bookkeeping of the last request made by the
+        calling thread, including the latency of every attempt.
+
+        :returns: :class:`~hpe3parclient.retry.RetryState` or None
+
+        """
+        return getattr(self._local, 'retry_state', None)
+
+    def _record_retry_state(self, retry_state):
+        self._local.retry_state = retry_state
+        with self._retry_lock:
+            self._retry_stats['requests'] += 1
+            self._retry_stats['attempts'] += len(retry_state.attempts)
+            self._retry_stats['retries'] += retry_state.retries
+            if retry_state.exhausted:
+                self._retry_stats['exhausted'] += 1
+
     def set_debug_flag(self, flag):
         """
         This turns on/off http request/response debugging output to console
@@ -121,36 +325,263 @@ class HTTPJSONRESTClient(object):
             self._auth_optional = optional
             info.update(optional)
 
-        resp, body = self.post('/credentials', body=info)
-        if body and 'key' in body:
-            self.session_key = body['key']
+        if not self._use_stored_session(user, password, optional):
+            resp, body = self.post('/credentials', body=info)
+            self.session_time = time.time()
+            if body and 'key' in body:
+                self.session_key = body['key']
+                unused_key = self._store_session()
+                if unused_key is not None:
+                    self._delete_session(unused_key)
         self.auth_try = 0
         self.user = user
         self.password = password
 
+    def _use_stored_session(self, user, password, optional):
+        """
+        Take the session key another client left in the session store,
+        along with the time its session was created.
+
+        :returns: bool - True if a stored key is used
+
+        """
+        if self.session_store is None:
+            return False
+        self._session_id = self.session_store.session_id(
+            self.api_url, user, password, optional)
+        stored = self.session_store.acquire(self._session_id)
+        if stored is None:
+            return False
+        self.session_key, self.session_time = stored
+        return True
+
+    def _store_session(self):
+        """
+        Store the new session key, or take the one another client logging
+        in at the same time stored first.
+
+        :returns: str - the new session key if the stored one was taken in
+                  its place, so that its session is deleted, or None
+
+        """
+        if self.session_store is None:
+            return None
+        new_key = self.session_key
+        self.session_key, self.session_time = self.session_store.put(
+            self._session_id, new_key, self.session_time)
+        if self.session_key == new_key:
+            return None
+        return new_key
+
+    def _release_stored_session(self, retire=False):
+        """
+        Let go of the session key in the session store.
+
+        :param retire: Also stop the store handing the key out
+        :type retire: bool
+
+        :returns: bool - True if no other client holds the key, so the
+                  session can be deleted on the array
+
+        """
+        if self.session_store is None or not self.session_key:
+            return True
+        return self.session_store.release(self._session_id, self.session_key,
+                                          retire)
+
+    def _delete_session(self, key):
+        # Deletes a session this client no longer uses. Sent as is, as a
+        # failure must not log this client in again.
+        try:
+            self._time_request(self.api_url + '/credentials/%s' % key,
+                               'DELETE')
+        except exceptions.ClientException as ex:
+            HTTPJSONRESTClient._logger.warning(
+                "Failed to delete an unused session: %s", ex)
+
+    def _forget_stored_session(self):
+        # Called when the array rejects the key or it is deleted.
+        if self.session_store is not None and self.session_key:
+            self.session_store.invalidate(self._session_id, self.session_key)
+
+    def _drop_session(self, proactive):
+        """
+        Stop using the session key ahead of logging in again.
+
+        :returns: str - the key if its session is still live on the array
+                  and no other client holds it, so that it is deleted once
+                  logged in again, or None
+
+        """
+        if not proactive:
+            # The array rejected the key, there is nothing to delete.
+            self._forget_stored_session()
+            return None
+        # Still live, other clients may keep using it for a while.
+        if self._release_stored_session(retire=True):
+            return self.session_key
+        return None
+
     def _reauth(self):
         self.authenticate(self.user, self.password, self._auth_optional)
 
+    def _session_expiring(self, url):
+        # Don't log in again just to log out.
+        if url.startswith('/credentials'):
+            return False
+        if None in (self.session_max_age, self.session_key,
+                    self.session_time):
+            return False
+        return time.time() - self.session_time >= self.session_max_age
+
+    def _sent_session_key(self):
+        """The session key the failed request of this thread was sent with."""
+        retry_state = self.get_last_retry_state()
+        if retry_state is None:
+            return self.session_key
+        return retry_state.session_key
+
+    def _wait_for_refresh(self):
+        """Wait for another thread that is logging in again."""
+        if self._refresher is None:
+            return
+        current = threading.current_thread()
+        with self._auth_cond:
+            while self._refresher not in (None, current):
+                self._auth_cond.wait()
+
+    def _refresh_session(self, old_key, method, url, proactive=False):
+        """
+        Log in again, unless another thread already replaced old_key.
+        Only one thread logs in, the others wait for it.
+
+        :returns: bool - True if this thread logged in again
+
+        """
+        current = threading.current_thread()
+        with self._auth_cond:
+            while self._refresher not in (None, current):
+                self._auth_cond.wait()
+            if self.session_key != old_key:
+                return False
+            self._refresher = current
+        try:
+            self.metrics.emit(metrics.MetricsHooks.HTTP_REAUTH,
+                              method=method, route=self._route(url),
+                              proactive=proactive)
+            old_key = self._drop_session(proactive)
+            self._reauth()
+            if old_key is not None:
+                self._delete_session(old_key)
+        finally:
+            with self._auth_cond:
+                self._refresher = None
+                self._auth_cond.notify_all()
+        return True
+
     def unauthenticate(self):
         """
         This clears the authenticated session with the 3PAR server.
 
+        With a session store, the session is only deleted on the array
+        when no other client sharing it still holds it, otherwise this
+        client just lets go of it.
+
         """
-        # delete the session on the 3Par
-        self.delete('/credentials/%s' % self.session_key)
+        if self._release_stored_session():
+            # delete the session on the 3Par
+            self.delete('/credentials/%s' % self.session_key)
         self.session_key = None
 
     def get_timings(self):
         """
-        Ths gives an array of the request timings since last reset_timings call
+        Ths gives an array of the request timings since last reset_timings
+        call, at most max_timings of them
         """
-        return self.times
+        return list(self.times)
 
     def reset_timings(self):
         """
         This resets the request/response timings array
         """
-        self.times = []
+        self.times.clear()
+
+    def get_latency_stats(self):
+        """
+        This gives the latency percentiles and status code counts of every
+        route called since the last reset_latency_stats call.
+
+        .. code-block:: python
+
+            stats = {
+                'GET /volumes/{name}': {
+                    'count': 12,           # Number of requests
+                    'sum': 0.42,           # Total latency in seconds
+                    'p50': 0.03,           # Estimated percentiles in
+                    'p95': 0.05,           # seconds
+                    'p99': 0.06,
+                    'max': 0.061,          # Slowest request in seconds
+                    'statuses': {200: 11,  # Count per HTTP status, None
+                                 404: 1}   # when no response was received
+                }
+            }
+
+        :returns: dict
+
+        """
+        return self.latency.get_stats()
+
+    def get_decode_stats(self):
+        """
+        This gives the time spent decoding JSON response bodies, per route,
+        in the same form as get_latency_stats. The latency stats include
+        this time, the difference is the time spent on the network.
+
+        :returns: dict
+
+        """
+        return self.decode_latency.get_stats()
+
+    def reset_latency_stats(self):
+        """
+        This resets the latency and decode histograms
+        """
+        self.latency.reset()
+        self.decode_latency.reset()
+
+    def get_cache_stats(self):
+        """
+        This gives the response cache counters, or None if responses are not
+        cached.
+
+        :returns: dict - See
+                  :meth:`~hpe3parclient.cache.ResponseCache.get_stats`
+
+        """
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get_stats()
+
+    def get_coalesce_stats(self):
+        """
+        This gives the GET coalescing counters.
+
+        requests counts the GETs sent to the array, coalesced counts the
+        calls that were answered by another caller's identical GET that
+        was already in flight.
+
+        :returns: dict - {'requests': int, 'coalesced': int,
+                          'in_flight': int}
+
+        """
+        with self._in_flight_lock:
+            stats = dict(self._coalesce_stats)
+            stats['in_flight'] = len(self._in_flight)
+        return stats
+
+    def reset_coalesce_stats(self):
+        with self._in_flight_lock:
+            self._coalesce_stats = {'requests': 0, 'coalesced': 0}
 
     def _http_log_req(self, args, kwargs):
         if not self.http_log_debug:
@@ -182,12 +613,16 @@ class HTTPJSONRESTClient(object):
         # making it easier to read
         HTTPJSONRESTClient._logger.debug("RESP:%s\n",
                                          str(resp).replace("',", "'\n"))
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
         HTTPJSONRESTClient._logger.debug("RESP BODY:%s\n", body)
 
-    def request(self, *args, **kwargs):
+    def _prepare_request(self, kwargs):
         """
-        This makes an HTTP Request to the 3Par server.
-        You should use get, post, delete instead.
+        Adds the session and content headers to kwargs['headers'] and
+        serializes kwargs['body'] to JSON.
+
+        :returns: the request payload, or None if there is no body
 
         """
         if self.session_key and self.auth_try != 1:
@@ -197,69 +632,122 @@ class HTTPJSONRESTClient(object):
         kwargs.setdefault('headers', kwargs.get('headers', {}))
         kwargs['headers']['User-Agent'] = self.USER_AGENT
         kwargs['headers']['Accept'] = 'application/json'
+        if not self.keep_alive:
+            kwargs['headers']['Connection'] = 'close'
         if 'body' in kwargs:
             kwargs['headers']['Content-Type'] = 'application/json'
             kwargs['body'] = json.dumps(kwargs['body'])
-            payload = kwargs['body']
+            return kwargs['body']
+        return None
+
+    def _process_response(self, resp, status, url, body, retry_state=None):
+        """
+        Turns the headers, status and raw body of a response into the
+        (resp, body) pair returned by request. The time spent decoding the
+        body is kept in retry_state.decode_time.
+
+        :raises: the :class:`~hpe3parclient.exceptions.ClientException`
+                 subclass matching the status, if it is an error
+
+        """
+        # resp['status'], status['content-location'], and resp.status
+        # need to be manually set as Python Requests doesn't provide
+        # them automatically.
+        resp['status'] = str(status)
+        resp.status = status
+        if 'location' not in resp:
+            resp['content-location'] = url
+
+        self._http_log_resp(resp, body)
+
+        # Try and convert the body response to an object
+        # This assumes the body of the reply is JSON
+        if body:
+            decode_start = time.time()
+            try:
+                body = json_loads(body)
+            except ValueError:
+                if isinstance(body, bytes):
+                    body = body.decode('utf-8', 'replace')
+            if retry_state is not None:
+                retry_state.decode_time = time.time() - decode_start
         else:
-            payload = None
+            body = None
+
+        if resp.status >= 400:
+            if body and 'message' in body:
+                body['desc'] = body['message']
+
+            raise exceptions.from_response(resp, body)
+
+        return resp, body
+
+    def request(self, *args, **kwargs):
+        """
+        This makes an HTTP Request to the 3Par server.
+        You should use get, post, delete instead.
+
+        With stream=True the body of a successful response is not read,
+        the requests response it is read from is returned in its place.
+
+        """
+        stream = kwargs.pop('stream', False)
+        payload = self._prepare_request(kwargs)
 
         # args[0] contains the URL, args[1] contains the HTTP verb/method
         http_url = args[0]
         http_method = args[1]
 
         self._http_log_req(args, kwargs)
+        # The retry state is created per request, so a request that ran out
+        # of retries has no effect on the ones that follow it.
+        retry_state = self.retry_policy.new_state(http_method)
+        retry_state.session_key = kwargs['headers'].get(
+            self.SESSION_COOKIE_NAME)
         r = None
         resp = None
         body = None
-        while r is None and self.tries > 0:
+        while r is None:
             try:
-                # Check to see if the request is being retried. If it is, we
-                # want to delay.
-                if self.delay:
-                    time.sleep(self.delay)
+                # Waits for the backoff delay if this is a retry.
+                retry_state.start_attempt()
+                # Checked before every attempt, so that retries stop too
+                # once the array is known to be unreachable.
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.allow_request()
 
                 if self.timeout:
-                    r = requests.request(http_method, http_url, data=payload,
-                                         headers=kwargs['headers'],
-                                         verify=self.secure,
-                                         timeout=self.timeout)
+                    r = self.session.request(http_method, http_url,
+                                             data=payload,
+                                             headers=kwargs['headers'],
+                                             verify=self.secure,
+                                             timeout=self.timeout,
+                                             stream=stream)
                 else:
-                    r = requests.request(http_method, http_url, data=payload,
-                                         headers=kwargs['headers'],
-                                         verify=self.secure)
-
-                resp = r.headers
-                body = r.text
-                if isinstance(body, bytes):
-                    body = body.decode('utf-8')
-
-                # resp['status'], status['content-location'], and resp.status
-                # need to be manually set as Python Requests doesn't provide
-                # them automatically.
-                resp['status'] = str(r.status_code)
-                resp.status = r.status_code
-                if 'location' not in resp:
-                    resp['content-location'] = r.url
-
-                r.close()
-                self._http_log_resp(resp, body)
-
-                # Try and convert the body response to an object
-                # This assumes the body of the reply is JSON
-                if body:
-                    try:
-                        body = json.loads(body)
-                    except ValueError:
-                        pass
+                    r = self.session.request(http_method, http_url,
+                                             data=payload,
+                                             headers=kwargs['headers'],
+                                             verify=self.secure,
+                                             stream=stream)
+                retry_state.end_attempt(status=r.status_code)
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.record_success()
+                retry_state.bytes_sent = len(payload) if payload else 0
+                if stream and r.status_code < 400:
+                    # The caller reads the body, see iter_members.
+                    resp, body = self._process_response(
+                        r.headers, r.status_code, r.url, None, retry_state)
+                    body = r
                 else:
-                    body = None
+                    retry_state.bytes_received = len(r.content)
 
-                if resp.status >= 400:
-                    if body and 'message' in body:
-                        body['desc'] = body['message']
+                    # The raw bytes, r.text would guess the charset and
+                    # copy the whole body just to have it parsed again.
+                    body = r.content
+                    r.close()
 
-                    raise exceptions.from_response(resp, body)
+                    resp, body = self._process_response(
+                        r.headers, r.status_code, r.url, body, retry_state)
             except requests.exceptions.SSLError as err:
                 HTTPJSONRESTClient._logger.error(
                     "SSL certificate verification failed: (%s). You must have "
@@ -267,16 +755,20 @@ class HTTPJSONRESTClient(object):
                     "verification.", err)
                 raise exceptions.SSLCertFailed("SSL Certificate Verification "
                                                "Failed.")
-            except self.retry_exceptions as ex:
-                # If we catch an exception where we want to retry, we need to
-                # decrement the retry count prepare to try again.
+            except self.retry_policy.retry_exceptions as ex:
+                # If we catch an exception where we might retry, let the
+                # policy decide based on the verb, attempts and time spent.
                 r = None
-                self.tries -= 1
-                self.delay = self.delay * self.backoff + 1
+                if retry_state.in_attempt:
+                    retry_state.end_attempt(error=ex)
+                    self._record_circuit_failure(ex)
 
-                # Raise exception, we have exhausted all retries.
-                if self.tries is 0:
+                if not retry_state.should_retry(ex):
+                    self._record_retry_state(retry_state)
                     raise ex
+            except exceptions.ClientException:
+                self._record_retry_state(retry_state)
+                raise
             except requests.exceptions.HTTPError as err:
                 raise exceptions.HTTPError("HTTP Error: %s" % err)
             except requests.exceptions.URLRequired as err:
@@ -285,25 +777,87 @@ class HTTPJSONRESTClient(object):
                 raise exceptions.TooManyRedirects(
                     "Too Many Redirects: %s" % err)
             except requests.exceptions.Timeout as err:
+                self._record_circuit_failure(err)
                 raise exceptions.Timeout("Timeout: %s" % err)
             except requests.exceptions.RequestException as err:
                 raise exceptions.RequestException(
                     "Request Exception: %s" % err)
-
+        self._record_retry_state(retry_state)
         return resp, body
 
+    def _record_circuit_failure(self, ex):
+        breaker = self.circuit_breaker
+        if breaker is not None and isinstance(ex, self.circuit_exceptions):
+            breaker.record_failure()
+
     def _time_request(self, url, method, **kwargs):
+        # Time spent waiting for a slot is not request latency.
+        if self.concurrency_limiter is not None:
+            self.concurrency_limiter.acquire()
         start_time = time.time()
-        resp, body = self.request(url, method, **kwargs)
+        status = None
+        try:
+            resp, body = self.request(url, method, **kwargs)
+            status = resp.status
+        except exceptions.ClientException as ex:
+            # Not every ClientException has an http_status.
+            status = getattr(ex, 'http_status', None) or None
+            raise
+        finally:
+            self._record_request(url, method, start_time, status)
         self.times.append(("%s %s" % (method, url),
                            start_time, time.time()))
         return resp, body
 
+    def _route(self, url):
+        # The route is relative to the api_url, without host or version.
+        if url.startswith(self.api_url):
+            url = url[len(self.api_url):]
+        return metrics.normalize_route(url)
+
+    def _record_request(self, url, method, start_time, status):
+        latency = time.time() - start_time
+        route = self._route(url)
+        self.latency.record(method, route, latency, status)
+
+        retry_state = self.get_last_retry_state()
+        if retry_state is None or retry_state.start_time < start_time:
+            # The request failed before its retry state was recorded.
+            retry_state = None
+        if retry_state is not None and retry_state.decode_time is not None:
+            self.decode_latency.record(method, route,
+                                       retry_state.decode_time, status)
+        if self.concurrency_limiter is not None:
+            self._release_slot(method, route, latency, status, retry_state)
+
+        if self.metrics.callbacks:
+            self.metrics.emit(
+                metrics.MetricsHooks.HTTP_REQUEST,
+                method=method, route=route, status=status, latency=latency,
+                retries=retry_state.retries if retry_state else 0,
+                bytes_sent=retry_state.bytes_sent if retry_state else 0,
+                bytes_received=(retry_state.bytes_received
+                                if retry_state else 0),
+                decode_time=(retry_state.decode_time or 0
+                             if retry_state else 0))
+
+    def _release_slot(self, method, route, latency, status, retry_state):
+        overloaded = status == 503
+        if retry_state is not None and retry_state.attempts:
+            # Judge the array by the last attempt, not the backoff delays.
+            latency = retry_state.attempts[-1]['latency']
+            overloaded = overloaded or any(
+                attempt['status'] == 503 for attempt in retry_state.attempts)
+        self.concurrency_limiter.release("%s %s" % (method, route), latency,
+                                         overloaded)
+
     def _do_reauth(self, url, method, ex, **kwargs):
         # print("_do_reauth called")
+        # auth_try is 1 while another thread logs in again.
+        self._wait_for_refresh()
         try:
             if self.auth_try != 1:
-                self._reauth()
+                self._refresh_session(self._sent_session_key(), method, url)
                 resp, body = self._time_request(self.api_url + url, method,
                                                 **kwargs)
                 return resp, body
@@ -313,6 +867,117 @@ class HTTPJSONRESTClient(object):
             raise ex
 
     def _cs_request(self, url, method, **kwargs):
+        if method == 'GET':
+            if self.response_cache is not None:
+                cached = self.response_cache.get(url)
+                if cached is not None:
+                    return cached
+                # Not cached if a write evicts it while the GET is sent.
+                generation = self.response_cache.get_generation(url)
+            if self.coalesce_gets and not kwargs:
+                resp, body, shared = self._coalesced_get(url)
+            else:
+                resp, body = self._cs_request_uncached(url, method, **kwargs)
+                shared = False
+            # The caller whose request it was has already cached it.
+            if self.response_cache is not None and not shared:
+                self.response_cache.put(url, resp, body, generation)
+            return resp, body
+
+        try:
+            return self._cs_request_uncached(url, method, **kwargs)
+        finally:
+            # Even a failed write may have changed something on the array.
+            if self.response_cache is not None:
+                self.response_cache.invalidate(url)
+            self._forget_in_flight(url)
+
+    def _coalesced_get(self, url):
+        """
+        GET url, or wait for an identical GET already in flight and share
+        its result.
+
+        :returns: (resp, body, shared) - shared is True if the response
+                  came from another caller's request
+
+        """
+        while True:
+            call, leader = self._join_in_flight(url, threading.Event)
+            if leader:
+                break
+            call.done.wait()
+            shared = self._shared_result(call)
+            # None if the leader was interrupted, so try again.
+            if shared is not None:
+                return shared
+
+        try:
+            call.result = self._cs_request_uncached(url, 'GET')
+        except Exception as ex:
+            call.error = ex
+            raise
+        finally:
+            followers = self._leave_in_flight(url, call)
+        return self._leader_result(call, followers)
+
+    def _join_in_flight(self, url, event_class):
+        with self._in_flight_lock:
+            call = self._in_flight.get(url)
+            if call is None:
+                call = _InFlightGet(event_class())
+                self._in_flight[url] = call
+                self._coalesce_stats['requests'] += 1
+                return call, True
+            call.followers += 1
+            self._coalesce_stats['coalesced'] += 1
+            return call, False
+
+    def _leave_in_flight(self, url, call):
+        with self._in_flight_lock:
+            # Unless a write has already forgotten it.
+            if self._in_flight.get(url) is call:
+                del self._in_flight[url]
+            followers = call.followers
+        call.done.set()
+        return followers
+
+    def _forget_in_flight(self, url):
+        # The GETs in flight were sent before the write to url, so the
+        # GETs sent after it may not wait for those it affects.
+        with self._in_flight_lock:
+            for in_flight_url in list(self._in_flight):
+                if cache.ResponseCache.affects(url, in_flight_url):
+                    del self._in_flight[in_flight_url]
+
+    @staticmethod
+    def _leader_result(call, followers):
+        resp, body = call.result
+        if followers:
+            # The followers copy from call.result while we return it.
+            body = copy.deepcopy(body)
+        return resp, body, False
+
+    @staticmethod
+    def _shared_result(call):
+        if call.error is not None:
+            # A copy, so concurrent raises don't share a traceback.
+            try:
+                error = copy.copy(call.error)
+            except Exception:
+                error = call.error
+            raise error
+        if call.result is None:
+            return None
+        resp, body = call.result
+        # Callers are free to modify what they get back.
+        return resp, copy.deepcopy(body), True
+
+    def _cs_request_uncached(self, url, method, **kwargs):
+        self._wait_for_refresh()
+        if self._session_expiring(url):
+            self._refresh_session(self.session_key, method, url,
+                                  proactive=True)
+
         # Perform the request once. If we get a 401 back then it
         # might be because the auth token expired, so try to
         # re-authenticate and try again. If it still fails, bail.
@@ -351,6 +1016,68 @@ class HTTPJSONRESTClient(object):
         """
         return self._cs_request(url, 'GET', **kwargs)
 
+    def iter_members(self, url, chunk_size=65536, fields=None):
+        """
+        GET a collection and yield its members one at a time, as the
+        response is read. Only the member being parsed is held in memory,
+        rather than the whole collection.
+
+        .. code-block:: python
+
+            for volume in http.iter_members('/volumes'):
+                print(volume['name'])
+
+        The request is sent when iteration starts. It bypasses the
+        response cache and is not shared with identical GETs, and its
+        latency is the time to the response headers.
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+        :param chunk_size: The bytes read from the socket at a time
+        :type chunk_size: int
+        :param fields: Trim every member to these keys. Default keeps
+                       every key
+        :type fields: list
+
+        :returns: generator of the members of the collection
+        """
+        return self._stream_members(
+            url, jsonstream.MembersParser(fields=fields), chunk_size)
+
+    def get_members(self, url, fields=None, chunk_size=65536):
+        """
+        GET a collection, trimming every member to the given keys as the
+        response is read, so the dropped values are never all in memory
+        at once. Like :meth:`iter_members` it bypasses the response cache.
+
+        .. code-block:: python
+
+            body = http.get_members('/volumes', ['name', 'wwn'])
+
+        :param url: The relative url from the 3PAR api_url
+        :type url: str
+        :param fields: The keys to keep. Default keeps every key
+        :type fields: list
+
+        :returns: dict - the collection, ie. {'total': 2, 'members': [...]}
+        """
+        parser = jsonstream.MembersParser(fields=fields)
+        members = list(self._stream_members(url, parser, chunk_size))
+        body = dict(parser.values)
+        body['members'] = members
+        return body
+
+    def _stream_members(self, url, parser, chunk_size):
+        resp, r = self._cs_request_uncached(url, 'GET', stream=True)
+        try:
+            for chunk in r.iter_content(chunk_size):
+                for member in parser.feed(chunk):
+                    yield member
+            for member in parser.close():
+                yield member
+        finally:
+            r.close()
+
     def post(self, url, **kwargs):
         """
         Make an HTTP POST request to the server.
@@ -419,3 +1146,13 @@ class HTTPJSONRESTClient(object):
                          will be an object
         """
         return self._cs_request(url, 'DELETE', **kwargs)
+
+
+class _InFlightGet(object):
+    """A GET on the wire, that identical GETs can wait for."""
+
+    def __init__(self, done):
+        self.done = done
+        self.followers = 0
+        self.result = None
+        self.error = None
@@ -0,0 +1,253 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Incremental parsing of WSAPI collections.
+
+.. module: jsonstream
+
+:Description: A WSAPI collection is a JSON object whose members key holds
+ the list of items, ie. {"total": 2, "members": [{...}, {...}]}. A
+ MembersParser is fed the body a chunk at a time and hands back every
+ member as soon as it is complete, so only the member being read and the
+ unparsed rest of the last chunk are held in memory, however large the
+ collection is.
+
+ Each member is decoded by the C scanner of the json module.
+
+.. code-block:: python
+
+    parser = jsonstream.MembersParser()
+    for chunk in chunks:
+        for member in parser.feed(chunk):
+            print(member['name'])
+    parser.close()
+
+ Given fields, the parser trims every member to those keys as soon as it
+ is decoded, so the dropped values never accumulate.
+
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def project(member, fields):
+    """
+    :param member: A member of a collection
+    :type member: dict
+    :param fields: The keys to keep
+    :type fields: list
+
+    :returns: dict - member with only the keys in fields that it has
+
+    """
+    if not isinstance(member, dict):
+        return member
+    return dict((field, member[field]) for field in fields
+                if field in member)
+
+
+class MembersParser(object):
+    """
+    :param key: The key of the list to stream. Default is members
+    :type key: str
+    :param fields: Trim every member to these keys, see :func:`project`.
+                   Default keeps every key
+    :type fields: list
+
+    The other values of the object, ie. total, are kept in the values
+    attribute as they are read.
+
+    """
+
+    def __init__(self, key='members', fields=None):
+        self.key = key
+        self.fields = fields
+        self.values = {}
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._scanner = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._final = False
+        self._state = self._start
+        self._current_key = None
+
+    def feed(self, data):
+        """
+        Parse the next chunk of the body.
+
+        :param data: The chunk
+        :type data: bytes
+
+        :returns: list - the members completed by this chunk
+        :raises: ValueError if the body is not a JSON object
+
+        """
+        # Drop what was consumed, the rest may be the start of a member.
+        self._buf = self._buf[self._pos:] + self._decoder.decode(
+            data, self._final)
+        self._pos = 0
+        members = []
+        while self._state(members):
+            pass
+        return members
+
+    def close(self):
+        """
+        Finish parsing, after the last chunk was fed.
+
+        :returns: list - the members completed by the end of the body
+        :raises: ValueError if the body was truncated
+
+        """
+        self._final = True
+        members = self.feed(b'')
+        if self._state != self._done:
+            raise ValueError("The JSON response ended early")
+        return members
+
+    def _skip(self):
+        # Skip whitespace, returns the next character or None if the
+        # buffer ran out.
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+        if self._pos < len(self._buf):
+            return self._buf[self._pos]
+        return None
+
+    def _expect(self, char, chars):
+        if char not in chars:
+            raise ValueError("Expecting one of %r at %r" %
+                             (chars, self._buf[self._pos:self._pos + 20]))
+
+    def _decode(self):
+        # Decode the value at _pos, None if the buffer ends inside it.
+        try:
+            value, end = self._scanner.raw_decode(self._buf, self._pos)
+        except ValueError:
+            if self._final:
+                raise
+            return None
+        # A number at the end of the buffer may go on in the next chunk.
+        at_end = end == len(self._buf) and not self._final
+        if at_end and self._buf[end - 1] in '0123456789.eE+-':
+            return None
+        self._pos = end
+        return (value,)
+
+    def _start(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, '{')
+        self._pos += 1
+        self._state = self._key
+        return True
+
+    def _key(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, '"}')
+        if char == '}':
+            self._pos += 1
+            self._state = self._done
+            return True
+        decoded = self._decode()
+        if decoded is None:
+            return False
+        self._current_key = decoded[0]
+        self._state = self._colon
+        return True
+
+    def _colon(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, ':')
+        self._pos += 1
+        if self._current_key == self.key:
+            self._state = self._list_start
+        else:
+            self._state = self._value
+        return True
+
+    def _value(self, members):
+        if self._skip() is None:
+            return False
+        decoded = self._decode()
+        if decoded is None:
+            return False
+        self.values[self._current_key] = decoded[0]
+        self._state = self._next_key
+        return True
+
+    def _next_key(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, ',}')
+        self._pos += 1
+        self._state = self._key if char == ',' else self._done
+        return True
+
+    def _list_start(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, '[')
+        self._pos += 1
+        self._state = self._first_member
+        return True
+
+    def _first_member(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        if char == ']':
+            self._pos += 1
+            self._state = self._next_key
+        else:
+            self._state = self._member
+        return True
+
+    def _member(self, members):
+        if self._skip() is None:
+            return False
+        decoded = self._decode()
+        if decoded is None:
+            return False
+        member = decoded[0]
+        if self.fields is not None:
+            member = project(member, self.fields)
+        members.append(member)
+        self._state = self._next_member
+        return True
+
+    def _next_member(self, members):
+        char = self._skip()
+        if char is None:
+            return False
+        self._expect(char, ',]')
+        self._pos += 1
+        self._state = self._member if char == ',' else self._next_key
+        return True
+
+    def _done(self, members):
+        char = self._skip()
+        if char is not None:
+            raise ValueError("Extra data after the JSON response")
+        return False
@@ -0,0 +1,184 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Adaptive concurrency limiting.
+
+.. module: limiter
+
+:Description: An AdaptiveLimiter caps the number of WSAPI requests a client
+ has in flight at once, across all of its threads. Requests over the limit
+ wait in acquire until a slot frees up.
+
+ The limit follows the array's capacity with AIMD (additive increase,
+ multiplicative decrease): it grows by one for every limit's worth of
+ requests that complete normally while the limit is in use, and it is cut
+ by decrease_factor when the array answers 503 or a request takes more
+ than latency_tolerance times the usual latency of its route. The limit is
+ cut at most once per round trip, so one burst of 503s counts once.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(url,
+                              concurrency_limiter=limiter.AdaptiveLimiter())
+
+"""
+
+import threading
+import time
+
+from hpe3parclient import exceptions
+
+
+class AdaptiveLimiter(object):
+    """
+    :param initial_limit: The limit to start with. Default is 8
+    :type initial_limit: int
+    :param min_limit: The limit is never cut below this. Default is 1
+    :type min_limit: int
+    :param max_limit: The limit never grows above this. Default is 64
+    :type max_limit: int
+    :param decrease_factor: The limit is multiplied by this when the array
+                            is overloaded. Default is 0.7
+    :type decrease_factor: float
+    :param latency_tolerance: A request slower than this many times the
+                              usual latency of its route counts as
+                              overload. None to only react to 503s.
+                              Default is 3
+    :type latency_tolerance: float
+    :param queue_timeout: Seconds a request waits for a slot before
+                          :class:`~hpe3parclient.exceptions.Timeout` is
+                          raised. Default waits forever
+    :type queue_timeout: float
+
+    """
+
+    # How fast a route's usual latency follows slower samples.
+    BASELINE_DRIFT = 0.01
+
+    def __init__(self, initial_limit=8, min_limit=1, max_limit=64,
+                 decrease_factor=0.7, latency_tolerance=3,
+                 queue_timeout=None):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._queued = 0
+        self._last_decrease = 0
+        # {route: usual latency in seconds}
+        self._baselines = {}
+        self._stats = {'requests': 0, 'queued': 0, 'wait_time': 0.0,
+                       'overloads': 0, 'decreases': 0, 'timeouts': 0}
+
+    @property
+    def limit(self):
+        """The number of requests currently allowed in flight."""
+        return max(self.min_limit, int(self._limit))
+
+    def acquire(self):
+        """
+        Wait for a free slot and take it.
+
+        :raises: :class:`~hpe3parclient.exceptions.Timeout` if no slot
+                 frees up within queue_timeout
+
+        """
+        with self._cond:
+            self._stats['requests'] += 1
+            if self._in_flight < self.limit:
+                self._in_flight += 1
+                return
+
+            start = time.time()
+            self._stats['queued'] += 1
+            self._queued += 1
+            try:
+                while self._in_flight >= self.limit:
+                    remaining = None
+                    if self.queue_timeout is not None:
+                        remaining = start + self.queue_timeout - time.time()
+                        if remaining <= 0:
+                            self._stats['timeouts'] += 1
+                            raise exceptions.Timeout(
+                                "Timed out waiting for one of %d WSAPI "
+                                "request slots" % self.limit)
+                    self._cond.wait(remaining)
+                self._in_flight += 1
+            finally:
+                self._queued -= 1
+                self._stats['wait_time'] += time.time() - start
+
+    def release(self, route, latency, overloaded=False):
+        """
+        Free a slot and adjust the limit to how the request went.
+
+        :param route: The route template, see
+                      :func:`~hpe3parclient.metrics.normalize_route`
+        :type route: str
+        :param latency: The latency of the request's last attempt in
+                        seconds
+        :type latency: float
+        :param overloaded: True if the array answered 503
+        :type overloaded: bool
+
+        """
+        with self._cond:
+            saturated = self._in_flight >= self.limit
+            self._in_flight -= 1
+
+            baseline = self._baselines.get(route)
+            if baseline is None or latency < baseline:
+                self._baselines[route] = latency
+            else:
+                self._baselines[route] = (
+                    baseline + (latency - baseline) * self.BASELINE_DRIFT)
+            tolerance = self.latency_tolerance
+            if not overloaded and baseline and tolerance is not None:
+                overloaded = latency > baseline * tolerance
+
+            now = time.time()
+            if overloaded:
+                self._stats['overloads'] += 1
+                # The requests in flight since the last cut saw the same
+                # overload, don't cut again for them.
+                if now - self._last_decrease >= latency:
+                    self._limit = max(float(self.min_limit),
+                                      self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                    self._stats['decreases'] += 1
+            elif saturated:
+                self._limit = min(float(self.max_limit),
+                                  self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """
+        :returns: dict - {'limit': int, 'in_flight': int, 'waiting': int,
+                          'requests': int, 'queued': int,
+                          'wait_time': float, 'overloads': int,
+                          'decreases': int, 'timeouts': int}
+
+                  queued counts the requests that had to wait for a slot,
+                  wait_time is their total wait in seconds
+
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats['limit'] = self.limit
+            stats['in_flight'] = self._in_flight
+            stats['waiting'] = self._queued
+        return stats
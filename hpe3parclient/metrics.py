@@ -0,0 +1,415 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Request metrics.
+
+.. module: metrics
+
+:Description: Fixed memory latency recording for WSAPI requests. Every
+ request is filed under its route template, e.g. GET /volumes/{name}, in a
+ histogram with a fixed set of buckets, so memory use does not grow with
+ the number of requests made.
+
+ WSAPI requests and SSH commands also report to a MetricsHooks object,
+ which passes every event on to the callbacks registered with it. The
+ built-in OpenMetricsCollector is one such callback, it renders the
+ events in the Prometheus/OpenMetrics text format.
+
+.. code-block:: python
+
+    collector = metrics.OpenMetricsCollector()
+    cl.metrics.register(collector)
+    ...
+    text = collector.render()
+
+"""
+
+import bisect
+import logging
+import re
+import threading
+
+LOG = logging.getLogger(__name__)
+
+# Bucket upper bounds in seconds, roughly 10 per decade from 1ms to 120s.
+# Anything slower lands in the overflow bucket.
+DEFAULT_BUCKETS = (
+    0.001, 0.0015, 0.002, 0.003, 0.004, 0.005, 0.0075,
+    0.01, 0.015, 0.02, 0.03, 0.04, 0.05, 0.075,
+    0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.75,
+    1, 1.5, 2, 3, 4, 5, 7.5,
+    10, 15, 20, 30, 40, 50, 75,
+    100, 120)
+
+_NUMBER_RE = re.compile(r'^\d+$')
+
+
+def normalize_route(url):
+    """
+    Turn a WSAPI url into its route template, so that every request for a
+    named object is counted under the same key.
+
+    The WSAPI alternates collection names with object names, so every
+    second path segment is replaced, ie. /volumes/vol1 becomes
+    /volumes/{name} and /tasks/12 becomes /tasks/{id}. The query string
+    is dropped.
+
+    :param url: The url, relative to the api_url
+    :type url: str
+
+    :returns: str
+
+    """
+    path = url.split('?', 1)[0]
+    segments = path.strip('/').split('/')
+    for i in range(1, len(segments), 2):
+        if _NUMBER_RE.match(segments[i]):
+            segments[i] = '{id}'
+        else:
+            segments[i] = '{name}'
+    return '/' + '/'.join(segments)
+
+
+class LatencyHistogram(object):
+    """
+    A latency histogram with fixed buckets.
+
+    :param buckets: The sorted bucket upper bounds in seconds
+    :type buckets: tuple
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # One more count than bounds, for the overflow bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.statuses = {}
+
+    def record(self, latency, status=None):
+        """
+        Add one request to the histogram.
+
+        :param latency: The request latency in seconds
+        :type latency: float
+        :param status: The HTTP status code, or None if there was no
+                       response
+        :type status: int
+
+        """
+        self.counts[bisect.bisect_left(self.buckets, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        if latency > self.max:
+            self.max = latency
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def percentile(self, percent):
+        """
+        Estimate a percentile by interpolating inside the bucket it falls
+        in. The estimate is never more than one bucket width off.
+
+        :param percent: The percentile, between 0 and 100
+        :type percent: float
+
+        :returns: float - the latency in seconds, or None if empty
+
+        """
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if not bucket_count or seen + bucket_count < rank:
+                seen += bucket_count
+                continue
+            lower = self.buckets[i - 1] if i else 0.0
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            upper = min(upper, self.max)
+            fraction = (rank - seen) / float(bucket_count)
+            return lower + (upper - lower) * fraction
+        return self.max
+
+    def get_stats(self):
+        """
+        :returns: dict - {'count': int, 'sum': float, 'p50': float,
+                          'p95': float, 'p99': float, 'max': float,
+                          'statuses': {status: count}}
+
+        """
+        return {'count': self.count,
+                'sum': self.sum,
+                'p50': self.percentile(50),
+                'p95': self.percentile(95),
+                'p99': self.percentile(99),
+                'max': self.max,
+                'statuses': dict(self.statuses)}
+
+
+class LatencyRecorder(object):
+    """
+    A thread safe set of latency histograms, one per route.
+
+    :param buckets: The sorted bucket upper bounds in seconds
+    :type buckets: tuple
+
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def record(self, method, url, latency, status=None):
+        """
+        Add one request to the histogram of its route.
+
+        :param method: The HTTP verb
+        :type method: str
+        :param url: The url, relative to the api_url
+        :type url: str
+        :param latency: The request latency in seconds
+        :type latency: float
+        :param status: The HTTP status code, or None if there was no
+                       response
+        :type status: int
+
+        """
+        key = "%s %s" % (method, normalize_route(url))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = LatencyHistogram(self.buckets)
+                self._histograms[key] = histogram
+            histogram.record(latency, status)
+
+    def get_stats(self):
+        """
+        :returns: dict - {'GET /volumes/{name}': {'count': int, ...}, ...}
+                  See :meth:`LatencyHistogram.get_stats`
+
+        """
+        with self._lock:
+            return dict((key, histogram.get_stats())
+                        for key, histogram in self._histograms.items())
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+
+class MetricsHooks(object):
+    """
+    The instrumentation surface of a client. WSAPI requests and SSH
+    commands call :meth:`emit`, which calls every registered callback with
+    the event name and a dict of event data:
+
+    .. code-block:: python
+
+        # HTTP_REQUEST, once per WSAPI call including its retries
+        {'method': 'GET',
+         'route': '/volumes/{name}',   # See normalize_route
+         'status': 200,                # None if no response was received
+         'latency': 0.012,             # Seconds, including retries
+         'retries': 0,
+         'bytes_sent': 0,              # Request body size
+         'bytes_received': 1024,       # Response body size
+         'decode_time': 0.001}         # Seconds spent decoding the JSON
+                                       # body, included in latency
+
+        # HTTP_REAUTH, when the session is renewed, once for all the
+        # threads that found it expired
+        {'method': 'GET', 'route': '/volumes/{name}',
+         'proactive': False}           # True if renewed before it expired
+
+        # SSH_COMMAND, once per CLI command
+        {'command': 'showport',        # The first word of the command
+         'latency': 0.8,               # Seconds
+         'error': None}                # The exception class name on failure
+
+    A callback that raises is logged and otherwise ignored, so
+    instrumentation never fails a call.
+
+    """
+
+    HTTP_REQUEST = 'http_request'
+    HTTP_REAUTH = 'http_reauth'
+    SSH_COMMAND = 'ssh_command'
+
+    def __init__(self):
+        self.callbacks = []
+
+    def register(self, callback):
+        """
+        :param callback: Called as callback(event, data)
+        :type callback: callable
+
+        """
+        self.callbacks.append(callback)
+
+    def unregister(self, callback):
+        self.callbacks.remove(callback)
+
+    def emit(self, event, **data):
+        for callback in list(self.callbacks):
+            try:
+                callback(event, data)
+            except Exception:
+                LOG.exception("Metrics callback %r failed on %s",
+                              callback, event)
+
+
+# Prometheus style buckets, coarser than the DEFAULT_BUCKETS to keep the
+# number of exposed series down.
+OPENMETRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5,
+                       10, 30, 60, 120)
+
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape_label(value))
+                             for name, value in labels)
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class OpenMetricsCollector(object):
+    """
+    A MetricsHooks callback that aggregates events into counters and
+    histograms and renders them in the OpenMetrics text format, which
+    Prometheus scrapes natively.
+
+    :param prefix: The prefix of every metric name
+    :type prefix: str
+
+    """
+
+    CONTENT_TYPE = ('application/openmetrics-text; version=1.0.0; '
+                    'charset=utf-8')
+
+    def __init__(self, prefix='hpe3parclient'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        # {(metric name, labels): value}
+        self._counters = {}
+        # {(metric name, labels): LatencyHistogram}
+        self._histograms = {}
+
+    def __call__(self, event, data):
+        with self._lock:
+            if event == MetricsHooks.HTTP_REQUEST:
+                labels = (('method', data['method']),
+                          ('route', data['route']))
+                status = data['status'] if data['status'] is not None \
+                    else 'none'
+                self._inc('http_requests',
+                          labels + (('status', status),))
+                self._inc('http_retries', labels, data['retries'])
+                self._inc('http_request_bytes', labels, data['bytes_sent'])
+                self._inc('http_response_bytes', labels,
+                          data['bytes_received'])
+                self._observe('http_request_duration_seconds', labels,
+                              data['latency'])
+                if data.get('decode_time'):
+                    self._observe('http_response_decode_seconds', labels,
+                                  data['decode_time'])
+            elif event == MetricsHooks.HTTP_REAUTH:
+                self._inc('http_reauths', ())
+            elif event == MetricsHooks.SSH_COMMAND:
+                labels = (('command', data['command']),)
+                result = 'error' if data['error'] else 'success'
+                self._inc('ssh_commands', labels + (('result', result),))
+                self._observe('ssh_command_duration_seconds', labels,
+                              data['latency'])
+
+    def _inc(self, name, labels, amount=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def _observe(self, name, labels, value):
+        key = (name, labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = LatencyHistogram(OPENMETRICS_BUCKETS)
+            self._histograms[key] = histogram
+        histogram.record(value)
+
+    def render(self):
+        """
+        :returns: str - the metrics in the OpenMetrics text format
+
+        """
+        lines = []
+        with self._lock:
+            for name in sorted(set(key[0] for key in self._counters)):
+                full_name = '%s_%s' % (self.prefix, name)
+                lines.append('# TYPE %s counter' % full_name)
+                for (key_name, labels), value in sorted(
+                        self._counters.items(), key=_sort_key):
+                    if key_name == name:
+                        lines.append('%s_total%s %s' % (
+                            full_name, _format_labels(labels),
+                            _format_value(value)))
+
+            for name in sorted(set(key[0] for key in self._histograms)):
+                full_name = '%s_%s' % (self.prefix, name)
+                lines.append('# TYPE %s histogram' % full_name)
+                lines.append('# UNIT %s seconds' % full_name)
+                for (key_name, labels), histogram in sorted(
+                        self._histograms.items(), key=_sort_key):
+                    if key_name == name:
+                        lines.extend(self._render_histogram(
+                            full_name, labels, histogram))
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_histogram(full_name, labels, histogram):
+        lines = []
+        cumulative = 0
+        bounds = histogram.buckets + (float('inf'),)
+        for bound, count in zip(bounds, histogram.counts):
+            cumulative += count
+            lines.append('%s_bucket%s %d' % (
+                full_name,
+                _format_labels(labels + (('le', _format_value(
+                    float(bound))),)),
+                cumulative))
+        lines.append('%s_count%s %d' % (full_name, _format_labels(labels),
+                                        histogram.count))
+        lines.append('%s_sum%s %s' % (full_name, _format_labels(labels),
+                                      _format_value(histogram.sum)))
+        return lines
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+
+def _sort_key(item):
+    name, labels = item[0]
+    return name, [(label, str(value)) for label, value in labels]
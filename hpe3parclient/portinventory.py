@@ -0,0 +1,127 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Port inventory.
+
+.. module: portinventory
+
+:Description: A PortInventory holds the ports of an array, as getPorts
+ returns them, with the iSCSI VLANs of showport -iscsivlans merged in. The
+ ports are indexed by portPos, and the views getFCPorts, getiSCSIPorts and
+ getIPPorts return, by protocol and link state, are built once per load.
+
+ Ports do not change through the client, so the inventory is only
+ reloaded ttl seconds after it was loaded, or once it is cleared.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(url, port_inventory_ttl=600)
+    cl.login(user, password)
+    cl.setSSHOptions(ip, user, password)
+    cl.getiSCSIPorts(state=4)    # GET /ports, showport -iscsivlans
+    cl.getFCPorts()              # no request
+    cl.port_inventory.find({'node': 0, 'slot': 2, 'cardPort': 1})
+
+"""
+
+import copy
+
+from hpe3parclient import collectionindex
+
+
+def port_key(port_pos):
+    """
+    :param port_pos: A portPos, ie. {'node': 0, 'slot': 2, 'cardPort': 1}
+    :type port_pos: dict
+
+    :returns: tuple - (node, slot, cardPort), usable as a dict key
+
+    """
+    return (port_pos.get('node'), port_pos.get('slot'),
+            port_pos.get('cardPort'))
+
+
+class PortInventory(collectionindex.CollectionIndex):
+    """
+    :param get_ports: Returns the ports, ie. {'total': 1, 'members': [...]}
+    :type get_ports: callable
+    :param ttl: Seconds before the ports are loaded again. None disables
+                the inventory
+    :type ttl: float
+
+    """
+
+    def __init__(self, get_ports, ttl=None):
+        self.get_ports = get_ports
+        super(PortInventory, self).__init__(ttl)
+
+    def _reset(self):
+        self._body = {'total': 0, 'members': []}
+        # (node, slot, cardPort) to port.
+        self._ports = {}
+        # Protocol, and (protocol, link state), to ports.
+        self._protocols = {}
+        self._states = {}
+
+    def _load(self):
+        self._body = self.get_ports()
+        for port in self._body.get('members', []):
+            self._ports.setdefault(port_key(port.get('portPos') or {}), port)
+            protocol = port.get('protocol')
+            self._protocols.setdefault(protocol, []).append(port)
+            self._states.setdefault(
+                (protocol, port.get('linkState')), []).append(port)
+
+    def ports(self):
+        """
+        :returns: dict - a copy of the ports, as getPorts returns them
+
+        """
+        with self._lock:
+            self._ensure_built()
+            return copy.deepcopy(self._body)
+
+    def find(self, port_pos):
+        """
+        :param port_pos: The portPos of the port
+        :type port_pos: dict
+
+        :returns: dict - a copy of the port, or None
+
+        """
+        with self._lock:
+            self._ensure_built()
+            return copy.deepcopy(self._ports.get(port_key(port_pos)))
+
+    def protocol_ports(self, protocol, state=None):
+        """
+        :param protocol: The port protocol, ie. PORT_PROTO_ISCSI
+        :type protocol: int
+        :param state: Only ports in this link state, ie. 4 for ready.
+                      Default any state
+        :type state: int
+
+        :returns: list - copies of the ports, in the order of getPorts
+
+        """
+        with self._lock:
+            self._ensure_built()
+            if state is None:
+                ports = self._protocols.get(protocol, [])
+            else:
+                ports = self._states.get((protocol, state), [])
+            return copy.deepcopy(ports)
+
+    def _stats(self):
+        return {'ports': len(self._body.get('members', []))}
@@ -0,0 +1,273 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" WSAPI collection queries.
+
+.. module: query
+
+:Description: A query is built from :class:`Eq` conditions, joined with &
+ (AND) and | (OR). :class:`Has` matches the members with an element of a
+ list field, ie. a host's FCPaths, that matches a condition on the
+ element. The same query renders as the ?query= parameter of a WSAPI
+ collection, so the array does the filtering, and evaluates against a
+ member, for the collections or arrays that can not be queried.
+
+.. code-block:: python
+
+    q = query.Eq('snapCPG', 'CPG1') & query.Eq('copyOf', 'vol1')
+    q.render()      # snapCPG EQ CPG1 AND copyOf EQ vol1
+
+    q = query.Has('FCPaths', query.Eq('wwn', wwn1) | query.Eq('wwn', wwn2))
+    q.render()      # FCPaths[wwn==... OR wwn==...]
+
+ A query can only be sent to the array when every value can be written
+ in the query syntax, which has no quoting of its own, and AND and OR are
+ not mixed, as the WSAPI has no grouping. :attr:`Query.pushable` tells,
+ and :func:`collection_url` falls back to getting the whole collection
+ for :func:`select` to filter.
+
+"""
+
+import re
+
+try:
+    # For Python 3.0 and later
+    from urllib.parse import quote
+except ImportError:
+    # Fall back to Python 2's urllib2
+    from urllib2 import quote
+
+try:
+    basestring
+except NameError:
+    basestring = str
+
+# Characters the query syntax would read as its own.
+_UNSAFE_VALUE = re.compile(r'[\s"\[\]()]')
+
+
+class Query(object):
+    """The base of the query conditions."""
+
+    def __and__(self, other):
+        return And(self, other)
+
+    def __or__(self, other):
+        return Or(self, other)
+
+    @property
+    def pushable(self):
+        """Whether the array can evaluate the query."""
+        raise NotImplementedError()
+
+    def render(self, nested=False):
+        """
+        :param nested: Render for the inside of a list field's brackets
+        :type nested: bool
+
+        :returns: str - the query in the WSAPI syntax
+        :raises: ValueError if the query is not pushable
+
+        """
+        raise NotImplementedError()
+
+    def matches(self, member):
+        """
+        :param member: A member of a collection
+        :type member: dict
+
+        :returns: bool - whether the query selects member
+
+        """
+        raise NotImplementedError()
+
+    def to_param(self):
+        """
+        :returns: str - the url encoded value of the ?query= parameter
+
+        """
+        query = '"%s"' % self.render()
+        return quote(query.encode('utf8'))
+
+    def __str__(self):
+        return self.render()
+
+
+class Eq(Query):
+    """
+    field EQ value. A list field matches when value is one of its items.
+
+    :param field: The member key
+    :type field: str
+    :param value: The value to compare with
+    :type value: str, int or bool
+
+    """
+
+    def __init__(self, field, value):
+        self.field = field
+        self.value = value
+
+    @property
+    def pushable(self):
+        if isinstance(self.value, bool):
+            return True
+        if isinstance(self.value, int):
+            return True
+        if not isinstance(self.value, basestring):
+            return False
+        return bool(self.value) and not _UNSAFE_VALUE.search(self.value)
+
+    def _value(self):
+        if not self.pushable:
+            raise ValueError("The value of %s can not be written in a "
+                             "query: %r" % (self.field, self.value))
+        if isinstance(self.value, bool):
+            return 'true' if self.value else 'false'
+        return '%s' % self.value
+
+    def render(self, nested=False):
+        # The conditions on the elements of a list field use ==.
+        if nested:
+            return '%s==%s' % (self.field, self._value())
+        return '%s EQ %s' % (self.field, self._value())
+
+    def matches(self, member):
+        if not isinstance(member, dict) or self.field not in member:
+            return False
+        value = member[self.field]
+        if isinstance(value, list):
+            return self.value in value
+        return value == self.value
+
+    def __repr__(self):
+        return 'Eq(%r, %r)' % (self.field, self.value)
+
+
+class Has(Query):
+    """
+    field[query], the list field has an element that query matches.
+
+    :param field: The member key of the list
+    :type field: str
+    :param query: The condition on the elements
+    :type query: :class:`Query`
+
+    """
+
+    def __init__(self, field, query):
+        self.field = field
+        self.query = query
+
+    @property
+    def pushable(self):
+        nested = isinstance(self.query, Has)
+        return self.query.pushable and not nested
+
+    def render(self, nested=False):
+        if nested:
+            raise ValueError("List fields can not be nested: %s" %
+                             self.field)
+        return '%s[%s]' % (self.field, self.query.render(nested=True))
+
+    def matches(self, member):
+        if not isinstance(member, dict):
+            return False
+        return any(self.query.matches(element)
+                   for element in member.get(self.field) or [])
+
+    def __repr__(self):
+        return 'Has(%r, %r)' % (self.field, self.query)
+
+
+class _Join(Query):
+
+    operator = None
+
+    def __init__(self, *queries):
+        # Flatten, (a | b) | c is a | b | c.
+        self.queries = []
+        for query in queries:
+            if isinstance(query, self.__class__):
+                self.queries.extend(query.queries)
+            else:
+                self.queries.append(query)
+
+    @property
+    def pushable(self):
+        # The WSAPI has no parentheses to group a mix of AND and OR.
+        return all(query.pushable and not isinstance(query, _Join)
+                   for query in self.queries)
+
+    def render(self, nested=False):
+        if not self.pushable:
+            raise ValueError("The query can not be sent to the array: %r" %
+                             self)
+        return (' %s ' % self.operator).join(
+            query.render(nested) for query in self.queries)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__,
+                           ', '.join(repr(query) for query in self.queries))
+
+
+class And(_Join):
+    """Every one of the queries matches."""
+
+    operator = 'AND'
+
+    def matches(self, member):
+        return all(query.matches(member) for query in self.queries)
+
+
+class Or(_Join):
+    """Any one of the queries matches. Or() matches nothing."""
+
+    operator = 'OR'
+
+    def matches(self, member):
+        return any(query.matches(member) for query in self.queries)
+
+
+def collection_url(collection, query, supported=True):
+    """
+    :param collection: The collection, ie. volumes
+    :type collection: str
+    :param query: The query
+    :type query: :class:`Query`
+    :param supported: Whether the array can query the collection
+    :type supported: bool
+
+    :returns: tuple - (url, pushed), pushed is False when the url gets the
+              whole collection, to be filtered with :func:`select`
+
+    """
+    if supported and query.pushable:
+        return '/%s?query=%s' % (collection, query.to_param()), True
+    return '/%s' % collection, False
+
+
+def select(body, query):
+    """
+    :param body: A collection
+    :type body: dict
+    :param query: The query
+    :type query: :class:`Query`
+
+    :returns: dict - the collection with only the members query matches
+
+    """
+    members = [member for member in body.get('members', [])
+               if query.matches(member)]
+    return {'total': len(members), 'members': members}
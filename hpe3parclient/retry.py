@@ -0,0 +1,210 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Retry policy for WSAPI requests.
+
+.. module: retry
+
+:Description: A RetryPolicy describes how a failed WSAPI request is retried.
+ It holds no per-request state itself, every request gets a fresh RetryState
+ from the policy so that one request running out of retries never affects
+ the next one.
+
+"""
+
+import random
+import time
+
+import requests
+
+from hpe3parclient import exceptions
+
+
+class RetryPolicy(object):
+    """
+    Jittered exponential backoff with a cap on the total time spent.
+
+    :param tries: The maximum number of attempts, including the first one
+    :type tries: int
+    :param base_delay: The delay in seconds before the first retry
+    :type base_delay: float
+    :param backoff: The multiplier applied to the delay after each retry
+    :type backoff: float
+    :param max_delay: The largest single delay in seconds
+    :type max_delay: float
+    :param max_total_time: Give up once a request has spent this many seconds
+                           in total, including the delays. None for no cap
+    :type max_total_time: float
+    :param jitter: Randomize each delay between 0 and its computed value
+    :type jitter: bool
+
+    """
+
+    # Verbs the WSAPI defines as safe to replay. A POST that reached the
+    # array may already have created an object, so it is only retried when
+    # the array is known to have rejected it.
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT',
+                                    'DELETE'])
+
+    # The request never reached the WSAPI service, retry any verb.
+    safe_exceptions = (exceptions.HTTPServiceUnavailable,
+                       requests.exceptions.ConnectTimeout)
+
+    # The request may have reached the WSAPI service, only retry idempotent
+    # verbs.
+    idempotent_exceptions = (requests.exceptions.ConnectionError,)
+
+    def __init__(self, tries=5, base_delay=1, backoff=2, max_delay=30,
+                 max_total_time=120, jitter=True):
+        self.tries = tries
+        self.base_delay = base_delay
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.max_total_time = max_total_time
+        self.jitter = jitter
+
+    @property
+    def retry_exceptions(self):
+        """Every exception this policy may retry on."""
+        return self.safe_exceptions + self.idempotent_exceptions
+
+    def is_idempotent(self, method):
+        return method.upper() in self.IDEMPOTENT_METHODS
+
+    def get_delay(self, retry_number):
+        """The delay before the given retry, starting at 1."""
+        delay = min(self.max_delay,
+                    self.base_delay * (self.backoff ** (retry_number - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def new_state(self, method):
+        """Start tracking a new request made with the given verb."""
+        return RetryState(self, method)
+
+
+class RetryState(object):
+    """
+    The retry bookkeeping of a single request.
+
+    :param policy: The policy this request is evaluated against
+    :type policy: RetryPolicy
+    :param method: The HTTP verb of the request
+    :type method: str
+
+    """
+
+    def __init__(self, policy, method):
+        self.policy = policy
+        self.method = method.upper()
+        self.start_time = time.time()
+        # [{'attempt', 'delay', 'latency', 'status', 'error'}, ...]
+        self.attempts = []
+        self.exhausted = False
+        # Body sizes and JSON decode time of the last attempt, the decode
+        # time is None if there was no body.
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.decode_time = None
+        # The session key the request was sent with, None for a login.
+        self.session_key = None
+        self._attempt_start = None
+        self._delay = 0
+
+    @property
+    def retries(self):
+        return max(len(self.attempts) - 1, 0)
+
+    @property
+    def in_attempt(self):
+        """True until the attempt in flight has been recorded."""
+        return self._attempt_start is not None
+
+    @property
+    def pending_delay(self):
+        """The backoff delay to wait before the next attempt."""
+        return self._delay
+
+    def start_attempt(self):
+        """Sleep for the pending backoff delay, then start timing."""
+        if self._delay:
+            time.sleep(self._delay)
+        self.begin_attempt()
+
+    def begin_attempt(self):
+        """
+        Start timing an attempt without sleeping, for callers that wait
+        for pending_delay themselves (e.g. with asyncio.sleep).
+
+        """
+        self._attempt_start = time.time()
+
+    def end_attempt(self, status=None, error=None):
+        """
+        Record the outcome of the attempt in flight.
+
+        :param status: The HTTP status code, if a response was received
+        :type status: int
+        :param error: The exception raised, if no response was received
+        :type error: Exception
+
+        """
+        self.attempts.append({
+            'attempt': len(self.attempts) + 1,
+            'delay': self._delay,
+            'latency': time.time() - self._attempt_start,
+            'status': status,
+            'error': type(error).__name__ if error is not None else None})
+        self._attempt_start = None
+
+    def should_retry(self, error, safe=None):
+        """
+        Decide whether the failed attempt should be retried, and if so
+        compute the delay that the next start_attempt() will wait.
+
+        :param error: The exception the attempt failed with
+        :type error: Exception
+        :param safe: Whether the request is known not to have reached the
+                     array. Default classifies error against the policy's
+                     safe_exceptions and idempotent_exceptions
+        :type safe: bool
+
+        :returns: bool
+
+        """
+        policy = self.policy
+        if safe is None:
+            if isinstance(error, policy.safe_exceptions):
+                safe = True
+            elif isinstance(error, policy.idempotent_exceptions):
+                safe = False
+            else:
+                return False
+        if not safe and not policy.is_idempotent(self.method):
+            return False
+
+        if len(self.attempts) >= policy.tries:
+            self.exhausted = True
+            return False
+
+        delay = policy.get_delay(len(self.attempts))
+        if policy.max_total_time is not None:
+            elapsed = time.time() - self.start_time
+            if elapsed + delay > policy.max_total_time:
+                self.exhausted = True
+                return False
+
+        self._delay = delay
+        return True
@@ -0,0 +1,403 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" WSAPI session key stores.
+
+.. module: session_store
+
+:Description: A session store lets clients share WSAPI session keys, so
+ that every process on a host logging in to the same array as the same
+ user reuses one session instead of creating its own. A client with a
+ store only POSTs /credentials when the store has no key for it, and drops
+ the stored key when the array rejects it with a 401 or 403.
+
+ The store counts the clients holding each key. A client logging out only
+ DELETEs the session on the array when it is the last holder, the others
+ just let go of it, so one worker logging out does not log out the rest.
+ A key is stored with the time its session was created, so that every
+ client reusing it knows its real age.
+
+ Two clients that log in at once both create a session. The second to
+ store its key takes the first one's instead, and DELETEs its own. A
+ client renewing a session it finds too old stops the store handing the
+ old key out, and the last holder of the old key DELETEs it.
+
+ Keys are filed under a digest of the array url, user, password and login
+ options, so only a client that knows the password finds the key. The
+ store files are created readable by their owner only, as they hold live
+ session keys.
+
+.. code-block:: python
+
+    store = session_store.SQLiteSessionStore('/var/run/myapp/3par.db')
+    cl = client.HPE3ParClient(url, session_store=store)
+    cl.login(user, password)   # Reuses another worker's session
+
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, use the SQLiteSessionStore.
+    fcntl = None
+
+
+class SessionStore(object):
+    """
+    The base of the session stores, it keeps the keys in memory, so only
+    the clients of this process share them.
+
+    :param max_age: Seconds after which a stored key is no longer handed
+                    out. Default keeps keys until the array rejects them
+    :type max_age: float
+
+    """
+
+    def __init__(self, max_age=None):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # {session_id: {key: [created, holders, retired]}}
+        self._sessions = {}
+
+    @staticmethod
+    def session_id(api_url, user, password, optional=None):
+        """
+        :returns: str - the id sessions of this array, user, password and
+                  login options are stored under
+
+        """
+        ident = json.dumps([api_url, user, password, optional],
+                           sort_keys=True)
+        return hashlib.sha256(ident.encode('utf-8')).hexdigest()
+
+    def _is_fresh(self, created):
+        return self.max_age is None or time.time() - created < self.max_age
+
+    def get(self, session_id):
+        """
+        :param session_id: See :meth:`session_id`
+        :type session_id: str
+
+        :returns: str - the stored session key, or None
+
+        """
+        with self._lock:
+            return self._get(self._sessions, session_id)
+
+    def acquire(self, session_id):
+        """
+        Take the stored session key, and count the caller as one of its
+        holders until it calls :meth:`release`.
+
+        :param session_id: See :meth:`session_id`
+        :type session_id: str
+
+        :returns: tuple - (key, created), the stored session key and the
+                  time its session was created, or None
+
+        """
+        with self._lock:
+            return self._acquire(self._sessions, session_id)
+
+    def put(self, session_id, key, created=None):
+        """
+        Store a new session key, held by the caller only. If another client
+        stored a key in the meantime, that key is taken instead, as with
+        :meth:`acquire`, and the caller should delete its own session.
+
+        :param session_id: See :meth:`session_id`
+        :type session_id: str
+        :param key: The session key
+        :type key: str
+        :param created: When the session was created. Default is now
+        :type created: float
+
+        :returns: tuple - (key, created), the session key the caller now
+                  holds and the time its session was created
+
+        """
+        if created is None:
+            created = time.time()
+        with self._lock:
+            return self._put(self._sessions, session_id, key, created)
+
+    def release(self, session_id, key, retire=False):
+        """
+        Let go of a key taken with :meth:`acquire` or :meth:`put`. The key
+        is dropped from the store once its last holder lets go of it.
+
+        :param session_id: See :meth:`session_id`
+        :type session_id: str
+        :param key: The key let go of
+        :type key: str
+        :param retire: Also stop handing the key out, as its session is too
+                       old for the caller. Default hands it out until its
+                       last holder lets go of it
+        :type retire: bool
+
+        :returns: bool - True if the caller was the last holder, and the
+                  session can be deleted on the array. False if other
+                  clients may still use it, or the array rejected it
+
+        """
+        with self._lock:
+            return self._release(self._sessions, session_id, key, retire)
+
+    def invalidate(self, session_id, key):
+        """
+        Forget a rejected key. A newer key stored by another client in the
+        meantime is kept.
+
+        :param session_id: See :meth:`session_id`
+        :type session_id: str
+        :param key: The key that was rejected
+        :type key: str
+
+        """
+        with self._lock:
+            self._invalidate(self._sessions, session_id, key)
+
+    # The methods below work on the {session_id: {key: entry}} dict of the
+    # keys, the subclasses load it and save it around them.
+
+    def _current(self, sessions, session_id):
+        # The newest key still handed out.
+        handed_out = [(entry[0], key)
+                      for key, entry in sessions.get(session_id, {}).items()
+                      if not entry[2] and self._is_fresh(entry[0])]
+        return max(handed_out)[1] if handed_out else None
+
+    def _get(self, sessions, session_id):
+        return self._current(sessions, session_id)
+
+    def _acquire(self, sessions, session_id):
+        key = self._current(sessions, session_id)
+        if key is None:
+            return None
+        entry = sessions[session_id][key]
+        entry[1] += 1
+        return key, entry[0]
+
+    def _put(self, sessions, session_id, key, created):
+        stored = self._acquire(sessions, session_id)
+        if stored is not None:
+            return stored
+        sessions.setdefault(session_id, {})[key] = [created, 1, False]
+        return key, created
+
+    def _release(self, sessions, session_id, key, retire):
+        keys = sessions.get(session_id, {})
+        entry = keys.get(key)
+        if entry is None:
+            return False
+        entry[1] -= 1
+        entry[2] = entry[2] or retire
+        if entry[1] > 0:
+            return False
+        self._invalidate(sessions, session_id, key)
+        return True
+
+    def _invalidate(self, sessions, session_id, key):
+        keys = sessions.get(session_id, {})
+        if keys.pop(key, None) is None:
+            return False
+        if not keys:
+            del sessions[session_id]
+        return True
+
+
+def _create_private(path):
+    # Create the file readable by its owner only, if it does not exist.
+    os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+
+
+class FileSessionStore(SessionStore):
+    """
+    Keeps the keys in a JSON file, guarded by an flock on path.lock, so
+    that every process on the host shares them. POSIX only.
+
+    :param path: The JSON file
+    :type path: str
+    :param max_age: See :class:`SessionStore`
+    :type max_age: float
+
+    """
+
+    def __init__(self, path, max_age=None):
+        if fcntl is None:
+            raise NotImplementedError(
+                "FileSessionStore needs fcntl, use SQLiteSessionStore")
+        super(FileSessionStore, self).__init__(max_age)
+        self.path = path
+        _create_private(path)
+        _create_private(path + '.lock')
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive):
+        fd = os.open(self.path + '.lock', os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)
+
+    def _read(self):
+        with open(self.path) as f:
+            data = f.read()
+        return json.loads(data) if data else {}
+
+    def _write(self, sessions):
+        # Replace the file, so that a crash never leaves it half written.
+        tmp_path = '%s.%d.tmp' % (self.path, os.getpid())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(sessions, f)
+        os.rename(tmp_path, self.path)
+
+    def _update(self, method, *args):
+        # Runs method on the keys, and saves them, under the exclusive lock.
+        with self._locked(True):
+            sessions = self._read()
+            result = method(sessions, *args)
+            self._write(sessions)
+        return result
+
+    def get(self, session_id):
+        with self._locked(False):
+            return self._get(self._read(), session_id)
+
+    def acquire(self, session_id):
+        return self._update(self._acquire, session_id)
+
+    def put(self, session_id, key, created=None):
+        if created is None:
+            created = time.time()
+        return self._update(self._put, session_id, key, created)
+
+    def release(self, session_id, key, retire=False):
+        return self._update(self._release, session_id, key, retire)
+
+    def invalidate(self, session_id, key):
+        self._update(self._invalidate, session_id, key)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Keeps the keys in an SQLite database, so that every process on the
+    host shares them.
+
+    :param path: The database file
+    :type path: str
+    :param max_age: See :class:`SessionStore`
+    :type max_age: float
+    :param timeout: Seconds to wait for another process's lock on the
+                    database. Default is 5
+    :type timeout: float
+
+    """
+
+    def __init__(self, path, max_age=None, timeout=5):
+        super(SQLiteSessionStore, self).__init__(max_age)
+        self.path = path
+        self.timeout = timeout
+        _create_private(path)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS session_keys '
+                         '(id TEXT, key TEXT, created REAL, '
+                         'holders INTEGER, retired INTEGER, '
+                         'PRIMARY KEY (id, key))')
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # A connection per call, so the store survives a fork.
+        conn = sqlite3.connect(self.path, timeout=self.timeout,
+                               isolation_level=None)
+        try:
+            # Take the write lock before anything is read, so that every
+            # call is atomic.
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def _current_row(self, conn, session_id):
+        min_created = None if self.max_age is None else \
+            time.time() - self.max_age
+        return conn.execute(
+            'SELECT key, created FROM session_keys WHERE id = ? '
+            'AND NOT retired AND (? IS NULL OR created > ?) '
+            'ORDER BY created DESC LIMIT 1',
+            (session_id, min_created, min_created)).fetchone()
+
+    def _hold(self, conn, session_id, key):
+        conn.execute(
+            'UPDATE session_keys SET holders = holders + 1 '
+            'WHERE id = ? AND key = ?', (session_id, key))
+
+    def get(self, session_id):
+        with self._connect() as conn:
+            row = self._current_row(conn, session_id)
+        return None if row is None else row[0]
+
+    def acquire(self, session_id):
+        with self._connect() as conn:
+            row = self._current_row(conn, session_id)
+            if row is None:
+                return None
+            self._hold(conn, session_id, row[0])
+        return row[0], row[1]
+
+    def put(self, session_id, key, created=None):
+        if created is None:
+            created = time.time()
+        with self._connect() as conn:
+            row = self._current_row(conn, session_id)
+            if row is not None:
+                self._hold(conn, session_id, row[0])
+                return row[0], row[1]
+            conn.execute(
+                'INSERT INTO session_keys VALUES (?, ?, ?, 1, 0)',
+                (session_id, key, created))
+        return key, created
+
+    def release(self, session_id, key, retire=False):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE session_keys SET holders = holders - 1, '
+                'retired = retired OR ? WHERE id = ? AND key = ?',
+                (retire, session_id, key))
+            if not cursor.rowcount:
+                return False
+            cursor = conn.execute(
+                'DELETE FROM session_keys WHERE id = ? AND key = ? '
+                'AND holders <= 0', (session_id, key))
+            return cursor.rowcount > 0
+
+    def invalidate(self, session_id, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM session_keys WHERE id = ? AND key = ?',
+                         (session_id, key))
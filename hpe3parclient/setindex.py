@@ -0,0 +1,179 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Set membership index.
+
+.. module: setindex
+
+:Description: A SetIndex maps the members of the volume sets or host sets
+ of an array to the sets they are in. It is built from one GET of the
+ whole collection, on the first lookup, and answers the lookups after
+ that without a round trip.
+
+ The client keeps its indexes up to date with the changes it makes: a
+ set it creates or modifies is read back from the array, a set it deletes
+ is dropped, and so are the volumes and hosts it deletes. A change made
+ by anything else only shows once the index is rebuilt, ttl seconds after
+ it was built.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(url, set_index_ttl=300)
+    cl.login(user, password)
+    cl.findAllVolumeSets('vol1')    # GET /volumesets
+    cl.findAllVolumeSets('vol2')    # no request
+    cl.volume_set_index.get_stats()
+
+"""
+
+import copy
+import logging
+
+from hpe3parclient import collectionindex
+
+LOG = logging.getLogger(__name__)
+
+
+class SetIndex(collectionindex.CollectionIndex):
+    """
+    :param get_sets: Returns the set collection, ie. {'members': [...]}
+    :type get_sets: callable
+    :param get_set: Returns the set with the given name
+    :type get_set: callable
+    :param ttl: Seconds before the index is rebuilt from the array. None
+                disables the index
+    :type ttl: float
+
+    """
+
+    def __init__(self, get_sets, get_set, ttl=None):
+        self.get_sets = get_sets
+        self.get_set = get_set
+        super(SetIndex, self).__init__(ttl)
+
+    def _reset(self):
+        # Set name to (position in the collection, set).
+        self._sets = {}
+        # Member name to the names of the sets it is in.
+        self._members = {}
+        self._next_position = 0
+
+    def _load(self):
+        for member_set in self.get_sets().get('members', []):
+            self._add(member_set)
+
+    def _add(self, member_set, position=None):
+        name = member_set['name']
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._sets[name] = (position, member_set)
+        for member in member_set.get('setmembers') or []:
+            self._members.setdefault(member, []).append(name)
+
+    def _remove(self, name):
+        # Returns the position of the set, None if it is not indexed.
+        if name not in self._sets:
+            return None
+        position, member_set = self._sets.pop(name)
+        for member in member_set.get('setmembers') or []:
+            names = self._members.get(member, [])
+            if name in names:
+                names.remove(name)
+            if not names:
+                self._members.pop(member, None)
+        return position
+
+    def find(self, member):
+        """
+        :param member: The volume or host name
+        :type member: str
+
+        :returns: list - copies of the sets member is in, in the order of
+                  the collection
+
+        """
+        with self._lock:
+            self._ensure_built()
+            member_sets = sorted(self._sets[name]
+                                 for name in self._members.get(member, []))
+            return [copy.deepcopy(member_set)
+                    for position, member_set in member_sets]
+
+    def refresh(self, name, new_name=None):
+        """
+        Read a set the client created or modified back from the array.
+
+        :param name: The set name
+        :type name: str
+        :param new_name: The name the set was renamed to
+        :type new_name: str
+
+        """
+        if not self.built:
+            return
+        try:
+            member_set = self.get_set(new_name or name)
+        except Exception as ex:
+            LOG.debug("Could not read set %s back, clearing the index: %s",
+                      new_name or name, ex)
+            self.clear()
+            return
+        with self._lock:
+            if not self.built:
+                return
+            # A set read back keeps its place in the collection.
+            position = self._remove(name)
+            self._remove(member_set['name'])
+            self._add(member_set, position)
+
+    def discard(self, name):
+        """
+        Drop a set the client deleted.
+
+        :param name: The set name
+        :type name: str
+
+        """
+        with self._lock:
+            self._remove(name)
+
+    def discard_member(self, member):
+        """
+        Drop a volume or host the client deleted from every set.
+
+        :param member: The volume or host name
+        :type member: str
+
+        """
+        self.rename_member(member, None)
+
+    def rename_member(self, member, new_name):
+        """
+        :param member: The volume or host name
+        :type member: str
+        :param new_name: Its new name, None if it was deleted
+        :type new_name: str
+
+        """
+        with self._lock:
+            for name in self._members.pop(member, []):
+                setmembers = self._sets[name][1]['setmembers']
+                setmembers.remove(member)
+                if new_name is not None:
+                    setmembers.append(new_name)
+                    self._members.setdefault(new_name, []).append(name)
+
+    def _stats(self):
+        return {'sets': len(self._sets), 'members': len(self._members)}
@@ -11,7 +11,10 @@
 #    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
 #    License for the specific language governing permissions and limitations
 #    under the License.
-import collections
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
 
 """ Parser for 3PAR showport commands.
 
@@ -145,8 +148,8 @@ class ShowportParser:
         """
         for k, v2 in d2.items():
             v1 = d1.get(k)  # returns None if v1 has no value for this key
-            if (isinstance(v1, collections.Mapping) and
-                    isinstance(v2, collections.Mapping)):
+            if (isinstance(v1, Mapping) and
+                    isinstance(v2, Mapping)):
                 self._merge_dict(v1, v2)
             else:
                 d1[k] = v2
@@ -28,9 +28,11 @@ import os
 import paramiko
 from random import randint
 import re
+import time
 
 from eventlet import greenthread
 from hpe3parclient import exceptions
+from hpe3parclient import metrics
 
 # Python 3+ override
 try:
@@ -58,13 +60,16 @@ class HPE3PARSSHClient(object):
 
     def __init__(self, ip, login, password,
                  port=22, conn_timeout=None, privatekey=None,
-                 **kwargs):
+                 metrics_hooks=None, **kwargs):
         self.san_ip = ip
         self.san_ssh_port = port
         self.ssh_conn_timeout = conn_timeout
         self.san_login = login
         self.san_password = password
         self.san_privatekey = privatekey
+        if metrics_hooks is None:
+            metrics_hooks = metrics.MetricsHooks()
+        self.metrics = metrics_hooks
 
         self._create_ssh(**kwargs)
 
@@ -259,7 +264,17 @@ class HPE3PARSSHClient(object):
         """Runs a CLI command over SSH, without doing any result parsing."""
         self._logger.debug("SSH CMD = %s " % cmd)
 
-        (stdout, stderr) = self._run_ssh(cmd, False)
+        start_time = time.time()
+        error = None
+        try:
+            (stdout, stderr) = self._run_ssh(cmd, False)
+        except Exception as ex:
+            error = type(ex).__name__
+            raise
+        finally:
+            self.metrics.emit(metrics.MetricsHooks.SSH_COMMAND,
+                              command=cmd[0] if cmd else None,
+                              latency=time.time() - start_time, error=error)
         # we have to strip out the input and exit lines
         if python3:
             tmp = stdout.decode().split("\r\n")
@@ -0,0 +1,455 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Watcher of array tasks.
+
+.. module: taskwatcher
+
+:Description: A TaskWatcher waits on any number of array tasks with one
+ GET of /tasks per poll, from a background thread, instead of a poll per
+ task. Every task watched gets a :class:`TaskFuture`, resolved when the
+ task is done, fails or is cancelled.
+
+ The watcher polls every min_interval seconds while the tasks it watches
+ change, and backs off towards max_interval while they do not. The thread
+ stops once no task is watched, and starts again with the next watch. If
+ /tasks can not be read max_poll_errors times in a row, the futures
+ watched fail with the error instead of waiting for ever.
+
+ The Async variants of the client calls that start a task, ie.
+ copyVolumeAsync, return the future of the task they start. A future
+ reports the progress of its task, can cancel it, and can be given a
+ timeout after which the task is cancelled.
+
+.. code-block:: python
+
+    futures = [cl.copyVolumeAsync(src, src + '-clone', 'CPG1', timeout=3600)
+               for src in volumes]
+    for future in futures:
+        future.result()    # raises TaskFailed, TaskCancelled, Timeout
+
+"""
+
+import logging
+import threading
+import time
+
+from hpe3parclient import exceptions
+
+LOG = logging.getLogger(__name__)
+
+# The status of a task, as in HPE3ParClient.TASK_DONE etc.
+DONE = 1
+ACTIVE = 2
+CANCELLED = 3
+FAILED = 4
+
+
+class TaskFuture(object):
+    """
+    The outcome of an array task, resolved by a :class:`TaskWatcher`.
+
+    :param task_id: The task ID
+    :type task_id: int
+    :param name: The task name, when the task is watched by name
+    :type name: str
+    :param canceller: Cancels the task with the given ID, see :meth:`cancel`
+    :type canceller: callable
+    :param deadline: The time.time() after which the task is cancelled and
+                     the future fails with Timeout
+    :type deadline: float
+
+    """
+
+    def __init__(self, task_id=None, name=None, canceller=None,
+                 deadline=None):
+        self.task_id = task_id
+        self.name = name
+        self.canceller = canceller
+        self.deadline = deadline
+        # The task as last seen by the watcher.
+        self.task = None
+        self.error = None
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    @property
+    def status(self):
+        """The task status, ie. ACTIVE, None until the task is seen."""
+        if self.task is None:
+            return None
+        return self.task.get('status')
+
+    @property
+    def progress(self):
+        """
+        The part of the task done, from 0.0 to 1.0, from its completed and
+        total steps, or else phases. None while it is not known.
+        """
+        if self.done() and self.error is None:
+            return 1.0
+        task = self.task or {}
+        for completed, total in (('completedSteps', 'totalSteps'),
+                                 ('completedPhases', 'totalPhases')):
+            if task.get(total):
+                return float(task.get(completed) or 0) / task[total]
+        return None
+
+    def done(self):
+        """Whether the task is over, whatever the outcome."""
+        return self._event.is_set()
+
+    def cancel(self):
+        """
+        Cancel the task on the array. The future fails with TaskCancelled
+        once the watcher sees the task cancelled.
+
+        :returns: bool - False if the task is over, or can not be cancelled
+
+        """
+        if self.done():
+            return False
+        return self._cancel_task()
+
+    def _cancel_task(self):
+        task_id = self.task_id
+        if task_id is None and self.task is not None:
+            task_id = self.task.get('id')
+        if self.canceller is None or task_id is None:
+            return False
+        try:
+            self.canceller(task_id)
+        except Exception as ex:
+            LOG.debug("Could not cancel task %s: %s", self, ex)
+            return False
+        return True
+
+    def wait(self, timeout=None):
+        """
+        :param timeout: Seconds to wait. Default waits until the task is over
+        :type timeout: float
+
+        :returns: bool - whether the task is over
+
+        """
+        self._event.wait(timeout)
+        return self._event.is_set()
+
+    def result(self, timeout=None):
+        """
+        :param timeout: Seconds to wait. Default waits until the task is over
+        :type timeout: float
+
+        :returns: dict - the task, once it is done
+
+        :raises: :class:`~hpe3parclient.exceptions.TaskFailed`,
+                 :class:`~hpe3parclient.exceptions.TaskCancelled`, or
+                 :class:`~hpe3parclient.exceptions.HTTPNotFound` if the
+                 task is not in /tasks
+        :raises: :class:`~hpe3parclient.exceptions.Timeout` if the task is
+                 not over after timeout seconds
+
+        """
+        if not self.wait(timeout):
+            raise exceptions.Timeout(
+                "Task %s is not over after %s seconds" % (self, timeout))
+        if self.error is not None:
+            raise self.error
+        return self.task
+
+    def add_done_callback(self, callback):
+        """
+        :param callback: Called with the future once the task is over, from
+                         the watcher thread. Called at once if it is over
+        :type callback: callable
+
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        self._call(callback)
+
+    def _call(self, callback):
+        try:
+            callback(self)
+        except Exception:
+            LOG.exception("Task %s callback failed", self)
+
+    def _resolve(self, task, error=None):
+        with self._lock:
+            if self._event.is_set():
+                return False
+            if task is not None:
+                self.task = task
+            self.error = error
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            self._call(callback)
+        return True
+
+    def __str__(self):
+        if self.task_id is not None:
+            return str(self.task_id)
+        return "'%s'" % self.name
+
+    def __repr__(self):
+        return '<TaskFuture %s status=%s>' % (self, self.status)
+
+
+def done_future(value=None):
+    """
+    :param value: What the future's result is, ie. the response of a call
+                  that did not start a task
+    :type value: dict
+
+    :returns: :class:`TaskFuture` - already resolved
+
+    """
+    future = TaskFuture()
+    future._resolve(value)
+    return future
+
+
+class TaskWatcher(object):
+    """
+    :param get_tasks: Returns the task collection, ie. {'members': [...]}
+    :type get_tasks: callable
+    :param min_interval: Seconds between polls while the tasks change
+    :type min_interval: float
+    :param max_interval: The most seconds between polls
+    :type max_interval: float
+    :param backoff: What the interval is multiplied by after a poll where
+                    no task changed
+    :type backoff: float
+    :param max_poll_errors: The failed polls in a row after which every
+                            future watched fails with the error of the last
+                            one. None keeps polling. Default is 5
+    :type max_poll_errors: int
+
+    """
+
+    def __init__(self, get_tasks, min_interval=1.0, max_interval=15.0,
+                 backoff=1.5, max_poll_errors=5):
+        self.get_tasks = get_tasks
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_poll_errors = max_poll_errors
+        self.interval = min_interval
+        self.polls = 0
+        # The polls that failed since the last one that did not.
+        self._poll_errors = 0
+        self._cond = threading.Condition()
+        self._futures = []
+        self._thread = None
+        self._last_poll = 0
+
+    def watch(self, task_id=None, name=None, callback=None, timeout=None,
+              canceller=None):
+        """
+        Watch a task until it is over.
+
+        :param task_id: The task ID
+        :type task_id: int
+        :param name: The task name, instead of the ID. The most recent task
+                     with the name is watched
+        :type name: str
+        :param callback: Called with the future once the task is over
+        :type callback: callable
+        :param timeout: Seconds before the task is cancelled and the future
+                        fails with Timeout. Default waits for ever
+        :type timeout: float
+        :param canceller: Cancels the task with the given ID
+        :type canceller: callable
+
+        :returns: :class:`TaskFuture`
+
+        """
+        if (task_id is None) == (name is None):
+            raise ValueError("Watch a task by either its ID or its name")
+        deadline = None
+        if timeout is not None:
+            deadline = time.time() + timeout
+        future = TaskFuture(task_id, name, canceller, deadline)
+        if callback is not None:
+            future.add_done_callback(callback)
+        self._add(future)
+        return future
+
+    def _add(self, future):
+        with self._cond:
+            self._futures.append(future)
+            # A new task is polled for soon, however long the backoff.
+            self.interval = self.min_interval
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='hpe3parclient-taskwatcher')
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._futures:
+                        self._thread = None
+                        return
+                    now = time.time()
+                    delay = self._last_poll + self.interval - now
+                    deadlines = [future.deadline for future in self._futures
+                                 if future.deadline is not None]
+                    if deadlines:
+                        delay = min(delay, min(deadlines) - now)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+            self.poll()
+
+    def poll(self):
+        """
+        Read /tasks once and resolve the futures of the tasks that are
+        over. The watcher thread calls this, it is only needed to poll at
+        a given time.
+
+        """
+        with self._cond:
+            futures = [future for future in self._futures
+                       if not future.done()]
+            self._last_poll = time.time()
+        if not futures:
+            return
+
+        try:
+            tasks = self.get_tasks().get('members', [])
+        except Exception as ex:
+            LOG.debug("Could not poll the tasks: %s", ex)
+            with self._cond:
+                self._poll_errors += 1
+                limit = self.max_poll_errors
+                failed = limit is not None and self._poll_errors >= limit
+                if failed:
+                    self._poll_errors = 0
+            if failed:
+                LOG.warning("Could not poll the tasks %s times in a row, "
+                            "giving up on %s tasks: %s",
+                            self.max_poll_errors, len(futures), ex)
+                over = futures
+                timed_out = []
+            else:
+                # The tasks past their timeout still time out.
+                now = time.time()
+                over = []
+                timed_out = [future for future in futures
+                             if self._past_deadline(future, now)]
+            resolved = over + timed_out
+            with self._cond:
+                self._futures = [future for future in self._futures
+                                 if future not in resolved]
+                self._back_off()
+            for future in over:
+                future._resolve(None, ex)
+            for future in timed_out:
+                self._time_out(future)
+            return
+
+        by_id = {}
+        by_name = {}
+        for task in tasks:
+            by_id[task.get('id')] = task
+            latest = by_name.get(task.get('name'))
+            if latest is None or task.get('id', 0) > latest.get('id', 0):
+                by_name[task.get('name')] = task
+
+        with self._cond:
+            self._poll_errors = 0
+        changed = False
+        over = []
+        timed_out = []
+        now = time.time()
+        for future in futures:
+            if future.task_id is not None:
+                task = by_id.get(future.task_id)
+            else:
+                task = by_name.get(future.name)
+            outcome = self._outcome(future, task)
+            if outcome is not None:
+                over.append((future, task, outcome))
+                continue
+            if task != future.task:
+                changed = True
+                future.task = task
+            if self._past_deadline(future, now):
+                timed_out.append(future)
+
+        resolved = set(future for future, task, outcome in over)
+        resolved.update(timed_out)
+        with self._cond:
+            self.polls += 1
+            self._futures = [future for future in self._futures
+                             if not (future.done() or future in resolved)]
+            if over or changed:
+                self.interval = self.min_interval
+            else:
+                self._back_off()
+
+        for future, task, outcome in over:
+            future._resolve(task, outcome or None)
+        for future in timed_out:
+            self._time_out(future)
+
+    @staticmethod
+    def _past_deadline(future, now):
+        return future.deadline is not None and now >= future.deadline
+
+    def _time_out(self, future):
+        if future._resolve(future.task, exceptions.Timeout(
+                {'desc': "Task %s is not over after its timeout, "
+                         "cancelling it" % future})):
+            future._cancel_task()
+
+    def _outcome(self, future, task):
+        # None while the task is active, else the error to resolve the
+        # future with, False for no error.
+        if task is None:
+            return exceptions.HTTPNotFound(
+                {'code': 'NON_EXISTENT_TASK',
+                 'desc': "Task %s is not in /tasks" % future})
+        status = task.get('status')
+        if status == DONE:
+            return False
+        if status == FAILED:
+            return exceptions.TaskFailed(
+                {'desc': "Task %s failed" % future})
+        if status == CANCELLED:
+            return exceptions.TaskCancelled(
+                {'desc': "Task %s was cancelled" % future})
+        return None
+
+    def _back_off(self):
+        # Called with the lock held.
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def get_stats(self):
+        """
+        :returns: dict - {'watching': int, 'polls': int, 'interval': float}
+
+        """
+        with self._cond:
+            return {'watching': len(self._futures),
+                    'polls': self.polls,
+                    'interval': self.interval}
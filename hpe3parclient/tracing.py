@@ -0,0 +1,357 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" Tracing spans.
+
+.. module: tracing
+
+:Description: Every public client method called while a Tracer is set
+ records a span, and every WSAPI request and SSH command it makes records
+ a child span of it. A method that calls another public method, ie.
+ getHostVLUNs calling getHost, nests that method's span in its own, so a
+ trace shows which calls cost more than one round trip to the array.
+
+ Finished spans are passed to the exporter given to the Tracer, which is
+ any callable taking a :class:`Span`.
+
+.. code-block:: python
+
+    exporter = tracing.InMemoryExporter()
+    cl.setTracer(tracing.Tracer(exporter))
+    cl.getHostVLUNs('host1')
+    for span in exporter.spans:
+        print(span.name, span.duration, span.attributes)
+
+"""
+
+import functools
+import logging
+import random
+import threading
+import time
+import types
+
+try:
+    import contextvars
+except ImportError:
+    # Python < 3.7, threads still get their own current span.
+    contextvars = None
+
+from hpe3parclient import metrics
+
+LOG = logging.getLogger(__name__)
+
+
+def _new_id(bits):
+    return '%0*x' % (bits // 4, random.getrandbits(bits))
+
+
+class Span(object):
+    """
+    One timed operation in a trace.
+
+    :param name: The client method name, ie. getHostVLUNs, the route of a
+                 WSAPI request, ie. GET /hosts/{name}, or the SSH command,
+                 ie. ssh showport
+    :type name: str
+    :param parent: The span this one is part of, None for a root span
+    :type parent: Span
+    :param kind: 'client' for client methods, 'http' or 'ssh' for round
+                 trips
+    :type kind: str
+    :param attributes: The route, status, bytes and so on
+    :type attributes: dict
+
+    """
+
+    def __init__(self, name, parent=None, kind='client', attributes=None,
+                 start_time=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = parent.trace_id if parent else _new_id(128)
+        self.span_id = _new_id(64)
+        self.parent_id = parent.span_id if parent else None
+        self.attributes = attributes or {}
+        self.start_time = start_time if start_time is not None else \
+            time.time()
+        self.end_time = None
+        # Why the operation failed, ie. HTTPNotFound or HTTP 404, or None.
+        self.error = None
+
+    @property
+    def duration(self):
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def to_dict(self):
+        """
+        :returns: dict - {'name', 'kind', 'trace_id', 'span_id',
+                          'parent_id', 'start_time', 'end_time',
+                          'duration', 'error', 'attributes'}
+
+        """
+        return {'name': self.name,
+                'kind': self.kind,
+                'trace_id': self.trace_id,
+                'span_id': self.span_id,
+                'parent_id': self.parent_id,
+                'start_time': self.start_time,
+                'end_time': self.end_time,
+                'duration': self.duration,
+                'error': self.error,
+                'attributes': dict(self.attributes)}
+
+    def __repr__(self):
+        return '<Span %s %s>' % (self.name, self.span_id)
+
+
+class _SpanContext(object):
+
+    def __init__(self, tracer, span):
+        self.tracer = tracer
+        self.span = span
+        self._token = None
+
+    def __enter__(self):
+        self._token = self.tracer._set_current(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.tracer._reset_current(self._token)
+        self.tracer._end_span(self.span, exc_type)
+        return False
+
+
+class Tracer(object):
+    """
+    Records the spans of one or more clients and hands the finished ones
+    to the exporter.
+
+    The Tracer is also a :class:`~hpe3parclient.metrics.MetricsHooks`
+    callback, that is how the round trips of a client reach it.
+
+    :param exporter: Called as exporter(span) for every finished span,
+                     children before their parent. Spans are dropped if
+                     None
+    :type exporter: callable
+
+    """
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        if contextvars is not None:
+            self._current = contextvars.ContextVar(
+                'hpe3parclient_span_%d' % id(self), default=None)
+        else:
+            self._local = threading.local()
+
+    def current_span(self):
+        """
+        :returns: Span - the innermost span open in this thread or task,
+                  or None
+
+        """
+        if contextvars is not None:
+            return self._current.get()
+        return getattr(self._local, 'span', None)
+
+    def _set_current(self, span):
+        if contextvars is not None:
+            return self._current.set(span)
+        token = self.current_span()
+        self._local.span = span
+        return token
+
+    def _reset_current(self, token):
+        if contextvars is not None:
+            self._current.reset(token)
+        else:
+            self._local.span = token
+
+    def start_span(self, name, **attributes):
+        """
+        Start a span, as a child of the current one if there is one.
+
+        .. code-block:: python
+
+            with tracer.start_span('attach', host='host1'):
+                cl.createVLUN('vol1', hostname='host1')
+
+        :param name: The span name
+        :type name: str
+
+        :returns: a context manager that ends the span on exit and gives
+                  the :class:`Span` on entry
+
+        """
+        return _SpanContext(
+            self, Span(name, self.current_span(), attributes=attributes))
+
+    def _end_span(self, span, exc_type=None):
+        if exc_type is not None:
+            span.error = exc_type.__name__
+        span.end_time = time.time()
+        self.export(span)
+
+    def export(self, span):
+        if self.exporter is None:
+            return
+        try:
+            self.exporter(span)
+        except Exception:
+            LOG.exception("Span exporter %r failed on %r", self.exporter,
+                          span)
+
+    def __call__(self, event, data):
+        parent = self.current_span()
+        if event == metrics.MetricsHooks.HTTP_REAUTH:
+            if parent is not None:
+                parent.attributes['reauths'] = \
+                    parent.attributes.get('reauths', 0) + 1
+            return
+
+        end_time = time.time()
+        attributes = dict(data)
+        latency = attributes.pop('latency')
+        if event == metrics.MetricsHooks.HTTP_REQUEST:
+            span = Span('%s %s' % (data['method'], data['route']), parent,
+                        kind='http', attributes=attributes,
+                        start_time=end_time - latency)
+            if data['status'] is None:
+                span.error = 'no response'
+            elif data['status'] >= 400:
+                span.error = 'HTTP %d' % data['status']
+        elif event == metrics.MetricsHooks.SSH_COMMAND:
+            span = Span('ssh %s' % data['command'], parent, kind='ssh',
+                        attributes=attributes,
+                        start_time=end_time - latency)
+            span.error = data['error']
+        else:
+            return
+        span.end_time = end_time
+        self.export(span)
+
+
+class InMemoryExporter(object):
+    """
+    An exporter that keeps every span it is given, in the order they
+    finished.
+
+    :param max_spans: Keep only the most recent max_spans. Default keeps
+                      all
+    :type max_spans: int
+
+    """
+
+    def __init__(self, max_spans=None):
+        self.max_spans = max_spans
+        self._lock = threading.Lock()
+        self.spans = []
+
+    def __call__(self, span):
+        with self._lock:
+            self.spans.append(span)
+            if self.max_spans and len(self.spans) > self.max_spans:
+                del self.spans[:len(self.spans) - self.max_spans]
+
+    def get_children(self, span):
+        """
+        :returns: list - the spans whose parent is span
+        """
+        with self._lock:
+            return [child for child in self.spans
+                    if child.parent_id == span.span_id]
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+
+def _traced_generator(tracer, span, generator):
+    # The span is current only while the generator runs, not while the
+    # caller handles what it yielded.
+    exc_type = None
+    try:
+        while True:
+            token = tracer._set_current(span)
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                tracer._reset_current(token)
+            yield item
+    except GeneratorExit:
+        # Closed before the end, which is not an error.
+        raise
+    except BaseException as ex:
+        exc_type = type(ex)
+        raise
+    finally:
+        generator.close()
+        tracer._end_span(span, exc_type)
+
+
+def traced(func):
+    """
+    Record a span for every call of the client method func, when the
+    client has a tracer set. If func returns a generator, ie. iterVolumes,
+    the span stays open until the generator is exhausted or closed, so the
+    requests it makes while iterating are children of it.
+
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tracer = self.tracer
+        if tracer is None:
+            return func(self, *args, **kwargs)
+        span = Span(name, tracer.current_span())
+        token = tracer._set_current(span)
+        try:
+            result = func(self, *args, **kwargs)
+        except BaseException as ex:
+            tracer._end_span(span, type(ex))
+            raise
+        finally:
+            tracer._reset_current(token)
+        if isinstance(result, types.GeneratorType):
+            return _traced_generator(tracer, span, result)
+        tracer._end_span(span)
+        return result
+    return wrapper
+
+
+def trace_methods(cls, decorator=traced, exclude=()):
+    """
+    Wrap every public method defined by cls with decorator. Static and
+    class methods are left alone.
+
+    :param cls: The client class
+    :type cls: class
+    :param exclude: The method names to leave alone
+    :type exclude: tuple
+
+    :returns: cls
+
+    """
+    for name, value in list(vars(cls).items()):
+        if name.startswith('_') or name in exclude:
+            continue
+        if not isinstance(value, types.FunctionType):
+            continue
+        setattr(cls, name, decorator(value))
+    return cls
@@ -0,0 +1,250 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+""" VLUN topology index.
+
+.. module: vlunindex
+
+:Description: A VLUNIndex maps the hosts and volumes of an array, and the
+ (host, LUN) pairs in use, to their VLUNs, from one GET of /vluns. It lets
+ getVLUN and getHostVLUNs, and the attach and detach bookkeeping built on
+ them, look the exports up in memory.
+
+ The client reads the VLUNs of a volume it exports back from the array,
+ and drops the VLUNs it deletes. An export made by anything else only
+ shows once the index is rebuilt, ttl seconds after it was built.
+
+.. code-block:: python
+
+    cl = client.HPE3ParClient(url, vlun_index_ttl=300)
+    cl.login(user, password)
+    cl.getHostVLUNs('host1')    # GET /vluns
+    cl.getVLUN('vol1')          # no request
+    cl.vlun_index.find('host1', 1)
+
+"""
+
+import copy
+import logging
+
+from hpe3parclient import collectionindex
+
+LOG = logging.getLogger(__name__)
+
+
+def _same_port(vlun, port):
+    port_pos = vlun.get('portPos') or {}
+    return all(port_pos.get(key) == port.get(key)
+               for key in ('node', 'slot', 'cardPort'))
+
+
+class VLUNIndex(collectionindex.CollectionIndex):
+    """
+    :param get_vluns: Returns the VLUN collection, ie. {'members': [...]}
+    :type get_vluns: callable
+    :param get_volume_vluns: Returns the VLUNs of the volume with the given
+                             name, ie. {'members': [...]}
+    :type get_volume_vluns: callable
+    :param ttl: Seconds before the index is rebuilt from the array. None
+                disables the index
+    :type ttl: float
+
+    """
+
+    def __init__(self, get_vluns, get_volume_vluns, ttl=None):
+        self.get_vluns = get_vluns
+        self.get_volume_vluns = get_volume_vluns
+        super(VLUNIndex, self).__init__(ttl)
+
+    def _reset(self):
+        # Position in the collection to VLUN.
+        self._vluns = {}
+        # Host name, volume name and (host name, LUN) to the positions of
+        # their VLUNs.
+        self._hosts = {}
+        self._volumes = {}
+        self._luns = {}
+        self._next_position = 0
+
+    def _load(self):
+        for vlun in self.get_vluns().get('members', []):
+            self._add(vlun)
+
+    @staticmethod
+    def _keys(vlun):
+        host = vlun.get('hostname')
+        keys = [(None, vlun.get('volumeName'))]
+        if host:
+            keys.append((host, None))
+            keys.append((host, vlun.get('lun')))
+        return keys
+
+    def _map(self, key):
+        host, other = key
+        if host is None:
+            return self._volumes, other
+        if other is None:
+            return self._hosts, host
+        return self._luns, key
+
+    def _add(self, vlun, position=None):
+        if position is None:
+            position = self._next_position
+            self._next_position += 1
+        self._vluns[position] = vlun
+        for key in self._keys(vlun):
+            index, name = self._map(key)
+            index.setdefault(name, []).append(position)
+
+    def _remove(self, position):
+        vlun = self._vluns.pop(position)
+        for key in self._keys(vlun):
+            index, name = self._map(key)
+            positions = index.get(name, [])
+            if position in positions:
+                positions.remove(position)
+            if not positions:
+                index.pop(name, None)
+
+    def _lookup(self, attr, name):
+        # The index is looked up by attribute name, building it replaces
+        # the maps.
+        with self._lock:
+            self._ensure_built()
+            index = getattr(self, attr)
+            return [copy.deepcopy(self._vluns[position])
+                    for position in sorted(index.get(name, []))]
+
+    def find_host(self, host):
+        """
+        :param host: The host name
+        :type host: str
+
+        :returns: list - copies of the VLUNs of the host, in the order of
+                  the collection
+
+        """
+        return self._lookup('_hosts', host)
+
+    def find_volume(self, volume):
+        """
+        :param volume: The volume name
+        :type volume: str
+
+        :returns: list - copies of the VLUNs of the volume, in the order of
+                  the collection
+
+        """
+        return self._lookup('_volumes', volume)
+
+    def find(self, host, lun):
+        """
+        :param host: The host name
+        :type host: str
+        :param lun: The LUN ID
+        :type lun: int
+
+        :returns: dict - a copy of the first VLUN of the host with the LUN,
+                  or None if the LUN is free on the host
+
+        """
+        vluns = self._lookup('_luns', (host, lun))
+        return vluns[0] if vluns else None
+
+    def refresh_volume(self, volume):
+        """
+        Read the VLUNs of a volume the client exported back from the array.
+        They go to the end of the collection.
+
+        :param volume: The volume name
+        :type volume: str
+
+        """
+        if not self.built:
+            return
+        try:
+            vluns = self.get_volume_vluns(volume).get('members', [])
+        except Exception as ex:
+            LOG.debug("Could not read the VLUNs of %s back, clearing the "
+                      "index: %s", volume, ex)
+            self.clear()
+            return
+        with self._lock:
+            if not self.built:
+                return
+            for position in list(self._volumes.get(volume, [])):
+                self._remove(position)
+            for vlun in vluns:
+                self._add(vlun)
+
+    def discard(self, volume, lun, host=None, port=None):
+        """
+        Drop the VLUNs the client deleted. They are matched the way the
+        array matches them on a delete of /vluns/<volume>,<lun>,<host>,<port>.
+
+        :param volume: The volume name
+        :type volume: str
+        :param lun: The LUN ID
+        :type lun: int
+        :param host: The host name, None matches any host
+        :type host: str
+        :param port: The port, ie. {'node': 1, 'slot': 2, 'cardPort': 1}.
+                     None matches any port
+        :type port: dict
+
+        """
+        with self._lock:
+            for position in list(self._volumes.get(volume, [])):
+                vlun = self._vluns[position]
+                # The LUN ID may be given as a string, as it is in the URL.
+                if str(vlun.get('lun')) != str(lun):
+                    continue
+                if host and vlun.get('hostname') != host:
+                    continue
+                if port and not _same_port(vlun, port):
+                    continue
+                self._remove(position)
+
+    def rename(self, host=None, new_host=None, volume=None, new_volume=None):
+        """
+        Follow a host or volume the client renamed.
+
+        :param host: The old host name
+        :type host: str
+        :param new_host: The new host name
+        :type new_host: str
+        :param volume: The old volume name
+        :type volume: str
+        :param new_volume: The new volume name
+        :type new_volume: str
+
+        """
+        with self._lock:
+            if host and new_host:
+                positions = self._hosts.get(host, [])
+                field, new_name = 'hostname', new_host
+            elif volume and new_volume:
+                positions = self._volumes.get(volume, [])
+                field, new_name = 'volumeName', new_volume
+            else:
+                return
+            for position in sorted(positions):
+                vlun = self._vluns[position]
+                self._remove(position)
+                vlun[field] = new_name
+                self._add(vlun, position)
+
+    def _stats(self):
+        return {'vluns': len(self._vluns), 'hosts': len(self._hosts),
+                'volumes': len(self._volumes)}
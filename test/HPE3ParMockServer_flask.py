@@ -664,10 +664,28 @@ def get_hosts():
         result = {'total': len(matched_hosts), 'members': matched_hosts}
         resp = flask.make_response(json.dumps(result), 200)
     else:
+        for host in hosts['members']:
+            _add_host_paths(host)
         resp = flask.make_response(json.dumps(hosts), 200)
     return resp
 
 
+def _add_host_paths(host):
+    if 'iSCSINames' in list(host.keys()):
+        iscsi_paths = []
+        for path in host['iSCSINames']:
+            if not isinstance(path, dict):
+                path = {'name': path}
+            iscsi_paths.append(path)
+        host['iSCSIPaths'] = iscsi_paths
+
+    elif 'FCWWNs' in list(host.keys()):
+        fc_paths = []
+        for path in host['FCWWNs']:
+            fc_paths.append({'wwn': path.replace(':', '')})
+        host['FCPaths'] = fc_paths
+
+
 def _parse_query(query):
     wwns = re.findall("wwn==([0-9A-Z]*)", query)
     iqns = re.findall("name==([\w.:-]*)", query)
@@ -689,19 +707,7 @@ def get_host(host_name):
 
     for host in hosts['members']:
         if host['name'] == host_name:
-
-            if 'iSCSINames' in list(host.keys()):
-                iscsi_paths = []
-                for path in host['iSCSINames']:
-                    iscsi_paths.append({'name': path})
-                host['iSCSIPaths'] = iscsi_paths
-
-            elif 'FCWWNs' in list(host.keys()):
-                fc_paths = []
-                for path in host['FCWWNs']:
-                    fc_paths.append({'wwn': path.replace(':', '')})
-                host['FCPaths'] = fc_paths
-
+            _add_host_paths(host)
             resp = flask.make_response(json.dumps(host), 200)
             return resp
 
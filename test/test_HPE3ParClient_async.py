@@ -0,0 +1,237 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of the asyncio 3PAR Client."""
+
+import mock
+import unittest
+
+try:
+    import aiohttp
+    import asyncio
+    from hpe3parclient import aio_client
+except (ImportError, SyntaxError):
+    aio_client = None
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+from hpe3parclient import retry
+from hpe3parclient import tracing
+
+VOLUME_NAME1 = 'ASYNC_VOL1_' + hpe3parbase.TIME
+VOLUME_NAME2 = 'ASYNC_VOL2_' + hpe3parbase.TIME
+CPG_NAME1 = 'ASYNC_CPG1_' + hpe3parbase.TIME
+
+
+@unittest.skipIf(aio_client is None, "aiohttp is not installed")
+class HPE3ParAsyncClientTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParAsyncClientTestCase, self).setUp()
+        self.loop = asyncio.new_event_loop()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.acl = aio_client.AsyncHPE3ParClient(url, concurrency=4)
+        self.run_async(self.acl.login(self.user, self.password))
+
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+
+    def tearDown(self):
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.deleteVolume(name)
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+
+        self.run_async(self.acl.logout())
+        self.run_async(self.acl.close())
+        self.loop.close()
+        super(HPE3ParAsyncClientTestCase, self).tearDown()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_1_login_checks_version(self):
+        self.printHeader('login_checks_version')
+
+        self.assertEqual(self.acl.vlun_query_supported,
+                         self.cl.vlun_query_supported)
+        self.assertEqual(self.acl.primera_supported,
+                         self.cl.primera_supported)
+        self.assertIsNotNone(self.acl.http.session_key)
+
+        self.printFooter('login_checks_version')
+
+    def test_2_create_get_delete_volume(self):
+        self.printHeader('create_get_delete_volume')
+
+        self.run_async(self.acl.createVolume(VOLUME_NAME1, CPG_NAME1, 1024,
+                                             {'tpvv': True}))
+        vol = self.run_async(self.acl.getVolume(VOLUME_NAME1))
+        self.assertEqual(vol['name'], VOLUME_NAME1)
+        self.assertEqual(
+            self.acl.http.get_decode_stats()['GET /volumes/{name}']['count'],
+            1)
+
+        self.run_async(self.acl.deleteVolume(VOLUME_NAME1))
+        self.assertRaises(exceptions.HTTPNotFound, self.run_async,
+                          self.acl.getVolume(VOLUME_NAME1))
+
+        self.printFooter('create_get_delete_volume')
+
+    def test_3_concurrent_requests(self):
+        self.printHeader('concurrent_requests')
+
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            self.cl.createVolume(name, CPG_NAME1, 1024, {'tpvv': True})
+
+        tasks = [self.loop.create_task(self.acl.getVolume(name))
+                 for name in (VOLUME_NAME1, VOLUME_NAME2) * 4]
+        self.run_async(asyncio.wait(tasks))
+        vols = [task.result() for task in tasks]
+        self.assertEqual(len(vols), 8)
+        self.assertEqual(set(vol['name'] for vol in vols),
+                         set([VOLUME_NAME1, VOLUME_NAME2]))
+
+        stats = self.acl.http.get_retry_stats()
+        self.assertEqual(stats['retries'], 0)
+        self.assertEqual(self.acl.http.get_pool_stats()['pools'], 1)
+        # The identical GETs let in by the concurrency limit shared one.
+        stats = self.acl.http.get_coalesce_stats()
+        self.assertEqual(stats['requests'] + stats['coalesced'], 8)
+        self.assertGreater(stats['coalesced'], 0)
+
+        vols = self.run_async(self.acl.getVolumes(fields=['name']))
+        self.assertIn({'name': VOLUME_NAME1}, vols['members'])
+
+        self.printFooter('concurrent_requests')
+
+    def test_4_not_found(self):
+        self.printHeader('not_found')
+
+        self.assertRaises(exceptions.HTTPNotFound, self.run_async,
+                          self.acl.getHost('UnitTestNonExistHost'))
+        self.assertRaises(exceptions.HTTPNotFound, self.run_async,
+                          self.acl.getVLUN('UnitTestNonExistVolume'))
+
+        self.printFooter('not_found')
+
+    def test_5_tracing(self):
+        self.printHeader('tracing')
+
+        exporter = tracing.InMemoryExporter()
+        self.acl.setTracer(tracing.Tracer(exporter))
+        tasks = [self.loop.create_task(self.acl.getHost(name))
+                 for name in ('UnitTestNonExistHost1',
+                              'UnitTestNonExistHost2')]
+        self.run_async(asyncio.wait(tasks))
+        self.acl.setTracer(None)
+
+        # Every task has its own trace.
+        roots = [span for span in exporter.spans if span.name == 'getHost']
+        self.assertEqual(len(roots), 2)
+        for root in roots:
+            self.assertEqual(root.error, 'HTTPNotFound')
+            self.assertEqual(
+                [span.name for span in exporter.get_children(root)],
+                ['GET /hosts/{name}'])
+
+        self.printFooter('tracing')
+
+    def test_6_iter_members(self):
+        self.printHeader('iter_members')
+
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            self.cl.createVolume(name, CPG_NAME1, 1024, {'tpvv': True})
+
+        async def collect(url, **kwargs):
+            return [member async for member in
+                    self.acl.http.iter_members(url, **kwargs)]
+
+        vols = self.run_async(collect('/volumes', chunk_size=64))
+        self.assertEqual(vols, self.cl.getVolumes()['members'])
+        names = self.run_async(collect('/volumes', fields=['name']))
+        self.assertIn({'name': VOLUME_NAME1}, names)
+        self.assertIn({'name': VOLUME_NAME2}, names)
+
+        body = self.run_async(self.acl.http.get_members(
+            '/volumes', ['name'], chunk_size=64))
+        self.assertEqual(body['members'], names)
+        self.assertEqual(body['total'], self.cl.getVolumes()['total'])
+
+        self.assertRaises(exceptions.HTTPNotFound, self.run_async,
+                          collect('/hosts/UnitTestNonExistHost'))
+
+        self.printFooter('iter_members')
+
+    def test_7_retry_connect_errors(self):
+        self.printHeader('retry_connect_errors')
+
+        self.acl.http.retry_policy = retry.RetryPolicy(base_delay=0.01,
+                                                       jitter=False)
+        session = self.acl.http._get_session()
+        request = session.request
+        errors = [aiohttp.ClientConnectorError(
+            mock.Mock(), OSError(111, 'Connection refused'))]
+
+        async def fail_once(*args, **kwargs):
+            if errors:
+                raise errors.pop()
+            return await request(*args, **kwargs)
+
+        # The POST never reached the array, so it is sent again.
+        with mock.patch.object(session, 'request', side_effect=fail_once):
+            self.run_async(self.acl.createVolume(VOLUME_NAME1, CPG_NAME1,
+                                                 1024, {'tpvv': True}))
+        self.assertEqual(self.acl.http.get_retry_stats()['retries'], 1)
+        self.assertEqual(self.cl.getVolume(VOLUME_NAME1)['name'],
+                         VOLUME_NAME1)
+
+        # It may have reached the array once the connection drops.
+        errors.append(aiohttp.ServerDisconnectedError())
+        with mock.patch.object(session, 'request', side_effect=fail_once):
+            self.assertRaises(exceptions.RequestException, self.run_async,
+                              self.acl.createVolume(VOLUME_NAME2, CPG_NAME1,
+                                                    1024, {'tpvv': True}))
+        self.assertRaises(exceptions.HTTPNotFound, self.cl.getVolume,
+                          VOLUME_NAME2)
+
+        self.printFooter('retry_connect_errors')
+
+    def test_8_copy_volume_primera_error(self):
+        self.printHeader('copy_volume_primera_error')
+
+        self.acl.primera_supported = True
+        error = exceptions.HTTPBadRequest(
+            {'code': 78, 'ref': 'tpvv,reduce',
+             'desc': 'invalid input: one of the parameters is required'})
+        with mock.patch.object(self.acl, '_post', side_effect=error), \
+                self.assertRaises(exceptions.HTTPBadRequest) as cm:
+            self.run_async(self.acl.copyVolume(
+                VOLUME_NAME1, VOLUME_NAME2, CPG_NAME1,
+                {'online': True, 'tpvv': False}))
+        self.assertEqual(cm.exception.get_description(),
+                         "invalid input: Either tpvv must be true OR for "
+                         "compressed and deduplicated volumes both "
+                         "'compression' and 'tdvv' must be specified as "
+                         "true.")
+
+        self.printFooter('copy_volume_primera_error')
@@ -0,0 +1,169 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client concurrent batches."""
+
+import threading
+import time
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import batch
+from hpe3parclient import exceptions
+from hpe3parclient import tracing
+
+CPG_NAME1 = 'BATCH_CPG1_' + hpe3parbase.TIME
+VOLUME_PREFIX = 'BATCH_VOL_' + hpe3parbase.TIME + '_'
+
+
+class FakeClient(object):
+
+    delay = 0.1
+    tracer = None
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def createVolume(self, name, cpg, size, optional=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        # Finish out of order.
+        time.sleep(self.delay / size)
+        with self.lock:
+            self.in_flight -= 1
+        if name == 'bad':
+            raise exceptions.HTTPConflict()
+        return name, cpg, optional
+
+    @tracing.traced
+    def getVolume(self, name):
+        return name
+
+
+class BatchTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+
+    def test_submission_order(self):
+        with batch.Batch(self.client, max_workers=4) as vols:
+            first = vols.createVolume('vol0', 'CPG1', 1)
+            for i in range(1, 8):
+                vols.createVolume('vol%d' % i, 'CPG1', i + 1,
+                                  optional={'tpvv': True})
+            vols.createVolume('bad', 'CPG1', 1)
+
+        self.assertEqual(first.get(), ('vol0', 'CPG1', None))
+        self.assertEqual([result.args[0] for result in vols.results],
+                         ['vol%d' % i for i in range(8)] + ['bad'])
+        self.assertEqual(vols.results[3].value,
+                         ('vol3', 'CPG1', {'tpvv': True}))
+        self.assertTrue(all(result.ok for result in vols.results[:8]))
+        self.assertRaises(exceptions.HTTPConflict, vols.results[8].get)
+        self.assertEqual(self.client.max_in_flight, 4)
+
+    def test_run_twice(self):
+        vols = batch.Batch(self.client)
+        pending = vols.submit('createVolume', 'vol1', 'CPG1', 1)
+        self.assertFalse(pending.ok)
+        self.assertRaises(RuntimeError, pending.get)
+        self.assertEqual(vols.run(), [pending])
+
+        vols.createVolume('vol2', 'CPG1', 1)
+        self.assertEqual([result.args[0] for result in vols.run()],
+                         ['vol2'])
+        self.assertEqual(len(vols.results), 2)
+        self.assertEqual(vols.run(), [])
+
+    def test_unknown_method(self):
+        vols = batch.Batch(self.client)
+        self.assertRaises(AttributeError, getattr, vols, 'createVolumes')
+        self.assertRaises(AttributeError, vols.submit, 'createVolumes')
+        self.assertRaises(AttributeError, getattr, vols, '_run')
+
+    def test_not_run_on_error(self):
+        def queue_and_fail():
+            with batch.Batch(self.client) as vols:
+                vols.createVolume('vol1', 'CPG1', 1)
+                raise ValueError()
+            return vols
+
+        self.assertRaises(ValueError, queue_and_fail)
+        self.assertEqual(self.client.max_in_flight, 0)
+
+    def test_tracing_context(self):
+        exporter = tracing.InMemoryExporter()
+        self.client.tracer = tracing.Tracer(exporter)
+        with self.client.tracer.start_span('provision') as parent:
+            with batch.Batch(self.client) as vols:
+                vols.getVolume('vol1')
+                vols.getVolume('vol2')
+
+        if tracing.contextvars is not None:
+            self.assertEqual(
+                [span.name for span in exporter.get_children(parent)],
+                ['getVolume', 'getVolume'])
+
+
+class HPE3ParClientBatchTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientBatchTestCase, self).setUp()
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+
+    def tearDown(self):
+        for i in range(10):
+            try:
+                self.cl.deleteVolume(VOLUME_PREFIX + str(i))
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        super(HPE3ParClientBatchTestCase, self).tearDown()
+
+    def test_create_get_delete(self):
+        self.printHeader('create_get_delete')
+
+        names = [VOLUME_PREFIX + str(i) for i in range(10)]
+        with self.cl.batch(max_workers=4) as vols:
+            for name in names:
+                vols.createVolume(name, CPG_NAME1, 1024)
+            vols.createVolume('X' * 32, CPG_NAME1, 1024)
+        self.assertTrue(all(result.ok for result in vols.results[:10]))
+        self.assertIsInstance(vols.results[10].error,
+                              exceptions.HTTPBadRequest)
+
+        with self.cl.batch(max_workers=4) as vols:
+            for name in names:
+                vols.getVolume(name)
+        self.assertEqual([result.get()['name'] for result in vols.results],
+                         names)
+
+        with self.cl.batch(max_workers=4) as vols:
+            for name in names:
+                vols.deleteVolume(name)
+        self.assertTrue(all(result.ok for result in vols.results))
+        self.assertRaises(exceptions.HTTPNotFound, self.cl.getVolume,
+                          names[0])
+
+        self.printFooter('create_get_delete')
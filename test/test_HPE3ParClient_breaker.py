@@ -0,0 +1,169 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client circuit breaking."""
+
+import asyncio
+import mock
+import requests
+import time
+import unittest
+
+from hpe3parclient import aio_http
+from hpe3parclient import breaker
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import retry
+
+URL = 'https://array:8080/api/v1'
+# Nothing listens on port 1, connections are refused at once.
+UNREACHABLE_URL = 'http://127.0.0.1:1/api/v1'
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def _trip(self, circuit):
+        for i in range(circuit.failure_threshold):
+            circuit.allow_request()
+            circuit.record_failure()
+
+    def test_trip_on_consecutive_failures(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=3)
+        circuit.record_failure()
+        circuit.record_failure()
+        # A response in between starts the count over.
+        circuit.record_success()
+        circuit.record_failure()
+        circuit.record_failure()
+        self.assertEqual(circuit.state, breaker.CircuitBreaker.CLOSED)
+
+        circuit.record_failure()
+        self.assertEqual(circuit.state, breaker.CircuitBreaker.OPEN)
+        self.assertRaises(exceptions.CircuitOpen, circuit.allow_request)
+
+        stats = circuit.get_stats()
+        self.assertEqual(stats['state'], 'open')
+        self.assertEqual(stats['trips'], 1)
+        self.assertEqual(stats['rejected'], 1)
+        self.assertIsNotNone(stats['opened_at'])
+
+    def test_single_probe(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=1,
+                                         reset_timeout=30)
+        self._trip(circuit)
+
+        with mock.patch('time.time', return_value=time.time() + 31):
+            self.assertEqual(circuit.state, breaker.CircuitBreaker.HALF_OPEN)
+            circuit.allow_request()
+            # Only the probe goes through.
+            self.assertRaises(exceptions.CircuitOpen, circuit.allow_request)
+            circuit.record_success()
+            self.assertEqual(circuit.state, breaker.CircuitBreaker.CLOSED)
+            circuit.allow_request()
+
+    def test_failed_probe(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=1,
+                                         reset_timeout=30)
+        self._trip(circuit)
+
+        now = time.time() + 31
+        with mock.patch('time.time', return_value=now):
+            circuit.allow_request()
+            circuit.record_failure()
+            self.assertEqual(circuit.state, breaker.CircuitBreaker.OPEN)
+        self.assertEqual(circuit.get_stats()['trips'], 2)
+
+        # A probe that never reports back lets another one through later.
+        with mock.patch('time.time', return_value=now + 31):
+            circuit.allow_request()
+        with mock.patch('time.time', return_value=now + 62):
+            circuit.allow_request()
+
+    def test_http_client(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=3)
+        cl = http.HTTPJSONRESTClient(
+            URL, circuit_breaker=circuit,
+            retry_policy=retry.RetryPolicy(tries=5, base_delay=0))
+        session_request = mock.Mock(
+            side_effect=requests.exceptions.ConnectionError)
+
+        with mock.patch.object(cl.session, 'request', session_request):
+            # The retries stop as soon as the breaker opens.
+            self.assertRaises(exceptions.CircuitOpen, cl.get, '/volumes')
+            self.assertEqual(session_request.call_count, 3)
+
+            self.assertRaises(exceptions.CircuitOpen, cl.get, '/volumes')
+            self.assertEqual(session_request.call_count, 3)
+        self.assertEqual(circuit.get_stats()['rejected'], 2)
+
+    def test_http_timeout(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=2)
+        cl = http.HTTPJSONRESTClient(URL, circuit_breaker=circuit)
+        session_request = mock.Mock(
+            side_effect=requests.exceptions.ReadTimeout)
+
+        with mock.patch.object(cl.session, 'request', session_request):
+            self.assertRaises(exceptions.Timeout, cl.get, '/volumes')
+            self.assertRaises(exceptions.Timeout, cl.get, '/volumes')
+            self.assertRaises(exceptions.CircuitOpen, cl.get, '/volumes')
+
+    def test_http_responses_close(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=2)
+        circuit.record_failure()
+        cl = http.HTTPJSONRESTClient(URL, circuit_breaker=circuit)
+        response = mock.Mock(status_code=404,
+                             headers=requests.structures.CaseInsensitiveDict(),
+                             content=b'{}', url=URL + '/volumes/vol1')
+
+        # An error response still means the array is reachable.
+        with mock.patch.object(cl.session, 'request',
+                               mock.Mock(return_value=response)):
+            self.assertRaises(exceptions.HTTPNotFound, cl.get,
+                              '/volumes/vol1')
+        self.assertEqual(circuit.get_stats()['failures'], 0)
+
+    def test_unreachable_array(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=2)
+        cl = http.HTTPJSONRESTClient(
+            UNREACHABLE_URL, circuit_breaker=circuit,
+            retry_policy=retry.RetryPolicy(tries=1))
+
+        self.assertRaises(requests.exceptions.ConnectionError, cl.get,
+                          '/cpgs')
+        self.assertRaises(requests.exceptions.ConnectionError, cl.get,
+                          '/cpgs')
+        self.assertRaises(exceptions.CircuitOpen, cl.get, '/cpgs')
+
+    def test_async_unreachable_array(self):
+        circuit = breaker.CircuitBreaker(failure_threshold=2)
+
+        async def run():
+            cl = aio_http.AsyncHTTPJSONRESTClient(
+                UNREACHABLE_URL, circuit_breaker=circuit,
+                retry_policy=retry.RetryPolicy(tries=1))
+            try:
+                for i in range(2):
+                    with self.assertRaises(exceptions.RequestException):
+                        await cl.get('/cpgs')
+                with self.assertRaises(exceptions.CircuitOpen):
+                    await cl.get('/cpgs')
+            finally:
+                await cl.close()
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(circuit.get_stats()['trips'], 1)
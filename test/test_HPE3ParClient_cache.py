@@ -0,0 +1,218 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client GET response caching."""
+
+import mock
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import cache
+from hpe3parclient import client
+from hpe3parclient import exceptions
+
+VOLUME_NAME1 = 'CACHE_VOL1_' + hpe3parbase.TIME
+CPG_NAME1 = 'CACHE_CPG1_' + hpe3parbase.TIME
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def test_ttl(self):
+        response_cache = cache.ResponseCache(ttl=10)
+        response_cache.put('/volumes/vol1', {}, {'name': 'vol1'})
+
+        self.assertEqual(response_cache.get('/volumes/vol1'),
+                         ({}, {'name': 'vol1'}))
+        with mock.patch('time.time', return_value=2 ** 40):
+            self.assertIsNone(response_cache.get('/volumes/vol1'))
+
+        stats = response_cache.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['expired'], 1)
+        self.assertEqual(stats['entries'], 0)
+
+    def test_copies(self):
+        response_cache = cache.ResponseCache()
+        response_cache.put('/volumes/vol1', {}, {'name': 'vol1'})
+        resp, body = response_cache.get('/volumes/vol1')
+        body['name'] = 'changed'
+        self.assertEqual(response_cache.get('/volumes/vol1')[1]['name'],
+                         'vol1')
+
+    def test_size_bound_per_collection(self):
+        response_cache = cache.ResponseCache(
+            max_entries=2, collections={'hosts': {'max_entries': 1}})
+        for name in ('vol1', 'vol2', 'vol3'):
+            response_cache.put('/volumes/%s' % name, {}, name)
+        response_cache.put('/hosts/host1', {}, 'host1')
+        response_cache.put('/hosts/host2', {}, 'host2')
+
+        # The least recently used entries went first.
+        self.assertIsNone(response_cache.get('/volumes/vol1'))
+        self.assertIsNotNone(response_cache.get('/volumes/vol3'))
+        self.assertIsNone(response_cache.get('/hosts/host1'))
+        self.assertIsNotNone(response_cache.get('/hosts/host2'))
+        self.assertEqual(response_cache.get_stats()['evictions'], 2)
+
+    def test_disabled_collections(self):
+        response_cache = cache.ResponseCache()
+        response_cache.put('/tasks/1', {}, {'status': 2})
+        self.assertIsNone(response_cache.get('/tasks/1'))
+
+    def test_invalidate(self):
+        response_cache = cache.ResponseCache()
+        for url in ('/volumes', '/volumes?query="x"', '/volumes/vol1',
+                    '/volumes/vol1/objectKeyValues/key', '/volumes/vol2',
+                    '/hosts/vol1'):
+            response_cache.put(url, {}, url)
+
+        response_cache.invalidate('/volumes/vol1')
+
+        for url in ('/volumes', '/volumes?query="x"', '/volumes/vol1',
+                    '/volumes/vol1/objectKeyValues/key'):
+            self.assertIsNone(response_cache.get(url))
+        for url in ('/volumes/vol2', '/hosts/vol1'):
+            self.assertIsNotNone(response_cache.get(url))
+
+    def test_invalidate_affected_collections(self):
+        response_cache = cache.ResponseCache()
+        urls = ('/hosts', '/hosts/host1', '/volumes/vol1',
+                '/volumesets/set1', '/hostsets/set1', '/vluns',
+                '/cpgs/cpg1')
+        for url in urls:
+            response_cache.put(url, {}, url)
+
+        # createVLUN and deleteVLUN.
+        response_cache.invalidate('/vluns')
+        for url in ('/hosts', '/hosts/host1', '/volumes/vol1', '/vluns'):
+            self.assertIsNone(response_cache.get(url))
+        for url in ('/volumesets/set1', '/hostsets/set1', '/cpgs/cpg1'):
+            self.assertIsNotNone(response_cache.get(url))
+
+        for url in urls:
+            response_cache.put(url, {}, url)
+
+        # deleteVolume.
+        response_cache.invalidate('/volumes/vol1')
+        for url in ('/volumes/vol1', '/volumesets/set1', '/vluns',
+                    '/cpgs/cpg1'):
+            self.assertIsNone(response_cache.get(url))
+        for url in ('/hosts', '/hosts/host1', '/hostsets/set1'):
+            self.assertIsNotNone(response_cache.get(url))
+
+        # deleteHost.
+        response_cache.invalidate('/hosts/host1')
+        for url in ('/hosts', '/hosts/host1', '/hostsets/set1'):
+            self.assertIsNone(response_cache.get(url))
+
+
+    def test_put_after_invalidate(self):
+        response_cache = cache.ResponseCache()
+        generation = response_cache.get_generation('/volumes/vol1')
+        host_generation = response_cache.get_generation('/hosts/host1')
+
+        # A VLUN was created while the GETs were in flight.
+        response_cache.invalidate('/vluns')
+        response_cache.put('/volumes/vol1', {}, 'vol1', generation)
+        self.assertIsNone(response_cache.get('/volumes/vol1'))
+        response_cache.put('/cpgs/cpg1', {}, 'cpg1',
+                           response_cache.get_generation('/cpgs/cpg1'))
+        self.assertIsNotNone(response_cache.get('/cpgs/cpg1'))
+        response_cache.put('/hosts/host1', {}, 'host1', host_generation)
+        self.assertIsNone(response_cache.get('/hosts/host1'))
+        self.assertEqual(response_cache.get_stats()['stale'], 2)
+
+        response_cache.put('/volumes/vol1', {}, 'vol1',
+                           response_cache.get_generation('/volumes/vol1'))
+        self.assertIsNotNone(response_cache.get('/volumes/vol1'))
+
+
+class HPE3ParClientCacheTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientCacheTestCase, self).setUp()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.ccl = client.HPE3ParClient(
+            url, response_cache=cache.ResponseCache(ttl=60))
+        self.ccl.login(self.user, self.password)
+
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+
+    def tearDown(self):
+        try:
+            self.cl.deleteVolume(VOLUME_NAME1)
+        except Exception:
+            pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        self.ccl.logout()
+        super(HPE3ParClientCacheTestCase, self).tearDown()
+
+    def test_get_volume_cached_until_write(self):
+        self.printHeader('get_volume_cached_until_write')
+
+        self.ccl.createVolume(VOLUME_NAME1, CPG_NAME1, 1024, {'tpvv': True})
+        vol = self.ccl.getVolume(VOLUME_NAME1)
+        self.assertEqual(self.ccl.getVolume(VOLUME_NAME1), vol)
+        self.assertEqual(self.ccl.http.get_cache_stats()['hits'], 1)
+
+        # A grow through the same client is seen at once.
+        self.ccl.growVolume(VOLUME_NAME1, 1024)
+        vol = self.ccl.getVolume(VOLUME_NAME1)
+        self.assertEqual(vol['sizeMiB'], 2048)
+
+        self.ccl.deleteVolume(VOLUME_NAME1)
+        self.assertRaises(exceptions.HTTPNotFound, self.ccl.getVolume,
+                          VOLUME_NAME1)
+
+        self.printFooter('get_volume_cached_until_write')
+
+    def test_get_overtaken_by_write(self):
+        self.printHeader('get_overtaken_by_write')
+
+        self.ccl.createVolume(VOLUME_NAME1, CPG_NAME1, 1024, {'tpvv': True})
+        time_request = self.ccl.http._time_request
+        grown = []
+
+        def grow_during_get(url, method, **kwargs):
+            resp, body = time_request(url, method, **kwargs)
+            if method == 'GET' and not grown:
+                grown.append(True)
+                self.ccl.growVolume(VOLUME_NAME1, 1024)
+            return resp, body
+
+        # The GET answers with the size from before the grow, which must
+        # not stay cached.
+        with mock.patch.object(self.ccl.http, '_time_request',
+                               side_effect=grow_during_get):
+            vol = self.ccl.getVolume(VOLUME_NAME1)
+        self.assertEqual(vol['sizeMiB'], 1024)
+        self.assertEqual(self.ccl.getVolume(VOLUME_NAME1)['sizeMiB'], 2048)
+        self.assertEqual(self.ccl.http.get_cache_stats()['stale'], 1)
+
+        self.printFooter('get_overtaken_by_write')
+
+    def test_no_cache_by_default(self):
+        self.printHeader('no_cache_by_default')
+
+        self.assertIsNone(self.cl.http.get_cache_stats())
+
+        self.printFooter('no_cache_by_default')
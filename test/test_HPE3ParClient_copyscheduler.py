@@ -0,0 +1,234 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client copy scheduler."""
+
+import mock
+import threading
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import copyscheduler
+from hpe3parclient import exceptions
+from hpe3parclient import taskwatcher
+
+
+class FakeClient(object):
+
+    def __init__(self):
+        # Destination name to the future of its copy task.
+        self.copies = {}
+        self.started = []
+        self.threads = []
+
+    def getVolume(self, name):
+        return {'name': name, 'sizeMiB': 1024}
+
+    def copyVolumeAsync(self, src_name, dest_name, dest_cpg, optional=None,
+                        timeout=None, callback=None):
+        if src_name == 'missing':
+            raise exceptions.HTTPNotFound({'code': 'NON_EXISTENT_VOL'})
+        future = taskwatcher.TaskFuture(len(self.started) + 1,
+                                        canceller=self.cancel)
+        future.add_done_callback(callback)
+        self.copies[dest_name] = future
+        self.started.append((dest_name, dest_cpg, optional))
+        self.threads.append(threading.current_thread())
+        return future
+
+    def finish(self, dest_name, status=taskwatcher.DONE):
+        error = None
+        if status == taskwatcher.FAILED:
+            error = exceptions.TaskFailed()
+        self.copies[dest_name]._resolve({'status': status}, error)
+
+    def cancel(self, task_id):
+        for future in self.copies.values():
+            if future.task_id == task_id:
+                future._resolve({'status': taskwatcher.CANCELLED},
+                                exceptions.TaskCancelled())
+
+
+class CopySchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeClient()
+        self.scheduler = copyscheduler.CopyScheduler(
+            self.client, max_active=3, max_per_cpg=2)
+
+    def started(self):
+        return [dest_name for dest_name, cpg, optional in self.client.started]
+
+    def settle(self):
+        # The next copies are started from a thread of the scheduler.
+        starter = self.scheduler._starter
+        if starter is not None:
+            starter.join(5)
+
+    def finish(self, dest_name, status=taskwatcher.DONE):
+        self.client.finish(dest_name, status)
+        self.settle()
+
+    def test_limits(self):
+        jobs = [self.scheduler.submit('vol%d' % i, 'clone%d' % i,
+                                      'CPG%d' % (i % 2))
+                for i in range(6)]
+        self.assertEqual(self.started(), ['clone0', 'clone1', 'clone2'])
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats['queued'], 3)
+        self.assertEqual(stats['active_per_cpg'], {'CPG0': 2, 'CPG1': 1})
+
+        # CPG0 is full, so the next copy into CPG1 is started.
+        self.finish('clone1')
+        self.assertEqual(self.started()[3:], ['clone3'])
+        self.finish('clone0')
+        self.assertEqual(self.started()[4:], ['clone4'])
+
+        for job in jobs:
+            if job.name in self.client.copies:
+                self.finish(job.name)
+        self.finish('clone5')
+        self.assertTrue(self.scheduler.wait(5))
+        for job in jobs:
+            self.assertEqual(job.result(0), {'status': taskwatcher.DONE})
+
+        stats = self.scheduler.get_stats()
+        self.assertEqual(stats['completed'], 6)
+        self.assertEqual(stats['mib_copied'], 6 * 1024)
+        self.assertEqual(stats['active'], 0)
+        self.assertTrue(stats['mib_per_sec'] > 0)
+
+    def test_priority(self):
+        self.scheduler.max_active = 1
+        self.scheduler.submit('vol0', 'clone0', 'CPG1')
+        self.scheduler.submit('vol1', 'clone1', 'CPG1',
+                              priority=self.scheduler.TASK_PRIORITY_LOW)
+        self.scheduler.submit('vol2', 'clone2', 'CPG1')
+        high = self.scheduler.submit(
+            'vol3', 'clone3', 'CPG1',
+            priority=self.scheduler.TASK_PRIORITY_HIGH)
+        online = self.scheduler.submit(
+            'vol4', 'clone4', 'CPG1', {'online': True},
+            priority=self.scheduler.TASK_PRIORITY_HIGH)
+        for name in ('clone0', 'clone3', 'clone4', 'clone2'):
+            self.finish(name)
+        self.assertEqual(self.started(),
+                         ['clone0', 'clone3', 'clone4', 'clone2', 'clone1'])
+
+        # The priority is the task priority of an offline copy.
+        self.assertEqual(high.optional, {'priority': 1})
+        self.assertEqual(online.optional, {'online': True})
+        self.assertEqual(
+            self.scheduler.submit('vol5', 'clone5', 'CPG2',
+                                  {'priority': 3}).priority, 3)
+
+    def test_start_thread(self):
+        self.scheduler.max_active = 1
+        self.scheduler.submit('vol0', 'clone0', 'CPG1')
+        self.scheduler.submit('vol1', 'clone1', 'CPG1')
+        self.assertEqual(self.client.threads, [threading.current_thread()])
+
+        # The task watcher thread that finishes a copy does not start the
+        # next one, so its poll never waits on the requests to the array.
+        watcher = threading.Thread(target=self.client.finish,
+                                   args=('clone0',))
+        watcher.start()
+        watcher.join(5)
+        self.settle()
+        self.assertEqual(self.started(), ['clone0', 'clone1'])
+        self.assertNotIn(self.client.threads[1],
+                         (watcher, threading.current_thread()))
+        self.finish('clone1')
+        self.assertTrue(self.scheduler.wait(5))
+
+    def test_wait_resolved(self):
+        resolving = threading.Event()
+        release = threading.Event()
+
+        def callback(job):
+            resolving.set()
+            release.wait(5)
+
+        job = self.scheduler.submit('vol0', 'clone0', 'CPG1',
+                                    callback=callback)
+        watcher = threading.Thread(target=self.client.finish,
+                                   args=('clone0',))
+        watcher.start()
+        self.assertTrue(resolving.wait(5))
+        # The job is over, but wait() only returns once it is resolved.
+        self.assertFalse(self.scheduler.wait(0.01))
+        release.set()
+        self.assertTrue(self.scheduler.wait(5))
+        self.assertTrue(job.done())
+        watcher.join(5)
+
+    def test_failures(self):
+        done = []
+        failed = self.scheduler.submit('vol0', 'clone0', 'CPG1',
+                                       callback=done.append)
+        missing = self.scheduler.submit('missing', 'clone1', 'CPG1')
+        self.assertRaises(exceptions.HTTPNotFound, missing.result, 0)
+        self.finish('clone0', taskwatcher.FAILED)
+        self.assertRaises(exceptions.TaskFailed, failed.result, 0)
+        self.assertEqual(done, [failed])
+        stats = self.scheduler.get_stats()
+        self.assertEqual((stats['failed'], stats['mib_copied']), (2, 0))
+
+    def test_cancel(self):
+        self.scheduler.max_active = 1
+        active = self.scheduler.submit('vol0', 'clone0', 'CPG1', size_mib=8)
+        queued = self.scheduler.submit('vol1', 'clone1', 'CPG1')
+        self.assertTrue(queued.cancel())
+        self.assertRaises(exceptions.TaskCancelled, queued.result, 0)
+        self.assertFalse(self.scheduler.wait(0.01))
+
+        active.copy.task = {'completedSteps': 1, 'totalSteps': 4}
+        self.assertEqual(active.progress, 0.25)
+        self.assertTrue(active.cancel())
+        self.assertRaises(exceptions.TaskCancelled, active.result, 0)
+        self.assertFalse(active.cancel())
+        self.assertTrue(self.scheduler.wait(0))
+        self.assertEqual(self.started(), ['clone0'])
+
+
+class HPE3ParClientCopySchedulerTestCase(
+        hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientCopySchedulerTestCase, self).setUp()
+        self.cl.task_watcher.min_interval = 0.01
+
+    def test_copy_scheduler(self):
+        self.printHeader('copy_scheduler')
+
+        task = self.cl.getAllTasks()['members'][0]
+        scheduler = self.cl.copyScheduler(max_active=2, max_per_cpg=1)
+        with mock.patch.object(self.cl.http, 'post',
+                               return_value=({}, {'taskid': task['id']})) \
+                as post:
+            jobs = [scheduler.submit('vol%d' % i, 'clone%d' % i, 'CPG1',
+                                     priority=self.cl.TASK_PRIORITY_LOW,
+                                     size_mib=256)
+                    for i in range(3)]
+            self.assertTrue(scheduler.wait(5))
+        self.assertEqual(post.call_count, 3)
+        body = post.call_args[1]['body']
+        self.assertEqual(body['parameters']['priority'],
+                         self.cl.TASK_PRIORITY_LOW)
+        for job in jobs:
+            self.assertEqual(job.result(0)['id'], task['id'])
+        self.assertEqual(scheduler.get_stats()['mib_copied'], 768)
+
+        self.printFooter('copy_scheduler')
@@ -0,0 +1,180 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client fleet fan-out."""
+
+import threading
+import time
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+from hpe3parclient import fleet
+
+
+class FakeClient(object):
+    """Stands in for HPE3ParClient, every call takes delay seconds."""
+
+    delay = 0.2
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, api_url, **kwargs):
+        if 'down' in api_url:
+            raise exceptions.UnsupportedVersion("Unreachable")
+        self.api_url = api_url
+        self.kwargs = kwargs
+        self.logged_in = False
+
+    def _call(self):
+        cls = FakeClient
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(self.delay)
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def login(self, username, password):
+        self._call()
+        if password != 'pass':
+            raise exceptions.HTTPForbidden()
+        self.logged_in = True
+
+    def logout(self):
+        self.logged_in = False
+
+    def getVolume(self, name):
+        self._call()
+        if 'bad' in self.api_url:
+            raise exceptions.HTTPNotFound()
+        return {'name': name, 'array': self.api_url}
+
+
+class HPE3ParFleetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        FakeClient.max_in_flight = 0
+        self.fleet = fleet.HPE3ParFleet(max_workers=4,
+                                        client_class=FakeClient)
+        for i in range(4):
+            self.fleet.add_array('array%d' % i, 'https://array%d' % i,
+                                 'user', 'pass', secure=True)
+
+    def test_parallel(self):
+        start = time.time()
+        results = self.fleet.login()
+        self.assertLess(time.time() - start, 4 * FakeClient.delay)
+        self.assertTrue(all(result.ok for result in results.values()))
+        self.assertEqual(self.fleet.get_client('array1').kwargs,
+                         {'secure': True})
+
+        start = time.time()
+        results = self.fleet.run('getVolume', 'vol1')
+        self.assertLess(time.time() - start, 4 * FakeClient.delay)
+        self.assertEqual(sorted(results), self.fleet.names)
+        self.assertEqual(results['array2'].get(),
+                         {'name': 'vol1', 'array': 'https://array2'})
+        self.assertGreaterEqual(results['array2'].duration, FakeClient.delay)
+
+    def test_max_workers(self):
+        self.fleet.max_workers = 2
+        self.fleet.login()
+        self.assertEqual(FakeClient.max_in_flight, 2)
+
+    def test_errors_per_array(self):
+        self.fleet.add_array('down', 'https://down', 'user', 'pass')
+        self.fleet.add_array('bad', 'https://bad', 'user', 'pass')
+        self.fleet.add_array('wrong', 'https://wrong', 'user', 'wrong')
+
+        results = self.fleet.login()
+        self.assertIsInstance(results['down'].error,
+                              exceptions.UnsupportedVersion)
+        self.assertIsInstance(results['wrong'].error,
+                              exceptions.HTTPForbidden)
+        self.assertTrue(results['bad'].ok)
+
+        results = self.fleet.run(lambda cl: cl.getVolume('vol1')['name'])
+        self.assertEqual(len(results), 7)
+        self.assertEqual(results['array0'].value, 'vol1')
+        self.assertRaises(exceptions.HTTPNotFound, results['bad'].get)
+        self.assertIsInstance(results['down'].error,
+                              exceptions.AuthorizationFailure)
+
+        # Keyword arguments do not change the error.
+        results = self.fleet.run('getVolume', name='vol1')
+        self.assertEqual(results['array0'].value['name'], 'vol1')
+        self.assertIsInstance(results['down'].error,
+                              exceptions.AuthorizationFailure)
+
+        # A typo fails the call, not every array.
+        self.assertRaises(ValueError, self.fleet.run, 'getVolumee', 'vol1')
+
+        # Only the arrays not logged in are tried again.
+        results = self.fleet.login()
+        self.assertEqual(sorted(results), ['down', 'wrong'])
+
+    def test_add_remove(self):
+        existing = FakeClient('https://existing')
+        existing.logged_in = True
+        self.fleet.add_client('existing', existing)
+        self.assertRaises(ValueError, self.fleet.add_array,
+                          'existing', 'https://other', 'user', 'pass')
+        self.assertRaises(ValueError, self.fleet.add_client, 'array0',
+                          existing)
+        self.assertNotIn('existing', self.fleet.login())
+        self.assertIs(self.fleet.get_client('existing'), existing)
+
+        self.fleet.remove_array('array0')
+        self.assertEqual(self.fleet.names,
+                         ['array1', 'array2', 'array3', 'existing'])
+        self.assertNotIn('array0', self.fleet.run('getVolume', 'vol1'))
+
+        self.fleet.logout()
+        self.assertIsNone(self.fleet.get_client('array1'))
+        self.assertFalse(existing.logged_in)
+
+
+class HPE3ParClientFleetTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def test_sweep(self):
+        self.printHeader('sweep')
+
+        url = self.flask_url if self.unitTest else self.url_3par
+        arrays = fleet.HPE3ParFleet()
+        arrays.add_array('array1', url, self.user, self.password)
+        arrays.add_array('array2', url, self.user, self.password)
+        arrays.add_array('wrong', url, self.user, 'wrong password')
+
+        results = arrays.login()
+        self.assertTrue(results['array1'].ok)
+        self.assertIsInstance(results['wrong'].error,
+                              exceptions.HTTPForbidden)
+
+        results = arrays.run('getCPGs')
+        self.assertEqual(results['array1'].value['total'],
+                         self.cl.getCPGs()['total'])
+        self.assertTrue(results['array2'].ok)
+        self.assertFalse(results['wrong'].ok)
+
+        results = arrays.run('getVolume', 'UnitTestNonExistVolume')
+        self.assertIsInstance(results['array1'].error,
+                              exceptions.HTTPNotFound)
+
+        results = arrays.logout()
+        self.assertEqual(sorted(results), ['array1', 'array2'])
+
+        self.printFooter('sweep')
@@ -0,0 +1,176 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client host initiator index."""
+
+import copy
+import mock
+import time
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import hostindex
+
+HOST_NAME1 = 'HOSTINDEX_HOST1_' + hpe3parbase.TIME
+HOST_NAME2 = 'HOSTINDEX_HOST2_' + hpe3parbase.TIME
+HOST_NAME3 = 'HOSTINDEX_HOST3_' + hpe3parbase.TIME
+WWN1 = '20:00:00:24:FF:4A:00:21'
+WWN2 = '20:00:00:24:FF:4A:00:22'
+IQN1 = 'iqn.1993-08.org.debian:01:hostindex'
+
+
+class FakeArray(object):
+
+    def __init__(self):
+        self.hosts = [
+            {'name': 'host1', 'FCPaths': [{'wwn': '1000000000000001'},
+                                          {'wwn': '1000000000000002'}]},
+            {'name': 'host2',
+             'iSCSIPaths': [{'name': 'iqn.1993-08.org.debian:01:aa'}]},
+            {'name': 'host3', 'FCPaths': [], 'iSCSIPaths': []}]
+        self.requests = 0
+
+    def get_hosts(self):
+        self.requests += 1
+        return {'total': len(self.hosts),
+                'members': copy.deepcopy(self.hosts)}
+
+    def get_host(self, name):
+        self.requests += 1
+        for host in self.hosts:
+            if host['name'] == name:
+                return copy.deepcopy(host)
+        raise exceptions.HTTPNotFound()
+
+
+class InitiatorIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.array = FakeArray()
+        self.index = hostindex.InitiatorIndex(self.array.get_hosts,
+                                              self.array.get_host, ttl=60)
+
+    def names(self, iqns=None, wwns=None):
+        return [host['name'] for host in
+                self.index.query(iqns=iqns, wwns=wwns)['members']]
+
+    def test_find(self):
+        self.assertEqual(self.index.find(wwn='10:00:00:00:00:00:00:02'),
+                         'host1')
+        self.assertEqual(self.index.find(wwn='1000000000000002'), 'host1')
+        self.assertEqual(self.index.find(iqn='IQN.1993-08.org.debian:01:AA'),
+                         'host2')
+        self.assertIsNone(self.index.find(wwn='1000000000000009'))
+        self.assertIsNone(self.index.find())
+        self.assertEqual(self.array.requests, 1)
+        self.assertEqual(self.index.get_stats(),
+                         {'built': True, 'builds': 1, 'hits': 4,
+                          'hosts': 3, 'wwns': 2, 'iqns': 1})
+
+    def test_query(self):
+        self.assertEqual(
+            self.names(iqns=['iqn.1993-08.org.debian:01:aa'],
+                       wwns=['1000000000000001', '1000000000000002',
+                             '1000000000000009']),
+            ['host1', 'host2'])
+        self.assertEqual(self.index.query(), {'total': 0, 'members': []})
+
+    def test_refresh(self):
+        self.index.find(wwn='1000000000000001')
+
+        self.array.hosts.append({'name': 'host4', 'FCPaths': [
+            {'wwn': '1000000000000004'}]})
+        self.index.refresh('host4')
+        self.array.hosts[0]['FCPaths'].pop()
+        self.array.hosts[0]['name'] = 'renamed'
+        self.index.refresh('host1', 'renamed')
+        self.assertEqual(self.index.find(wwn='1000000000000004'), 'host4')
+        self.assertEqual(self.index.find(wwn='1000000000000001'), 'renamed')
+        self.assertIsNone(self.index.find(wwn='1000000000000002'))
+
+        # A host that is gone is dropped, the paths move to the new host.
+        self.array.hosts.pop()
+        self.array.hosts[2]['FCPaths'] = [{'wwn': '1000000000000004'}]
+        self.index.refresh('host4')
+        self.index.refresh('host3')
+        self.assertEqual(self.index.find(wwn='1000000000000004'), 'host3')
+        self.index.discard('host2')
+        self.assertIsNone(
+            self.index.find(iqn='iqn.1993-08.org.debian:01:aa'))
+        self.assertEqual(self.index.builds, 1)
+
+    def test_ttl(self):
+        self.index.ttl = 0.05
+        self.index.find(wwn='1000000000000001')
+        self.array.hosts[2]['FCPaths'] = [{'wwn': '1000000000000003'}]
+        self.assertIsNone(self.index.find(wwn='1000000000000003'))
+        time.sleep(0.06)
+        self.assertEqual(self.index.find(wwn='1000000000000003'), 'host3')
+
+    def test_refresh_error(self):
+        self.index.find(wwn='1000000000000001')
+        self.index.get_host = mock.Mock(side_effect=exceptions.Timeout())
+        self.index.refresh('host1')
+        self.assertFalse(self.index.built)
+
+
+class HPE3ParClientHostIndexTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientHostIndexTestCase, self).setUp()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.icl = client.HPE3ParClient(url, host_index_ttl=300)
+        self.icl.login(self.user, self.password)
+
+    def tearDown(self):
+        for name in (HOST_NAME1, HOST_NAME2, HOST_NAME3):
+            try:
+                self.cl.deleteHost(name)
+            except Exception:
+                pass
+        self.icl.logout()
+        super(HPE3ParClientHostIndexTestCase, self).tearDown()
+
+    def test_find_host(self):
+        self.printHeader('find_host')
+
+        self.assertIsNone(self.icl.findHost(wwn=WWN1))
+        self.icl.createHost(HOST_NAME1, None, [WWN1, WWN2])
+        self.icl.createHost(HOST_NAME2, [IQN1])
+
+        with mock.patch.object(self.icl, '_run') as run:
+            with mock.patch.object(self.icl.http, 'get',
+                                   wraps=self.icl.http.get) as get:
+                self.assertEqual(self.icl.findHost(wwn=WWN2), HOST_NAME1)
+                self.assertEqual(self.icl.findHost(iqn=IQN1), HOST_NAME2)
+                hosts = self.icl.queryHost(iqns=[IQN1],
+                                           wwns=[WWN1.replace(':', '')])
+                self.assertEqual(get.call_count, 0)
+
+                self.icl.modifyHost(HOST_NAME1, {'newName': HOST_NAME3})
+                self.assertEqual(self.icl.findHost(wwn=WWN1), HOST_NAME3)
+                self.icl.deleteHost(HOST_NAME2)
+                self.assertIsNone(self.icl.findHost(iqn=IQN1))
+                self.assertEqual(get.call_count, 1)
+        self.assertFalse(run.called)
+
+        self.assertEqual(hosts['total'], 2)
+        self.assertEqual(sorted(host['name'] for host in hosts['members']),
+                         [HOST_NAME1, HOST_NAME2])
+        self.assertEqual(self.icl.host_index.builds, 1)
+
+        self.printFooter('find_host')
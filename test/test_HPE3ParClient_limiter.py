@@ -0,0 +1,169 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client adaptive concurrency limiting."""
+
+import mock
+import threading
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import limiter
+
+URL = 'https://array:8080/api/v1'
+ROUTE = 'GET /volumes/{name}'
+
+
+class AdaptiveLimiterTestCase(unittest.TestCase):
+
+    def test_decrease_on_overload(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=10)
+        lim.acquire()
+        lim.release(ROUTE, 0.01, overloaded=True)
+        self.assertEqual(lim.limit, 7)
+
+        # The same burst of 503s only cuts the limit once.
+        lim.acquire()
+        lim.release(ROUTE, 60, overloaded=True)
+        self.assertEqual(lim.limit, 7)
+
+        stats = lim.get_stats()
+        self.assertEqual(stats['overloads'], 2)
+        self.assertEqual(stats['decreases'], 1)
+        self.assertEqual(stats['in_flight'], 0)
+
+    def test_latency_spike(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=10, latency_tolerance=3)
+        for latency in (0.1, 0.2, 0.25):
+            lim.acquire()
+            lim.release(ROUTE, latency)
+        self.assertEqual(lim.get_stats()['overloads'], 0)
+
+        lim.acquire()
+        lim.release(ROUTE, 1.0)
+        self.assertEqual(lim.get_stats()['overloads'], 1)
+        self.assertEqual(lim.limit, 7)
+
+        # Other routes have their own usual latency.
+        lim.acquire()
+        lim.release('GET /system', 5.0)
+        self.assertEqual(lim.get_stats()['overloads'], 1)
+
+    def test_increase_when_saturated(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=2, max_limit=3)
+        # Not using the whole limit does not grow it.
+        for i in range(10):
+            lim.acquire()
+            lim.release(ROUTE, 0.01)
+        self.assertEqual(lim.limit, 2)
+
+        for i in range(10):
+            lim.acquire()
+            lim.acquire()
+            lim.release(ROUTE, 0.01)
+            lim.release(ROUTE, 0.01)
+        self.assertEqual(lim.limit, 3)
+
+    def test_queueing(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=1)
+        lim.acquire()
+        acquired = threading.Event()
+
+        def wait():
+            lim.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        self.assertEqual(lim.get_stats()['waiting'], 1)
+
+        lim.release(ROUTE, 0.01)
+        self.assertTrue(acquired.wait(10))
+        thread.join(10)
+        stats = lim.get_stats()
+        self.assertEqual(stats['queued'], 1)
+        self.assertEqual(stats['waiting'], 0)
+        self.assertEqual(stats['in_flight'], 1)
+        self.assertGreater(stats['wait_time'], 0)
+
+    def test_queue_timeout(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=1, queue_timeout=0.05)
+        lim.acquire()
+        self.assertRaises(exceptions.Timeout, lim.acquire)
+        stats = lim.get_stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['in_flight'], 1)
+        self.assertEqual(stats['waiting'], 0)
+
+    def test_http_client(self):
+        lim = limiter.AdaptiveLimiter(initial_limit=10)
+        cl = http.HTTPJSONRESTClient(URL, concurrency_limiter=lim)
+        resp = mock.Mock(status=200)
+
+        with mock.patch.object(cl, 'request', return_value=(resp, {})):
+            cl._time_request(URL + '/volumes/vol1', 'GET')
+        with mock.patch.object(cl, 'request',
+                               side_effect=exceptions.HTTPServiceUnavailable):
+            self.assertRaises(exceptions.HTTPServiceUnavailable,
+                              cl._time_request, URL + '/volumes/vol1', 'GET')
+        with mock.patch.object(cl, 'request', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, cl._time_request,
+                              URL + '/volumes/vol1', 'GET')
+
+        stats = lim.get_stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(stats['overloads'], 1)
+        self.assertEqual(lim.limit, 7)
+
+
+class HPE3ParClientLimiterTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def test_concurrent_calls(self):
+        self.printHeader('concurrent_calls')
+
+        lim = limiter.AdaptiveLimiter(initial_limit=2)
+        url = self.flask_url if self.unitTest else self.url_3par
+        # Every call goes to the array, rather than sharing GETs.
+        cl = client.HPE3ParClient(url, coalesce_gets=False,
+                                  concurrency_limiter=lim)
+        cl.login(self.user, self.password)
+        errors = []
+
+        def call():
+            try:
+                for i in range(3):
+                    cl.getCPGs()
+            except Exception as ex:
+                errors.append(ex)
+
+        threads = [threading.Thread(target=call) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+
+        self.assertEqual(errors, [])
+        stats = lim.get_stats()
+        self.assertGreaterEqual(stats['requests'], 12)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertEqual(stats['waiting'], 0)
+        cl.logout()
+
+        self.printFooter('concurrent_calls')
@@ -0,0 +1,146 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client request metrics."""
+
+import mock
+import unittest
+
+from hpe3parclient import metrics
+from hpe3parclient import ssh
+
+
+class HPE3ParClientMetricsTestCase(unittest.TestCase):
+
+    def test_normalize_route(self):
+        self.assertEqual(metrics.normalize_route('/volumes'), '/volumes')
+        self.assertEqual(metrics.normalize_route('/volumes/vol1'),
+                         '/volumes/{name}')
+        self.assertEqual(metrics.normalize_route('/tasks/12'),
+                         '/tasks/{id}')
+        self.assertEqual(metrics.normalize_route('/vluns?query="x EQ y"'),
+                         '/vluns')
+        self.assertEqual(
+            metrics.normalize_route('/remotecopygroups/rcg/volumes/vol1'),
+            '/remotecopygroups/{name}/volumes/{name}')
+
+    def test_histogram_percentiles(self):
+        histogram = metrics.LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+
+        for i in range(1, 101):
+            histogram.record(i / 1000.0, 200)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.max, 0.1)
+        self.assertAlmostEqual(histogram.percentile(50), 0.05, delta=0.005)
+        self.assertAlmostEqual(histogram.percentile(95), 0.095, delta=0.01)
+        self.assertAlmostEqual(histogram.percentile(99), 0.099, delta=0.01)
+        self.assertLessEqual(histogram.percentile(100), histogram.max)
+        self.assertEqual(histogram.get_stats()['statuses'], {200: 100})
+
+    def test_histogram_fixed_memory(self):
+        histogram = metrics.LatencyHistogram()
+        buckets = len(histogram.counts)
+        for i in range(10000):
+            histogram.record(i * 0.05)
+        self.assertEqual(len(histogram.counts), buckets)
+        self.assertEqual(histogram.counts[-1], 10000 - 2401)
+
+    def test_recorder(self):
+        recorder = metrics.LatencyRecorder()
+        recorder.record('GET', '/hosts/host1', 0.01, 200)
+        recorder.record('GET', '/hosts/host2', 0.02, 404)
+        recorder.record('DELETE', '/hosts/host2', 0.03, 200)
+
+        stats = recorder.get_stats()
+        self.assertEqual(sorted(stats.keys()),
+                         ['DELETE /hosts/{name}', 'GET /hosts/{name}'])
+        self.assertEqual(stats['GET /hosts/{name}']['statuses'],
+                         {200: 1, 404: 1})
+
+    def test_hooks(self):
+        hooks = metrics.MetricsHooks()
+        events = []
+
+        def broken(event, data):
+            raise ValueError("broken callback")
+
+        hooks.register(broken)
+        hooks.register(lambda event, data: events.append((event, data)))
+
+        # A failing callback does not stop the others, nor the caller.
+        hooks.emit(metrics.MetricsHooks.HTTP_REAUTH, method='GET',
+                   route='/volumes/{name}')
+        self.assertEqual(events, [(metrics.MetricsHooks.HTTP_REAUTH,
+                                   {'method': 'GET',
+                                    'route': '/volumes/{name}'})])
+
+        hooks.unregister(broken)
+        self.assertEqual(len(hooks.callbacks), 1)
+
+    def test_openmetrics_render(self):
+        collector = metrics.OpenMetricsCollector()
+        collector(metrics.MetricsHooks.HTTP_REQUEST,
+                  {'method': 'GET', 'route': '/volumes/{name}',
+                   'status': 200, 'latency': 0.02, 'retries': 1,
+                   'bytes_sent': 0, 'bytes_received': 512})
+        collector(metrics.MetricsHooks.HTTP_REAUTH,
+                  {'method': 'GET', 'route': '/volumes/{name}'})
+        collector(metrics.MetricsHooks.SSH_COMMAND,
+                  {'command': 'showport', 'latency': 0.7,
+                   'error': 'SSHException'})
+
+        text = collector.render()
+        lines = text.splitlines()
+        self.assertEqual(lines[-1], '# EOF')
+        self.assertIn('# TYPE hpe3parclient_http_requests counter', lines)
+        self.assertIn('hpe3parclient_http_requests_total{method="GET",'
+                      'route="/volumes/{name}",status="200"} 1', lines)
+        self.assertIn('hpe3parclient_http_retries_total{method="GET",'
+                      'route="/volumes/{name}"} 1', lines)
+        self.assertIn('hpe3parclient_http_response_bytes_total{method="GET",'
+                      'route="/volumes/{name}"} 512', lines)
+        self.assertIn('hpe3parclient_http_reauths_total 1', lines)
+        self.assertIn('hpe3parclient_ssh_commands_total{command="showport",'
+                      'result="error"} 1', lines)
+        self.assertIn('hpe3parclient_http_request_duration_seconds_bucket{'
+                      'method="GET",route="/volumes/{name}",le="0.025"} 1',
+                      lines)
+        self.assertIn('hpe3parclient_ssh_command_duration_seconds_bucket{'
+                      'command="showport",le="0.5"} 0', lines)
+        self.assertIn('hpe3parclient_ssh_command_duration_seconds_count{'
+                      'command="showport"} 1', lines)
+
+        collector.reset()
+        self.assertEqual(collector.render(), '# EOF\n')
+
+    def test_ssh_command_metrics(self):
+        with mock.patch.object(ssh.HPE3PARSSHClient, '_create_ssh'):
+            ssh_client = ssh.HPE3PARSSHClient('0.0.0.0', 'user', 'pass')
+        events = []
+        ssh_client.metrics.register(
+            lambda event, data: events.append((event, data)))
+
+        ssh_client._run_ssh = mock.Mock(return_value=(b'', b''))
+        ssh_client.run(['showport', '-iscsivlans'])
+        ssh_client._run_ssh.side_effect = ValueError
+        self.assertRaises(ValueError, ssh_client.run, ['showvv'])
+
+        self.assertEqual([(event, data['command'], data['error'])
+                          for event, data in events],
+                         [(metrics.MetricsHooks.SSH_COMMAND, 'showport',
+                           None),
+                          (metrics.MetricsHooks.SSH_COMMAND, 'showvv',
+                           'ValueError')])
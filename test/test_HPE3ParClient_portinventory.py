@@ -0,0 +1,179 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client port inventory."""
+
+import copy
+import mock
+import time
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import portinventory
+from hpe3parclient import showport_parser
+
+
+def iscsi_port(node, vlan):
+    return {'portPos': {'node': node, 'slot': 2, 'cardPort': 1},
+            'protocol': 2, 'linkState': 4, 'IPAddr': '0.0.0.0',
+            'iSCSIPortInfo': {'vlan': vlan, 'IPAddr': '0.0.0.0', 'mtu': 1500,
+                              'iSCSIName': 'iqn.2000-05.com.3pardata:%s' %
+                              node}}
+
+
+PORTS = {'total': 4, 'members': [
+    iscsi_port(0, 1),
+    iscsi_port(1, 2),
+    {'portPos': {'node': 0, 'slot': 1, 'cardPort': 1}, 'protocol': 1,
+     'linkState': 4},
+    {'portPos': {'node': 1, 'slot': 1, 'cardPort': 1}, 'protocol': 1,
+     'linkState': 5}]}
+
+SHOWPORT_ISCSIVLANS = [
+    'N:S:P,VLAN,IPAddr,Netmask/PrefixLen,Gateway,MTU,'
+    'TPGT,STGT,iSNS_Addr,iSNS_Port',
+    '0:2:1,101,172.20.0.150,255.255.255.0,'
+    '172.20.0.1,9000,1024,1024,0.0.0.0,3205',
+    '1:2:1,102,172.20.1.151,255.255.255.0,'
+    '172.20.1.1,9000,1027,1027,0.0.0.0,3205',
+    '----------------------------------------------------------------------',
+    '2,,,,,,,,,']
+
+
+class PortInventoryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.loads = 0
+        self.inventory = portinventory.PortInventory(self.get_ports, ttl=60)
+
+    def get_ports(self):
+        self.loads += 1
+        return copy.deepcopy(PORTS)
+
+    def test_views(self):
+        self.assertEqual(self.inventory.ports(), PORTS)
+        self.assertEqual(len(self.inventory.protocol_ports(2)), 2)
+        self.assertEqual(
+            [port['portPos']['node'] for port in
+             self.inventory.protocol_ports(1, state=4)], [0])
+        self.assertEqual(self.inventory.protocol_ports(4), [])
+        self.assertEqual(
+            self.inventory.find({'node': 1, 'slot': 2,
+                                 'cardPort': 1})['iSCSIPortInfo']['vlan'], 2)
+        self.assertIsNone(self.inventory.find({'node': 9}))
+        self.assertEqual(self.loads, 1)
+        self.assertEqual(self.inventory.get_stats(),
+                         {'built': True, 'builds': 1, 'hits': 5,
+                          'ports': 4})
+
+        # Callers get copies.
+        self.inventory.protocol_ports(1)[0]['linkState'] = 9
+        self.inventory.ports()['members'].pop()
+        self.assertEqual(self.inventory.ports(), PORTS)
+
+    def test_ttl(self):
+        self.inventory.ttl = 0.05
+        self.inventory.ports()
+        self.inventory.ports()
+        time.sleep(0.06)
+        self.inventory.ports()
+        self.assertEqual(self.loads, 2)
+        self.inventory.clear()
+        self.inventory.ports()
+        self.assertEqual(self.loads, 3)
+
+    def test_port_key(self):
+        self.assertEqual(
+            portinventory.port_key({'node': 1, 'slot': 2, 'cardPort': 3}),
+            (1, 2, 3))
+
+
+class HPE3ParClientPortInventoryTestCase(
+        hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientPortInventoryTestCase, self).setUp()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.icl = client.HPE3ParClient(url, port_inventory_ttl=600)
+        self.icl.login(self.user, self.password)
+
+    def tearDown(self):
+        self.icl.logout()
+        super(HPE3ParClientPortInventoryTestCase, self).tearDown()
+
+    def test_protocol_views(self):
+        self.printHeader('protocol_views')
+
+        with mock.patch.object(self.icl.http, 'get',
+                               wraps=self.icl.http.get) as get:
+            self.assertEqual(self.icl.getFCPorts(), self.cl.getFCPorts())
+            self.assertEqual(self.icl.getiSCSIPorts(4),
+                             self.cl.getiSCSIPorts(4))
+            self.assertEqual(self.icl.getIPPorts(), self.cl.getIPPorts())
+            self.assertEqual(self.icl.getPorts(), self.cl.getPorts())
+            self.assertEqual(get.call_count, 1)
+
+        self.printFooter('protocol_views')
+
+    def test_merge_iscsi_vlans(self):
+        self.printHeader('merge_iscsi_vlans')
+
+        self.icl.ssh = mock.Mock()
+        with mock.patch.object(self.icl.http, 'get',
+                               return_value=({}, copy.deepcopy(PORTS))), \
+                mock.patch.object(self.icl, '_run',
+                                  return_value=SHOWPORT_ISCSIVLANS) as run:
+            ports = self.icl.getiSCSIPorts()
+            self.icl.getFCPorts()
+            self.icl.getPorts()
+        run.assert_called_once_with(['showport', '-iscsivlans'])
+
+        # Only the vlan tagged port is merged, its other keys are kept.
+        info = ports[0]['iSCSIPortInfo']
+        self.assertEqual(info['vlan'], '101')
+        self.assertEqual(info['IPAddr'], '172.20.0.150')
+        self.assertEqual(info['mtu'], 9000)
+        self.assertEqual(info['iSCSIName'], 'iqn.2000-05.com.3pardata:0')
+        self.assertEqual(ports[0]['IPAddr'], '172.20.0.150')
+        self.assertEqual(ports[1], PORTS['members'][1])
+
+        # Two VLANs on one port, the last one is merged last.
+        body = {'members': [iscsi_port(0, 1)]}
+        second_vlan = ('0:2:1,102,172.20.2.150,255.255.255.0,'
+                       '172.20.2.1,1500,1025,1025,0.0.0.0,3205')
+        vlan_data = SHOWPORT_ISCSIVLANS[:2] + [second_vlan]
+        vlan_data += SHOWPORT_ISCSIVLANS[3:]
+        vlan_ports = showport_parser.ShowportParser().parseShowport(vlan_data)
+        rows = copy.deepcopy(vlan_ports)
+        self.icl._mergeISCSIVlans(body, self.icl._vlanTaggedISCSIPorts(body),
+                                  vlan_ports)
+        self.assertEqual(vlan_ports, rows)
+        info = body['members'][0]['iSCSIPortInfo']
+        self.assertEqual(info['vlan'], '102')
+        self.assertEqual(info['mtu'], 1500)
+        self.assertEqual(info['iSCSIName'], 'iqn.2000-05.com.3pardata:0')
+        for row in vlan_ports:
+            self.assertIsNot(info, row['iSCSIPortInfo'])
+            self.assertIsNot(body['members'][0]['portPos'], row['portPos'])
+
+        body = {'members': [iscsi_port(0, 1), iscsi_port(0, 1)]}
+        self.assertRaises(
+            exceptions.NoUniqueMatch, self.icl._mergeISCSIVlans, body,
+            self.icl._vlanTaggedISCSIPorts(body),
+            [{'portPos': {'node': 0, 'slot': 2, 'cardPort': 1}}])
+
+        self.printFooter('merge_iscsi_vlans')
@@ -0,0 +1,163 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client collection queries."""
+
+import mock
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import query
+
+CPG_NAME1 = 'QUERY_CPG1_' + hpe3parbase.TIME
+VOLUME_NAME1 = 'QUERY_VOL1_' + hpe3parbase.TIME
+SNAP_NAME1 = 'QUERY_SNAP1_' + hpe3parbase.TIME
+VOLUME_SET_NAME1 = 'QUERY_VVSET1_' + hpe3parbase.TIME
+
+HOSTS = [{'name': 'host1', 'FCPaths': [{'wwn': '1000000000000001'},
+                                       {'wwn': '1000000000000002'}]},
+         {'name': 'host2', 'iSCSIPaths': [{'name': 'iqn.1993-08.org:01'}]},
+         {'name': 'host3', 'FCPaths': []}]
+
+
+class QueryTestCase(unittest.TestCase):
+
+    def test_render(self):
+        q = query.Eq('snapCPG', 'CPG1') & query.Eq('copyOf', 'vol1')
+        self.assertEqual(q.render(), 'snapCPG EQ CPG1 AND copyOf EQ vol1')
+        self.assertEqual(str(query.Eq('lun', 0) | query.Eq('active', True)),
+                         'lun EQ 0 OR active EQ true')
+
+        wwns = query.Eq('wwn', 'AA') | query.Eq('wwn', 'BB')
+        iqn = query.Eq('name', 'iqn.1993-08.org:01')
+        q = query.Has('FCPaths', wwns) | query.Has('iSCSIPaths', iqn)
+        self.assertEqual(q.render(),
+                         'FCPaths[wwn==AA OR wwn==BB] OR '
+                         'iSCSIPaths[name==iqn.1993-08.org:01]')
+        self.assertEqual(len(q.queries), 2)
+
+    def test_to_param(self):
+        q = query.Eq('volumeName', u'vol\xe91')
+        self.assertEqual(q.to_param(),
+                         '%22volumeName%20EQ%20vol%C3%A91%22')
+        self.assertEqual(query.Or().to_param(), '%22%22')
+
+    def test_not_pushable(self):
+        for q in (query.Eq('name', 'two words'),
+                  query.Eq('name', 'a"b'),
+                  query.Eq('name', 'x]'),
+                  query.Eq('name', ''),
+                  query.Eq('name', None),
+                  query.Has('FCPaths', query.Has('a', query.Eq('b', 1))),
+                  query.Eq('a', 1) & (query.Eq('b', 2) | query.Eq('c', 3))):
+            self.assertFalse(q.pushable, q)
+            self.assertRaises(ValueError, q.render)
+        q = query.Eq('a', 1) & query.Eq('b', 2) & query.Eq('c', 3)
+        self.assertTrue(q.pushable)
+
+    def test_matches(self):
+        def names(q):
+            return [host['name'] for host in HOSTS if q.matches(host)]
+
+        self.assertEqual(names(query.Has('FCPaths', query.Eq(
+            'wwn', '1000000000000002'))), ['host1'])
+        wwn = query.Has('FCPaths', query.Eq('wwn', 'x'))
+        iqn = query.Has('iSCSIPaths', query.Eq('name', 'iqn.1993-08.org:01'))
+        self.assertEqual(names(wwn | iqn), ['host2'])
+        name = query.Eq('name', 'host3')
+        self.assertEqual(names(name & query.Eq('FCPaths', 'x')), [])
+        self.assertEqual(names(query.Or()), [])
+        self.assertTrue(query.Eq('setmembers', 'vol1').matches(
+            {'setmembers': ['vol0', 'vol1']}))
+        self.assertTrue(query.Eq('name', 'two words').matches(
+            {'name': 'two words'}))
+
+    def test_collection_url(self):
+        q = query.Eq('hostname', 'host1')
+        self.assertEqual(query.collection_url('vluns', q),
+                         ('/vluns?query=%22hostname%20EQ%20host1%22', True))
+        self.assertEqual(query.collection_url('vluns', q, False),
+                         ('/vluns', False))
+        self.assertEqual(query.collection_url(
+            'vluns', query.Eq('hostname', 'a b')), ('/vluns', False))
+        self.assertEqual(query.select({'total': 3, 'members': HOSTS},
+                                      query.Eq('name', 'host2')),
+                         {'total': 1, 'members': [HOSTS[1]]})
+
+
+class HPE3ParClientQueryTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientQueryTestCase, self).setUp()
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+        try:
+            self.cl.createVolume(VOLUME_NAME1, CPG_NAME1, 1024)
+        except Exception:
+            pass
+
+    def tearDown(self):
+        for name in (VOLUME_SET_NAME1,):
+            try:
+                self.cl.deleteVolumeSet(name)
+            except Exception:
+                pass
+        for name in (SNAP_NAME1, VOLUME_NAME1):
+            try:
+                self.cl.deleteVolume(name)
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        super(HPE3ParClientQueryTestCase, self).tearDown()
+
+    def test_pushed_to_array(self):
+        self.printHeader('pushed_to_array')
+
+        snapshot = {'name': SNAP_NAME1, 'copyOf': VOLUME_NAME1,
+                    'copyType': self.cl.VIRTUAL_COPY}
+        body = {'members': [snapshot]}
+        with mock.patch.object(self.cl.http, 'get',
+                               return_value=({}, body)) as get:
+            self.assertEqual(
+                self.cl.getSnapshotsOfVolume(CPG_NAME1, VOLUME_NAME1),
+                [SNAP_NAME1])
+            self.assertEqual(self.cl.findAllVolumeSets(VOLUME_NAME1), [])
+        get.assert_has_calls([
+            # The same query as the array was always sent.
+            mock.call('/volumes?query=%s' %
+                      query.Eq('snapCPG', CPG_NAME1).to_param()),
+            # The volume sets are filtered by the client.
+            mock.call('/volumesets')])
+
+        self.printFooter('pushed_to_array')
+
+    def test_find_all_volume_sets(self):
+        self.printHeader('find_all_volume_sets')
+
+        self.cl.createSnapshot(SNAP_NAME1, VOLUME_NAME1,
+                               {'readOnly': True})
+        self.cl.createVolumeSet(VOLUME_SET_NAME1, domain=self.DOMAIN,
+                                setmembers=[VOLUME_NAME1])
+        self.assertEqual(
+            [vvset['name'] for vvset in
+             self.cl.findAllVolumeSets(VOLUME_NAME1)], [VOLUME_SET_NAME1])
+        self.assertEqual(self.cl.findAllVolumeSets(SNAP_NAME1), [])
+
+        self.printFooter('find_all_volume_sets')
@@ -14,83 +14,123 @@
 
 """Test class of 3PAR Client handling WSAPI retries."""
 
-import importlib
 import mock
 import requests
 
 from test import HPE3ParClient_base as hpe3parbase
 
 from hpe3parclient import exceptions
+from hpe3parclient import retry
 
 
 class HPE3ParClientRetryTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
 
     def setUp(self):
         super(HPE3ParClientRetryTestCase, self).setUp()
+        # Keep the backoff short so exhausting all attempts is quick.
+        self.cl.http.retry_policy = retry.RetryPolicy(base_delay=0.01,
+                                                      max_delay=0.05)
 
     def tearDown(self):
-        # NOTE(aorourke): We mock out the requests library's request method in
-        # order to force exceptions so we can test retry attempts. By doing
-        # this, we completely destroy the functionaility of requests.
-        # Therefore, after every unit test we run, we need to reimport the
-        # library to restore proper functionality or all future tests will
-        # fail. In Python 2.7 we must use the built in reload() method while
-        # in Python 3.4 we must use importlib.reload().
-        try:
-            reload(requests)
-        except NameError:
-            importlib.reload(requests)
+        # NOTE: Only the client's own pooled session is mocked out, so the
+        # requests library itself does not need to be reloaded. Dropping the
+        # mock restores the session's request method for the logout.
+        vars(self.cl.http.session).pop('request', None)
         super(HPE3ParClientRetryTestCase, self).tearDown()
 
     def test_retry_exhaust_all_attempts_service_unavailable(self):
         http = self.cl.http
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
-
         # The requests object needs to raise an exception in order for us
         # to test the retry functionality.
-        requests.request = mock.Mock()
-        requests.request.side_effect = exceptions.HTTPServiceUnavailable(
-            "Maximum number of WSAPI connections reached.")
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            exceptions.HTTPServiceUnavailable(
+                "Maximum number of WSAPI connections reached.")
 
-        # This will take ~30 seconds to fail.
         self.assertRaises(
             exceptions.HTTPServiceUnavailable,
             http.get,
             '/volumes')
 
-        # There should be 0 tries left after the call.
-        self.assertEqual(http.tries, 0)
+        # All 5 tries should have been used.
+        self.assertEqual(http.session.request.call_count, 5)
+        state = http.get_last_retry_state()
+        self.assertEqual(len(state.attempts), 5)
+        self.assertEqual(state.retries, 4)
+        self.assertTrue(state.exhausted)
+
+        # The next request starts over with all of its tries.
+        http.session.request.reset_mock()
+        self.assertRaises(
+            exceptions.HTTPServiceUnavailable,
+            http.post,
+            '/volumes', body={})
+        self.assertEqual(http.session.request.call_count, 5)
+        self.assertEqual(http.retry_policy.tries, 5)
 
     def test_retry_exhaust_all_attempts_connection_error(self):
         http = self.cl.http
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
-
         # The requests object needs to raise an exception in order for us
         # to test the retry functionality.
-        requests.request = mock.Mock()
-        requests.request.side_effect = requests.exceptions.ConnectionError(
-            "There was a connection error.")
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            requests.exceptions.ConnectionError(
+                "There was a connection error.")
 
-        # This will take ~30 seconds to fail.
         self.assertRaises(
             requests.exceptions.ConnectionError,
             http.get,
             '/volumes')
 
-        # There should be 0 tries left after the call.
-        self.assertEqual(http.tries, 0)
+        # All 5 tries should have been used.
+        self.assertEqual(http.session.request.call_count, 5)
+        attempts = http.get_last_retry_state().attempts
+        self.assertEqual([a['error'] for a in attempts],
+                         ['ConnectionError'] * 5)
 
-    def test_no_retry(self):
+    def test_no_retry_non_idempotent(self):
+        http = self.cl.http
+
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            requests.exceptions.ConnectionError(
+                "There was a connection error.")
+
+        # A POST may have reached the array, so it must not be replayed.
+        self.assertRaises(
+            requests.exceptions.ConnectionError,
+            http.post,
+            '/volumes', body={})
+        self.assertEqual(http.session.request.call_count, 1)
+        self.assertFalse(http.get_last_retry_state().exhausted)
+
+    def test_retry_max_total_time(self):
         http = self.cl.http
+        http.retry_policy = retry.RetryPolicy(base_delay=1, jitter=False,
+                                              max_total_time=0.5)
+
+        http.session.request = mock.Mock()
+        http.session.request.side_effect = \
+            exceptions.HTTPServiceUnavailable(
+                "Maximum number of WSAPI connections reached.")
+
+        # The first delay alone would exceed the cap.
+        self.assertRaises(
+            exceptions.HTTPServiceUnavailable,
+            http.get,
+            '/volumes')
+        self.assertEqual(http.session.request.call_count, 1)
+        self.assertTrue(http.get_last_retry_state().exhausted)
 
-        # There should be 5 tries before anything is called.
-        self.assertEqual(http.tries, 5)
+    def test_no_retry(self):
+        http = self.cl.http
 
         http.get('/volumes')
 
-        # There should be 5 tries left after the call.
-        self.assertEqual(http.tries, 5)
+        state = http.get_last_retry_state()
+        self.assertEqual(len(state.attempts), 1)
+        self.assertEqual(state.attempts[0]['status'], 200)
+        self.assertEqual(state.retries, 0)
+        self.assertEqual(http.get_retry_stats()['exhausted'], 0)
@@ -0,0 +1,292 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client session key sharing."""
+
+import mock
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import session_store
+
+URL = 'https://array:8080/api/v1'
+
+
+class SessionStoreTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _stores(self):
+        stores = [session_store.SessionStore(),
+                  session_store.SQLiteSessionStore(
+                      os.path.join(self.tmp_dir, 'sessions.db'))]
+        if session_store.fcntl is not None:
+            stores.append(session_store.FileSessionStore(
+                os.path.join(self.tmp_dir, 'sessions.json')))
+        return stores
+
+    def test_session_id(self):
+        session_id = session_store.SessionStore.session_id
+        self.assertEqual(session_id(URL, 'user', 'pass'),
+                         session_id(URL, 'user', 'pass'))
+        self.assertNotEqual(session_id(URL, 'user', 'pass'),
+                            session_id(URL, 'user', 'wrong'))
+        self.assertNotEqual(session_id(URL, 'user', 'pass'),
+                            session_id(URL, 'user', 'pass',
+                                       {'InServ': 'x'}))
+        self.assertNotIn('pass', session_id(URL, 'user', 'pass'))
+
+    def test_get_put_invalidate(self):
+        for store in self._stores():
+            self.assertIsNone(store.get('id1'))
+            self.assertEqual(store.put('id1', 'key1', 1000.0),
+                             ('key1', 1000.0))
+            store.put('id2', 'key2')
+            self.assertEqual(store.get('id1'), 'key1')
+
+            # Another client stored its key first, take it instead.
+            self.assertEqual(store.put('id1', 'key3'), ('key1', 1000.0))
+            self.assertFalse(store.release('id1', 'key1'))
+            self.assertEqual(store.get('id1'), 'key1')
+
+            store.invalidate('id1', 'key1')
+            self.assertIsNone(store.get('id1'))
+            self.assertFalse(store.release('id1', 'key1'))
+            self.assertEqual(store.get('id2'), 'key2')
+
+    def test_holders(self):
+        for store in self._stores():
+            self.assertIsNone(store.acquire('id1'))
+            store.put('id1', 'key1', created=1000.0)
+            self.assertEqual(store.acquire('id1'), ('key1', 1000.0))
+
+            # Only the last holder may delete the session.
+            self.assertFalse(store.release('id1', 'key1'))
+            self.assertEqual(store.get('id1'), 'key1')
+            self.assertTrue(store.release('id1', 'key1'))
+            self.assertIsNone(store.get('id1'))
+
+            # A rejected key is no longer stored, nor deleted.
+            store.put('id1', 'key2')
+            store.invalidate('id1', 'key2')
+            self.assertFalse(store.release('id1', 'key2'))
+
+    def test_retire(self):
+        for store in self._stores():
+            store.put('id1', 'key1', created=1000.0)
+            store.acquire('id1')
+
+            # The key is too old for one holder, the other keeps it.
+            self.assertFalse(store.release('id1', 'key1', retire=True))
+            self.assertIsNone(store.get('id1'))
+            self.assertEqual(store.put('id1', 'key2', 2000.0),
+                             ('key2', 2000.0))
+            self.assertTrue(store.release('id1', 'key1'))
+            self.assertEqual(store.get('id1'), 'key2')
+
+    def test_shared_between_instances(self):
+        path = os.path.join(self.tmp_dir, 'sessions.db')
+        session_store.SQLiteSessionStore(path).put('id1', 'key1')
+        self.assertEqual(session_store.SQLiteSessionStore(path).get('id1'),
+                         'key1')
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+
+    def test_max_age(self):
+        for store in self._stores():
+            store.max_age = 60
+            store.put('id1', 'key1')
+            self.assertEqual(store.get('id1'), 'key1')
+            with mock.patch('time.time', return_value=2 ** 40):
+                self.assertIsNone(store.get('id1'))
+                self.assertIsNone(store.acquire('id1'))
+
+    def test_reauth_invalidates(self):
+        store = session_store.SessionStore()
+        cl = http.HTTPJSONRESTClient(URL, session_store=store)
+        session_id = store.session_id(cl.api_url, 'user', 'pass')
+        store.put(session_id, 'stale')
+
+        resp = mock.Mock(status=200)
+        requests = []
+
+        def request(url, method, **kwargs):
+            requests.append((method, url[len(URL):]))
+            if url.endswith('/credentials'):
+                return resp, {'key': 'fresh'}
+            if cl.session_key == 'stale':
+                raise exceptions.HTTPUnauthorized()
+            return resp, {}
+
+        with mock.patch.object(cl, 'request', side_effect=request):
+            # The stored key is used without a login.
+            cl.authenticate('user', 'pass')
+            self.assertEqual(cl.session_key, 'stale')
+            self.assertEqual(requests, [])
+
+            # The array rejects it, so log in and store the new key.
+            cl.get('/volumes')
+            self.assertEqual(requests, [('GET', '/volumes'),
+                                        ('POST', '/credentials'),
+                                        ('GET', '/volumes')])
+            self.assertEqual(store.get(session_id), 'fresh')
+
+            cl.unauthenticate()
+            self.assertIsNone(store.get(session_id))
+            self.assertEqual(requests[-1], ('DELETE', '/credentials/fresh'))
+
+    def _client(self, store, requests):
+        cl = http.HTTPJSONRESTClient(URL, session_store=store,
+                                     session_max_age=600)
+        resp = mock.Mock(status=200)
+
+        def request(url, method, **kwargs):
+            requests.append((method, url[len(URL):]))
+            if url.endswith('/credentials'):
+                return resp, {'key': 'key%d' % len(requests)}
+            return resp, {}
+        cl.request = mock.Mock(side_effect=request)
+        return cl
+
+    def test_concurrent_login(self):
+        store = session_store.SessionStore()
+        requests = []
+        cl1 = self._client(store, requests)
+        cl2 = self._client(store, requests)
+        cl1.authenticate('user', 'pass')
+        key = cl1.session_key
+
+        # cl2 found no key either, and stored its own after cl1 did.
+        with mock.patch.object(store, 'acquire', return_value=None):
+            cl2.authenticate('user', 'pass')
+        self.assertEqual(cl2.session_key, key)
+        self.assertEqual(requests, [('POST', '/credentials'),
+                                    ('POST', '/credentials'),
+                                    ('DELETE', '/credentials/key2')])
+
+        cl1.unauthenticate()
+        self.assertEqual(len(requests), 3)
+        cl2.unauthenticate()
+        self.assertEqual(requests[-1], ('DELETE', '/credentials/%s' % key))
+
+    def test_shared_logout(self):
+        store = session_store.SessionStore()
+        requests = []
+        cl1 = self._client(store, requests)
+        cl2 = self._client(store, requests)
+        cl1.authenticate('user', 'pass')
+        cl2.authenticate('user', 'pass')
+        self.assertEqual(requests, [('POST', '/credentials')])
+        key = cl1.session_key
+
+        # The other client still uses the session, leave it be.
+        cl1.unauthenticate()
+        self.assertEqual(requests, [('POST', '/credentials')])
+        cl2.get('/volumes')
+        self.assertEqual(requests[-1], ('GET', '/volumes'))
+
+        cl2.unauthenticate()
+        self.assertEqual(requests[-1], ('DELETE', '/credentials/%s' % key))
+        self.assertIsNone(store.get(cl2._session_id))
+
+    def test_reused_session_age(self):
+        store = session_store.SessionStore()
+        requests = []
+        cl1 = self._client(store, requests)
+        cl2 = self._client(store, requests)
+        with mock.patch('time.time', return_value=1000.0):
+            cl1.authenticate('user', 'pass')
+
+        # The session is older than session_max_age by now, so the client
+        # reusing it logs in again ahead of its first request.
+        with mock.patch('time.time', return_value=1700.0):
+            cl2.authenticate('user', 'pass')
+            self.assertEqual(cl2.session_time, 1000.0)
+            cl2.get('/volumes')
+        self.assertEqual(requests, [('POST', '/credentials'),
+                                    ('POST', '/credentials'),
+                                    ('GET', '/volumes')])
+        self.assertNotEqual(cl2.session_key, cl1.session_key)
+        self.assertEqual(cl2.session_time, 1700.0)
+
+        # The old session is deleted once its last holder lets go of it.
+        old_key = cl1.session_key
+        cl1.unauthenticate()
+        self.assertEqual(requests[-1],
+                         ('DELETE', '/credentials/%s' % old_key))
+        self.assertEqual(store.get(cl2._session_id), cl2.session_key)
+
+    def test_renewed_session_deleted(self):
+        store = session_store.SessionStore()
+        requests = []
+        cl = self._client(store, requests)
+        with mock.patch('time.time', return_value=1000.0):
+            cl.authenticate('user', 'pass')
+        old_key = cl.session_key
+
+        with mock.patch('time.time', return_value=1700.0):
+            cl.get('/volumes')
+        self.assertEqual(requests, [('POST', '/credentials'),
+                                    ('POST', '/credentials'),
+                                    ('DELETE', '/credentials/%s' % old_key),
+                                    ('GET', '/volumes')])
+        self.assertEqual(store.get(cl._session_id), cl.session_key)
+
+
+class HPE3ParClientSessionStoreTestCase(
+        hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientSessionStoreTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = session_store.SQLiteSessionStore(
+            os.path.join(self.tmp_dir, 'sessions.db'))
+        self.url = self.flask_url if self.unitTest else self.url_3par
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+        super(HPE3ParClientSessionStoreTestCase, self).tearDown()
+
+    def test_shared_login(self):
+        self.printHeader('shared_login')
+
+        cl1 = client.HPE3ParClient(self.url, session_store=self.store)
+        cl1.login(self.user, self.password)
+        cl2 = client.HPE3ParClient(self.url, session_store=self.store)
+        cl2.login(self.user, self.password)
+
+        self.assertEqual(cl1.http.session_key, cl2.http.session_key)
+        self.assertIn('POST /credentials', cl1.http.get_latency_stats())
+        self.assertNotIn('POST /credentials', cl2.http.get_latency_stats())
+        cl2.getWsApiVersion()
+
+        # A wrong password does not find the key.
+        cl3 = client.HPE3ParClient(self.url, session_store=self.store)
+        self.assertRaises(exceptions.HTTPForbidden, cl3.login, self.user,
+                          'wrong password')
+
+        cl1.logout()
+
+        self.printFooter('shared_login')
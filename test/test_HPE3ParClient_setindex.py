@@ -0,0 +1,233 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client set membership index."""
+
+import copy
+import mock
+import time
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import setindex
+
+CPG_NAME1 = 'SETINDEX_CPG1_' + hpe3parbase.TIME
+VOLUME_NAME1 = 'SETINDEX_VOL1_' + hpe3parbase.TIME
+VOLUME_NAME2 = 'SETINDEX_VOL2_' + hpe3parbase.TIME
+VOLUME_SET_NAME1 = 'SETINDEX_VVSET1_' + hpe3parbase.TIME
+VOLUME_SET_NAME2 = 'SETINDEX_VVSET2_' + hpe3parbase.TIME
+HOST_NAME1 = 'SETINDEX_HOST1_' + hpe3parbase.TIME
+HOST_SET_NAME1 = 'SETINDEX_HSET1_' + hpe3parbase.TIME
+
+
+class FakeArray(object):
+
+    def __init__(self):
+        self.sets = [{'name': 'set1', 'setmembers': ['vol1', 'vol2']},
+                     {'name': 'set2', 'setmembers': ['vol2']},
+                     {'name': 'set3'}]
+        self.requests = 0
+
+    def get_sets(self):
+        self.requests += 1
+        return {'total': len(self.sets), 'members': copy.deepcopy(self.sets)}
+
+    def get_set(self, name):
+        self.requests += 1
+        for member_set in self.sets:
+            if member_set['name'] == name:
+                return copy.deepcopy(member_set)
+        raise exceptions.HTTPNotFound()
+
+
+class SetIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.array = FakeArray()
+        self.index = setindex.SetIndex(self.array.get_sets,
+                                       self.array.get_set, ttl=60)
+
+    def names(self, member):
+        return [member_set['name'] for member_set in self.index.find(member)]
+
+    def test_one_build(self):
+        self.assertEqual(self.names('vol2'), ['set1', 'set2'])
+        self.assertEqual(self.names('vol1'), ['set1'])
+        self.assertEqual(self.names('vol3'), [])
+        self.assertEqual(self.array.requests, 1)
+        self.assertEqual(self.index.get_stats(),
+                         {'built': True, 'sets': 3, 'members': 2,
+                          'builds': 1, 'hits': 2})
+
+        # Callers get copies.
+        self.index.find('vol1')[0]['setmembers'].append('vol9')
+        self.assertEqual(self.names('vol9'), [])
+
+    def test_ttl(self):
+        self.index.ttl = 0.05
+        self.names('vol1')
+        self.array.sets[2]['setmembers'] = ['vol1']
+        self.assertEqual(self.names('vol1'), ['set1'])
+        time.sleep(0.06)
+        self.assertEqual(self.names('vol1'), ['set1', 'set3'])
+        self.assertEqual(self.index.builds, 2)
+
+    def test_changes(self):
+        self.names('vol1')
+
+        self.array.sets.append({'name': 'set4', 'setmembers': ['vol1']})
+        self.index.refresh('set4')
+        self.array.sets[1]['setmembers'] = ['vol1']
+        self.index.refresh('set2')
+        # Sets read back keep their place.
+        self.assertEqual(self.names('vol1'), ['set1', 'set2', 'set4'])
+        self.assertEqual(self.names('vol2'), ['set1'])
+
+        self.array.sets[0]['name'] = 'renamed'
+        self.index.refresh('set1', 'renamed')
+        self.array.sets.pop()
+        self.index.discard('set4')
+        self.assertEqual(self.names('vol1'), ['renamed', 'set2'])
+
+        self.index.rename_member('vol2', 'vol5')
+        self.index.discard_member('vol1')
+        self.assertEqual(self.names('vol5'), ['renamed'])
+        self.assertEqual(self.names('vol1'), [])
+        self.assertEqual(self.index.builds, 1)
+
+        # A set that can not be read back clears the index.
+        self.index.refresh('gone')
+        self.assertFalse(self.index.get_stats()['built'])
+        self.assertEqual(self.names('vol1'), ['renamed', 'set2'])
+
+    def test_changing(self):
+        self.names('vol1')
+
+        def fail(ex):
+            with self.index.changing():
+                raise ex
+
+        self.assertRaises(exceptions.HTTPConflict, fail,
+                          exceptions.HTTPConflict())
+        self.assertTrue(self.index.get_stats()['built'])
+        self.assertRaises(exceptions.Timeout, fail, exceptions.Timeout())
+        self.assertFalse(self.index.get_stats()['built'])
+
+    def test_not_built(self):
+        self.index.refresh('set1')
+        self.index.discard('set1')
+        self.index.rename_member('vol1', 'vol5')
+        self.assertEqual(self.array.requests, 0)
+        self.assertFalse(setindex.SetIndex(None, None).enabled)
+
+
+class HPE3ParClientSetIndexTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientSetIndexTestCase, self).setUp()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.icl = client.HPE3ParClient(url, set_index_ttl=300)
+        self.icl.login(self.user, self.password)
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.createVolume(name, CPG_NAME1, 1024)
+            except Exception:
+                pass
+        try:
+            self.cl.createHost(HOST_NAME1, None, None, {})
+        except Exception:
+            pass
+
+    def tearDown(self):
+        try:
+            self.cl.deleteHostSet(HOST_SET_NAME1)
+        except Exception:
+            pass
+        try:
+            self.cl.deleteHost(HOST_NAME1)
+        except Exception:
+            pass
+        for name in (VOLUME_SET_NAME1, VOLUME_SET_NAME2):
+            try:
+                self.cl.deleteVolumeSet(name)
+            except Exception:
+                pass
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.deleteVolume(name)
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        self.icl.logout()
+        super(HPE3ParClientSetIndexTestCase, self).tearDown()
+
+    def set_names(self, volume):
+        return [vvset['name'] for vvset in self.icl.findAllVolumeSets(volume)]
+
+    def test_volume_sets(self):
+        self.printHeader('volume_sets')
+
+        self.icl.createVolumeSet(VOLUME_SET_NAME1, domain=self.DOMAIN,
+                                 setmembers=[VOLUME_NAME1])
+        self.assertEqual(self.set_names(VOLUME_NAME1), [VOLUME_SET_NAME1])
+
+        with mock.patch.object(self.icl.http, 'get',
+                               wraps=self.icl.http.get) as get:
+            self.assertEqual(self.set_names(VOLUME_NAME2), [])
+            self.assertEqual(self.icl.findVolumeSet(VOLUME_NAME1),
+                             VOLUME_SET_NAME1)
+            self.assertFalse(get.called)
+
+            self.icl.createVolumeSet(VOLUME_SET_NAME2, domain=self.DOMAIN,
+                                     setmembers=[VOLUME_NAME2])
+            self.icl.addVolumeToVolumeSet(VOLUME_SET_NAME1, VOLUME_NAME2)
+            self.assertEqual(self.set_names(VOLUME_NAME2),
+                             [VOLUME_SET_NAME1, VOLUME_SET_NAME2])
+            self.icl.removeVolumeFromVolumeSet(VOLUME_SET_NAME1,
+                                               VOLUME_NAME1)
+            self.assertEqual(self.set_names(VOLUME_NAME1), [])
+            self.icl.deleteVolumeSet(VOLUME_SET_NAME2)
+            self.assertEqual(self.set_names(VOLUME_NAME2),
+                             [VOLUME_SET_NAME1])
+            # Only the sets changed were read back.
+            urls = ['/volumesets/%s' % name for name in
+                    (VOLUME_SET_NAME2, VOLUME_SET_NAME1, VOLUME_SET_NAME1)]
+            self.assertEqual([c[0][0] for c in get.call_args_list], urls)
+
+        self.assertEqual(self.icl.volume_set_index.get_stats()['builds'], 1)
+
+        self.printFooter('volume_sets')
+
+    def test_host_sets(self):
+        self.printHeader('host_sets')
+
+        self.assertIsNone(self.icl.findHostSet(HOST_NAME1))
+        self.icl.createHostSet(HOST_SET_NAME1, domain=self.DOMAIN,
+                               setmembers=[HOST_NAME1])
+        self.assertEqual(self.icl.findHostSet(HOST_NAME1), HOST_SET_NAME1)
+        self.icl.removeHostFromItsHostSet(HOST_NAME1)
+        self.assertIsNone(self.icl.findHostSet(HOST_NAME1))
+        self.assertEqual(self.icl.host_set_index.get_stats()['builds'], 1)
+
+        self.printFooter('host_sets')
@@ -0,0 +1,250 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client streaming of collections."""
+
+import json
+import mock
+import requests
+import tracemalloc
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+from hpe3parclient import http
+from hpe3parclient import jsonstream
+
+URL = 'https://array:8080/api/v1'
+CPG_NAME1 = 'STREAM_CPG1_' + hpe3parbase.TIME
+VOLUME_NAME1 = 'STREAM_VOL1_' + hpe3parbase.TIME
+VOLUME_NAME2 = 'STREAM_VOL2_' + hpe3parbase.TIME
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def _parse(data, size):
+    parser = jsonstream.MembersParser()
+    members = []
+    for chunk in _chunks(data, size):
+        members.extend(parser.feed(chunk))
+    members.extend(parser.close())
+    return parser, members
+
+
+class MembersParserTestCase(unittest.TestCase):
+
+    COLLECTION = {
+        'total': 4,
+        'members': [{'name': u'volé1', 'sizeMiB': 1024,
+                     'tags': ['a', '"quoted}'], 'ratio': 1.5e3},
+                    {'name': 'vol2', 'nested': {'members': [1, 2]}},
+                    12345,
+                    None],
+        'links': [{'href': '/volumes'}]}
+
+    def test_any_chunk_size(self):
+        data = json.dumps(self.COLLECTION, ensure_ascii=False,
+                          indent=1).encode('utf-8')
+        for size in (1, 2, 3, 7, 64, len(data)):
+            parser, members = _parse(data, size)
+            self.assertEqual(members, self.COLLECTION['members'])
+            self.assertEqual(parser.values,
+                             {'total': 4, 'links': [{'href': '/volumes'}]})
+
+    def test_members_as_they_complete(self):
+        parser = jsonstream.MembersParser()
+        self.assertEqual(parser.feed(b'{"total": 12'), [])
+        self.assertEqual(parser.feed(b'3, "members": [{"a": 1}, {"b"'),
+                         [{'a': 1}])
+        self.assertEqual(parser.values, {'total': 123})
+        self.assertEqual(parser.feed(b': 2}, 4'), [{'b': 2}])
+        self.assertEqual(parser.feed(b'5]}'), [45])
+        self.assertEqual(parser.close(), [])
+
+    def test_empty(self):
+        for data in (b'{}', b'{"total": 0, "members": []}'):
+            self.assertEqual(_parse(data, 1)[1], [])
+
+    def test_invalid(self):
+        for data in (b'{"total": 1, "members": [{"a": 1}',
+                     b'[{"a": 1}]',
+                     b'{"members": [1] 2}',
+                     b'{"members": [1]} {}'):
+            self.assertRaises(ValueError, _parse, data, 4)
+
+    def test_fields(self):
+        data = json.dumps(self.COLLECTION).encode('utf-8')
+        parser = jsonstream.MembersParser(fields=['name', 'sizeMiB'])
+        members = parser.feed(data) + parser.close()
+        self.assertEqual(members, [{'name': u'vol\xe91', 'sizeMiB': 1024},
+                                   {'name': 'vol2'}, 12345, None])
+
+    def test_fields_memory(self):
+        member = {'name': 'vol', 'id': 1, 'wwn': 'a' * 32,
+                  'userSpace': {'reservedMiB': 1024, 'rawReservedMiB': 3072,
+                                'usedMiB': 512, 'freeMiB': 512},
+                  'links': [{'href': 'b' * 60, 'rel': 'self'}]}
+        data = json.dumps({'total': 5000,
+                           'members': [member] * 5000}).encode('utf-8')
+
+        def retained(fields):
+            tracemalloc.start()
+            try:
+                parser = jsonstream.MembersParser(fields=fields)
+                members = parser.feed(data) + parser.close()
+                return tracemalloc.get_traced_memory()[0], members
+            finally:
+                tracemalloc.stop()
+
+        full, members = retained(None)
+        projected, members = retained(['name', 'wwn'])
+        self.assertEqual(members[0], {'name': 'vol', 'wwn': 'a' * 32})
+        self.assertLess(projected, full / 2)
+
+    def test_flat_memory(self):
+        member = json.dumps({'name': 'x' * 20, 'wwn': 'y' * 32,
+                             'userSpace': {'reservedMiB': 1024}})
+        data = ('{"total": 20000, "members": [%s]}' %
+                ', '.join([member] * 20000)).encode('utf-8')
+        chunks = _chunks(data, 65536)
+
+        tracemalloc.start()
+        try:
+            parser = jsonstream.MembersParser()
+            count = 0
+            for chunk in chunks:
+                count += len(parser.feed(chunk))
+            count += len(parser.close())
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(count, 20000)
+        self.assertLess(peak, len(data) / 4)
+
+
+class IterMembersTestCase(unittest.TestCase):
+
+    def _response(self, status, data):
+        response = mock.Mock(status_code=status,
+                             headers=requests.structures.CaseInsensitiveDict(),
+                             content=data, url=URL + '/volumes')
+        response.iter_content.side_effect = lambda size: _chunks(data, size)
+        return response
+
+    def test_iter_members(self):
+        cl = http.HTTPJSONRESTClient(URL)
+        data = json.dumps({'total': 2, 'members': [{'name': 'vol1'},
+                                                   {'name': 'vol2'}]})
+        response = self._response(200, data.encode('utf-8'))
+
+        with mock.patch.object(cl.session, 'request',
+                               return_value=response) as session_request:
+            members = cl.iter_members('/volumes', chunk_size=5)
+            self.assertFalse(session_request.called)
+            self.assertEqual(next(members), {'name': 'vol1'})
+            self.assertEqual(list(members), [{'name': 'vol2'}])
+
+        self.assertTrue(session_request.call_args[1]['stream'])
+        response.close.assert_called_with()
+        self.assertEqual(
+            cl.get_latency_stats()['GET /volumes']['statuses'], {200: 1})
+
+    def test_get_members(self):
+        cl = http.HTTPJSONRESTClient(URL)
+        data = json.dumps({'total': 2, 'members': [
+            {'name': 'vol1', 'id': 1, 'userCPG': 'CPG1'},
+            {'name': 'vol2', 'id': 2}]})
+        response = self._response(200, data.encode('utf-8'))
+
+        with mock.patch.object(cl.session, 'request', return_value=response):
+            body = cl.get_members('/volumes', ['name', 'userCPG'])
+        self.assertEqual(body, {'total': 2, 'members': [
+            {'name': 'vol1', 'userCPG': 'CPG1'}, {'name': 'vol2'}]})
+
+    def test_error_response(self):
+        cl = http.HTTPJSONRESTClient(URL)
+        response = self._response(404, b'{"code": 23, "desc": "no"}')
+
+        with mock.patch.object(cl.session, 'request', return_value=response):
+            self.assertRaises(exceptions.HTTPNotFound, list,
+                              cl.iter_members('/volumes'))
+
+
+class HPE3ParClientStreamTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientStreamTestCase, self).setUp()
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.createVolume(name, CPG_NAME1, 1024)
+            except Exception:
+                pass
+
+    def tearDown(self):
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.deleteVolume(name)
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        super(HPE3ParClientStreamTestCase, self).tearDown()
+
+    def test_iter_collections(self):
+        self.printHeader('iter_collections')
+
+        self.assertEqual(list(self.cl.iterVolumes()),
+                         self.cl.getVolumes()['members'])
+        names = [vol['name'] for vol in self.cl.iterVolumes()]
+        self.assertIn(VOLUME_NAME1, names)
+        self.assertIn(VOLUME_NAME2, names)
+
+        self.assertEqual(list(self.cl.iterHosts()),
+                         self.cl.getHosts()['members'])
+        self.assertEqual(list(self.cl.iterVLUNs()),
+                         self.cl.getVLUNs()['members'])
+
+        self.printFooter('iter_collections')
+
+    def test_fields(self):
+        self.printHeader('fields')
+
+        fields = ['name', 'id', 'wwn', 'sizeMiB', 'userCPG']
+        vols = self.cl.getVolumes(fields=fields)
+        full = self.cl.getVolumes()
+        self.assertEqual(vols['total'], full['total'])
+        self.assertEqual(vols['members'],
+                         [dict((key, vol[key]) for key in fields
+                               if key in vol) for vol in full['members']])
+        self.assertEqual(
+            [vol['name'] for vol in self.cl.iterVolumes(fields=['name'])],
+            [vol['name'] for vol in full['members']])
+
+        cpgs = self.cl.getCPGs(fields=['name'])
+        self.assertIn({'name': CPG_NAME1}, cpgs['members'])
+        for member in self.cl.getHosts(fields=['name'])['members']:
+            self.assertEqual(list(member), ['name'])
+        self.assertEqual(len(self.cl.getVLUNs(fields=['lun'])['members']),
+                         len(self.cl.getVLUNs()['members']))
+
+        self.printFooter('fields')
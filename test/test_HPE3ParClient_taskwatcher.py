@@ -0,0 +1,299 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client task watcher."""
+
+import copy
+import mock
+import threading
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+from hpe3parclient import taskwatcher
+
+
+class FakeArray(object):
+
+    def __init__(self):
+        self.tasks = [{'id': task_id, 'name': 'copy%d' % task_id,
+                       'status': taskwatcher.ACTIVE}
+                      for task_id in range(1, 101)]
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def get_tasks(self):
+        with self.lock:
+            self.requests += 1
+            return {'total': len(self.tasks),
+                    'members': copy.deepcopy(self.tasks)}
+
+    def set_status(self, task_id, status):
+        with self.lock:
+            self.tasks[task_id - 1]['status'] = status
+
+
+class TaskWatcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.array = FakeArray()
+        self.watcher = taskwatcher.TaskWatcher(
+            self.array.get_tasks, min_interval=0.01, max_interval=0.05)
+
+    def test_shared_poll(self):
+        futures = [self.watcher.watch(task_id)
+                   for task_id in range(1, 101)]
+        for task_id in range(1, 101):
+            self.array.set_status(task_id, taskwatcher.DONE)
+        for future in futures:
+            self.assertEqual(future.result(timeout=5)['status'],
+                             taskwatcher.DONE)
+        # Far fewer polls than tasks.
+        self.assertLess(self.array.requests, 10)
+        self.assertEqual(self.watcher.get_stats()['watching'], 0)
+
+    def test_outcomes(self):
+        self.array.tasks.append({'id': 101, 'name': 'copy1',
+                                 'status': taskwatcher.ACTIVE})
+        failed = self.watcher.watch(2)
+        cancelled = self.watcher.watch(3)
+        # The most recent task with the name.
+        by_name = self.watcher.watch(name='copy1')
+        missing = self.watcher.watch(500)
+        self.array.set_status(2, taskwatcher.FAILED)
+        self.array.set_status(3, taskwatcher.CANCELLED)
+        self.array.set_status(1, taskwatcher.DONE)
+
+        self.assertRaises(exceptions.TaskFailed, failed.result, 5)
+        self.assertRaises(exceptions.TaskCancelled, cancelled.result, 5)
+        self.assertRaises(exceptions.HTTPNotFound, missing.result, 5)
+        self.assertFalse(by_name.wait(0.1))
+        self.assertEqual(by_name.task['id'], 101)
+        self.assertEqual(by_name.status, taskwatcher.ACTIVE)
+        self.array.tasks[100]['status'] = taskwatcher.DONE
+        self.assertEqual(by_name.result(5)['id'], 101)
+
+    def test_callbacks(self):
+        done = []
+        future = self.watcher.watch(1, callback=done.append)
+        self.assertRaises(exceptions.Timeout, future.result, 0.05)
+        self.array.set_status(1, taskwatcher.DONE)
+        self.assertTrue(future.wait(5))
+        self.assertEqual(done, [future])
+        # A callback added once the task is over is called at once.
+        future.add_done_callback(done.append)
+        self.assertEqual(done, [future, future])
+
+    def test_backoff(self):
+        watcher = taskwatcher.TaskWatcher(self.array.get_tasks,
+                                          min_interval=1, max_interval=4)
+        watcher._futures.append(taskwatcher.TaskFuture(1))
+        # The first poll sees the task change from unseen to active.
+        watcher.poll()
+        self.assertEqual(watcher.interval, 1)
+        for i in range(4):
+            watcher.poll()
+        self.assertEqual(watcher.interval, 4)
+        self.array.set_status(1, taskwatcher.DONE)
+        watcher.poll()
+        self.assertEqual(watcher.get_stats(),
+                         {'watching': 0, 'polls': 6, 'interval': 1})
+        # Nothing watched, nothing polled.
+        watcher.poll()
+        self.assertEqual(self.array.requests, 6)
+
+    def test_poll_error(self):
+        get_tasks = mock.Mock(side_effect=exceptions.HTTPServiceUnavailable())
+        watcher = taskwatcher.TaskWatcher(get_tasks, min_interval=1)
+        future = taskwatcher.TaskFuture(1)
+        watcher._futures.append(future)
+        watcher.poll()
+        self.assertFalse(future.done())
+        self.assertEqual(watcher.interval, 1.5)
+
+    def test_poll_errors_in_a_row(self):
+        error = exceptions.HTTPServiceUnavailable()
+        get_tasks = mock.Mock(side_effect=[error, self.array.get_tasks(),
+                                           error, error, error])
+        watcher = taskwatcher.TaskWatcher(get_tasks, max_poll_errors=2)
+        future = taskwatcher.TaskFuture(1)
+        watcher._futures.append(future)
+
+        # A poll that works starts the count again.
+        watcher.poll()
+        watcher.poll()
+        watcher.poll()
+        self.assertFalse(future.done())
+        watcher.poll()
+        self.assertTrue(future.done())
+        self.assertRaises(exceptions.HTTPServiceUnavailable, future.result)
+        self.assertEqual(watcher.get_stats()['watching'], 0)
+
+    def test_watch_args(self):
+        self.assertRaises(ValueError, self.watcher.watch)
+        self.assertRaises(ValueError, self.watcher.watch, 1, 'copy1')
+
+    def test_progress(self):
+        future = taskwatcher.TaskFuture(1)
+        self.assertIsNone(future.progress)
+        future.task = {'completedPhases': 1, 'totalPhases': 4}
+        self.assertEqual(future.progress, 0.25)
+        future.task = {'completedSteps': 30, 'totalSteps': 40,
+                       'completedPhases': 1, 'totalPhases': 4}
+        self.assertEqual(future.progress, 0.75)
+        future._resolve({'status': taskwatcher.DONE})
+        self.assertEqual(future.progress, 1.0)
+        self.assertEqual(taskwatcher.done_future({'a': 1}).result(0),
+                         {'a': 1})
+
+    def test_cancel(self):
+        def cancel(task_id):
+            self.array.set_status(task_id, taskwatcher.CANCELLED)
+
+        canceller = mock.Mock(side_effect=cancel)
+        future = self.watcher.watch(1, canceller=canceller)
+        self.assertTrue(future.cancel())
+        canceller.assert_called_once_with(1)
+        self.assertRaises(exceptions.TaskCancelled, future.result, 5)
+        self.assertFalse(future.cancel())
+
+        # A task watched by name is cancelled once it is seen.
+        future = self.watcher.watch(name='copy2', canceller=canceller)
+        self.assertFalse(future.cancel())
+        self.assertFalse(self.watcher.watch(3).cancel())
+
+    def test_timeout(self):
+        canceller = mock.Mock()
+        future = self.watcher.watch(1, timeout=0.05, canceller=canceller)
+        with self.assertRaises(exceptions.Timeout):
+            future.result(5)
+        canceller.assert_called_once_with(1)
+        self.assertEqual(future.status, taskwatcher.ACTIVE)
+
+        # The timeout holds while the tasks can not be read.
+        self.array.get_tasks = mock.Mock(
+            side_effect=exceptions.HTTPServiceUnavailable())
+        watcher = taskwatcher.TaskWatcher(self.array.get_tasks,
+                                          min_interval=0.01)
+        self.assertRaises(exceptions.Timeout,
+                          watcher.watch(1, timeout=0.05).result, 5)
+
+
+class HPE3ParClientTaskWatcherTestCase(
+        hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientTaskWatcherTestCase, self).setUp()
+        self.cl.task_watcher.min_interval = 0.01
+
+    def test_watch_task(self):
+        self.printHeader('watch_task')
+
+        tasks = self.cl.getAllTasks()['members']
+        with mock.patch.object(self.cl.http, 'get',
+                               wraps=self.cl.http.get) as get:
+            futures = [self.cl.watchTask(task['id']) for task in tasks]
+            futures.append(self.cl.watchTask(name=tasks[0]['name']))
+            for future in futures:
+                self.assertEqual(future.result(timeout=5)['status'],
+                                 self.cl.TASK_DONE)
+            self.assertTrue(get.call_count < len(futures))
+
+        self.assertRaises(exceptions.HTTPNotFound,
+                          self.cl.watchTask(65000).result, 5)
+
+        self.printFooter('watch_task')
+
+    def test_async_variants(self):
+        self.printHeader('async_variants')
+
+        task = self.cl.getAllTasks()['members'][0]
+        started = ({}, {'taskid': str(task['id'])})
+        done = []
+        with mock.patch.object(self.cl.http, 'put', return_value=started), \
+                mock.patch.object(self.cl.http, 'post',
+                                  return_value=started):
+            futures = [
+                self.cl.copyVolumeAsync('vol1', 'vol2', 'CPG1',
+                                        callback=done.append),
+                self.cl.tuneVolumeAsync('vol1', 1, {'userCPG': 'CPG2'}),
+                self.cl.promoteVirtualCopyAsync('snap1'),
+                self.cl.resyncPhysicalCopyAsync('vol2')]
+        for future in futures:
+            self.assertEqual(future.task_id, task['id'])
+            self.assertEqual(future.result(timeout=5)['id'], task['id'])
+            self.assertEqual(future.progress, 1.0)
+        self.assertEqual(done, futures[:1])
+
+        # An online copy is watched by the destination volume name.
+        with mock.patch.object(self.cl.http, 'post',
+                               return_value=({}, {'name': task['name']})):
+            future = self.cl.copyVolumeAsync('vol1', task['name'], 'CPG1',
+                                             {'online': True})
+        self.assertEqual(future.name, task['name'])
+        self.assertEqual(future.result(timeout=5)['id'], task['id'])
+
+        # A call that starts no task is already over.
+        with mock.patch.object(self.cl.http, 'post',
+                               return_value=({}, None)):
+            future = self.cl.createFlashCacheAsync(64, 1)
+        self.assertTrue(future.done())
+        self.assertIsNone(future.result())
+
+        self.printFooter('async_variants')
+
+    def test_stop_online_physical_copy(self):
+        self.printHeader('stop_online_physical_copy')
+
+        task = self.cl.getAllTasks()['members'][0]
+        with mock.patch.object(self.cl, '_findTask',
+                               return_value=[task['id']]), \
+                mock.patch.object(self.cl, '_cancelTask') as cancel, \
+                mock.patch.object(self.cl, 'getVolume',
+                                  return_value={'name': 'vol1'}), \
+                mock.patch.object(self.cl, 'deleteVolume') as delete:
+            self.cl.stopOnlinePhysicalCopy('vol1')
+        cancel.assert_called_once_with(task['id'])
+        delete.assert_called_once_with('vol1')
+        self.assertEqual(self.cl.task_watcher.polls, 1)
+
+        # When /tasks can not be read the error reaches the caller.
+        self.cl.task_watcher.min_interval = 0.01
+        self.cl.task_watcher.max_interval = 0.01
+        with mock.patch.object(self.cl, '_findTask',
+                               return_value=[task['id']]), \
+                mock.patch.object(self.cl, '_cancelTask'), \
+                mock.patch.object(self.cl.task_watcher, 'get_tasks',
+                                  side_effect=exceptions.
+                                  HTTPServiceUnavailable()), \
+                mock.patch.object(self.cl, 'deleteVolume') as delete:
+            self.assertRaises(exceptions.HTTPServiceUnavailable,
+                              self.cl.stopOnlinePhysicalCopy, 'vol1')
+        self.assertFalse(delete.called)
+
+        # A copy task that stays active is waited on for at most timeout.
+        active = dict(task, status=taskwatcher.ACTIVE)
+        with mock.patch.object(self.cl, '_findTask',
+                               return_value=[task['id']]), \
+                mock.patch.object(self.cl, '_cancelTask'), \
+                mock.patch.object(self.cl.task_watcher, 'get_tasks',
+                                  return_value={'members': [active]}), \
+                mock.patch.object(self.cl, 'deleteVolume') as delete:
+            with self.assertRaises(exceptions.Timeout) as cm:
+                self.cl.stopOnlinePhysicalCopy('vol1', timeout=0.05)
+        self.assertIn('vol1', cm.exception.get_description())
+        self.assertFalse(delete.called)
+
+        self.printFooter('stop_online_physical_copy')
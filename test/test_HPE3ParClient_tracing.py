@@ -0,0 +1,273 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client tracing spans."""
+
+import threading
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import exceptions
+from hpe3parclient import metrics
+from hpe3parclient import tracing
+
+CPG_NAME1 = 'TRACE_CPG1_' + hpe3parbase.TIME
+VOLUME_NAME1 = 'TRACE_VOL1_' + hpe3parbase.TIME
+HOST_NAME1 = 'TRACE_HOST1_' + hpe3parbase.TIME
+LUN_1 = 1
+
+
+class TracerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.exporter = tracing.InMemoryExporter()
+        self.tracer = tracing.Tracer(self.exporter)
+        self.hooks = metrics.MetricsHooks()
+        self.hooks.register(self.tracer)
+
+    def _request(self, route, status=200):
+        self.hooks.emit(metrics.MetricsHooks.HTTP_REQUEST, method='GET',
+                        route=route, status=status, latency=0.01, retries=0,
+                        bytes_sent=0, bytes_received=100, decode_time=0)
+
+    def test_nested_spans(self):
+        with self.tracer.start_span('getHostVLUNs') as parent:
+            with self.tracer.start_span('getHost'):
+                self._request('/hosts/{name}')
+            self._request('/vluns', 404)
+            self.hooks.emit(metrics.MetricsHooks.SSH_COMMAND,
+                            command='showport', latency=0.5, error=None)
+        self.assertIsNone(self.tracer.current_span())
+
+        names = [span.name for span in self.exporter.spans]
+        self.assertEqual(names, ['GET /hosts/{name}', 'getHost',
+                                 'GET /vluns', 'ssh showport',
+                                 'getHostVLUNs'])
+        children = self.exporter.get_children(parent)
+        self.assertEqual([span.name for span in children],
+                         ['getHost', 'GET /vluns', 'ssh showport'])
+        self.assertEqual(set(span.trace_id for span in self.exporter.spans),
+                         set([parent.trace_id]))
+
+        http_span = self.exporter.spans[0]
+        self.assertEqual(http_span.kind, 'http')
+        self.assertEqual(http_span.attributes['route'], '/hosts/{name}')
+        self.assertEqual(http_span.attributes['bytes_received'], 100)
+        self.assertAlmostEqual(http_span.duration, 0.01, places=5)
+        self.assertIsNone(http_span.error)
+        self.assertEqual(children[1].error, 'HTTP 404')
+        self.assertEqual(children[2].kind, 'ssh')
+
+    def test_error(self):
+        def fail():
+            with self.tracer.start_span('getVolume'):
+                raise exceptions.HTTPNotFound()
+
+        self.assertRaises(exceptions.HTTPNotFound, fail)
+        self.assertEqual(self.exporter.spans[0].error, 'HTTPNotFound')
+        self.assertIsNotNone(self.exporter.spans[0].end_time)
+
+    def test_threads(self):
+        spans = []
+
+        def run(name):
+            with self.tracer.start_span(name) as span:
+                spans.append(span)
+                self._request('/volumes/{name}')
+
+        with self.tracer.start_span('main'):
+            thread = threading.Thread(target=run, args=('other',))
+            thread.start()
+            thread.join()
+
+        # A new thread starts its own trace.
+        self.assertIsNone(spans[0].parent_id)
+        other = self.exporter.get_children(spans[0])
+        self.assertEqual([span.name for span in other],
+                         ['GET /volumes/{name}'])
+
+    def test_broken_exporter(self):
+        def broken(span):
+            raise ValueError("broken exporter")
+
+        tracer = tracing.Tracer(broken)
+        with tracer.start_span('getVolume'):
+            pass
+
+    def test_generator_method(self):
+        test = self
+
+        @tracing.trace_methods
+        class Client(object):
+            tracer = self.tracer
+
+            def iterVolumes(self):
+                def members():
+                    for name in ('vol1', 'vol2'):
+                        test._request('/volumes/{name}')
+                        yield name
+                return members()
+
+        volumes = Client().iterVolumes()
+        self.assertEqual(self.exporter.spans, [])
+        with self.tracer.start_span('caller') as caller:
+            self.assertEqual(next(volumes), 'vol1')
+            # The caller's own requests are not part of iterVolumes.
+            self._request('/hosts/{name}')
+        self.assertEqual(list(volumes), ['vol2'])
+
+        names = [span.name for span in self.exporter.spans]
+        self.assertEqual(names, ['GET /volumes/{name}', 'GET /hosts/{name}',
+                                 'caller', 'GET /volumes/{name}',
+                                 'iterVolumes'])
+        root = self.exporter.spans[-1]
+        self.assertIsNone(root.error)
+        self.assertEqual(
+            [span.name for span in self.exporter.get_children(root)],
+            ['GET /volumes/{name}', 'GET /volumes/{name}'])
+        self.assertEqual(
+            [span.name for span in self.exporter.get_children(caller)],
+            ['GET /hosts/{name}'])
+
+    def test_generator_method_closed(self):
+        @tracing.trace_methods
+        class Client(object):
+            tracer = self.tracer
+
+            def iterVolumes(self):
+                return iter(['vol1', 'vol2'])
+
+            def iterHosts(self):
+                return (name for name in ('host1', 'host2'))
+
+        # Iterators that are not generators end with the call.
+        Client().iterVolumes()
+        self.assertEqual(self.exporter.spans[-1].name, 'iterVolumes')
+
+        hosts = Client().iterHosts()
+        next(hosts)
+        self.assertEqual(len(self.exporter.spans), 1)
+        hosts.close()
+        self.assertEqual(self.exporter.spans[-1].name, 'iterHosts')
+        self.assertIsNone(self.exporter.spans[-1].error)
+        self.assertIsNotNone(self.exporter.spans[-1].end_time)
+
+    def test_max_spans(self):
+        exporter = tracing.InMemoryExporter(max_spans=2)
+        for i in range(3):
+            exporter(tracing.Span('span%d' % i))
+        self.assertEqual([span.name for span in exporter.spans],
+                         ['span1', 'span2'])
+
+
+class HPE3ParClientTracingTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientTracingTestCase, self).setUp()
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+        try:
+            self.cl.createVolume(VOLUME_NAME1, CPG_NAME1, 1024)
+        except Exception:
+            pass
+        try:
+            self.cl.createHost(HOST_NAME1, None, None,
+                               {'domain': self.DOMAIN})
+        except Exception:
+            pass
+
+        self.exporter = tracing.InMemoryExporter()
+
+    def tearDown(self):
+        self.cl.setTracer(None)
+        try:
+            self.cl.deleteVLUN(VOLUME_NAME1, LUN_1, HOST_NAME1)
+        except Exception:
+            pass
+        try:
+            self.cl.deleteHost(HOST_NAME1)
+        except Exception:
+            pass
+        try:
+            self.cl.deleteVolume(VOLUME_NAME1)
+        except Exception:
+            pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        super(HPE3ParClientTracingTestCase, self).tearDown()
+
+    def test_1_get_host_vluns(self):
+        self.printHeader('get_host_vluns')
+
+        self.cl.createVLUN(VOLUME_NAME1, LUN_1, HOST_NAME1)
+        self.cl.setTracer(tracing.Tracer(self.exporter))
+
+        self.cl.getHostVLUNs(HOST_NAME1)
+
+        root = self.exporter.spans[-1]
+        self.assertEqual(root.name, 'getHostVLUNs')
+        self.assertIsNone(root.parent_id)
+        self.assertIsNone(root.error)
+        children = self.exporter.get_children(root)
+        self.assertEqual(children[0].name, 'getHost')
+        self.assertEqual(
+            [span.name for span in self.exporter.get_children(children[0])],
+            ['GET /hosts/{name}'])
+        # The VLUNs are fetched by a query or as a full listing.
+        http_spans = [span for span in children if span.kind == 'http']
+        if not http_spans:
+            self.assertEqual(children[1].name, 'getVLUNs')
+            http_spans = self.exporter.get_children(children[1])
+        self.assertEqual(http_spans[0].attributes['route'], '/vluns')
+        self.assertEqual(http_spans[0].attributes['status'], 200)
+
+        self.printFooter('get_host_vluns')
+
+    def test_2_error_and_untraced(self):
+        self.printHeader('error_and_untraced')
+
+        self.cl.setTracer(tracing.Tracer(self.exporter))
+        self.assertRaises(exceptions.HTTPNotFound, self.cl.getVolume,
+                          'UnitTestNonExistVolume')
+        http_span, root = self.exporter.spans
+        self.assertEqual(root.name, 'getVolume')
+        self.assertEqual(root.error, 'HTTPNotFound')
+        self.assertEqual(http_span.error, 'HTTP 404')
+
+        self.cl.setTracer(None)
+        self.cl.getVolume(VOLUME_NAME1)
+        self.assertEqual(len(self.exporter.spans), 2)
+
+        self.printFooter('error_and_untraced')
+
+    def test_3_iter_volumes(self):
+        self.printHeader('iter_volumes')
+
+        self.cl.setTracer(tracing.Tracer(self.exporter))
+        names = [volume['name'] for volume in self.cl.iterVolumes()]
+        self.assertIn(VOLUME_NAME1, names)
+
+        root = self.exporter.spans[-1]
+        self.assertEqual(root.name, 'iterVolumes')
+        self.assertIsNone(root.parent_id)
+        self.assertEqual(
+            [span.name for span in self.exporter.get_children(root)],
+            ['GET /volumes'])
+
+        self.printFooter('iter_volumes')
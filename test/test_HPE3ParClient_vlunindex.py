@@ -0,0 +1,224 @@
+# (c) Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test class of 3PAR Client VLUN topology index."""
+
+import copy
+import mock
+import unittest
+
+from test import HPE3ParClient_base as hpe3parbase
+
+from hpe3parclient import client
+from hpe3parclient import exceptions
+from hpe3parclient import vlunindex
+
+CPG_NAME1 = 'VLUNINDEX_CPG1_' + hpe3parbase.TIME
+VOLUME_NAME1 = 'VLUNINDEX_VOL1_' + hpe3parbase.TIME
+VOLUME_NAME2 = 'VLUNINDEX_VOL2_' + hpe3parbase.TIME
+HOST_NAME1 = 'VLUNINDEX_HOST1_' + hpe3parbase.TIME
+HOST_NAME2 = 'VLUNINDEX_HOST2_' + hpe3parbase.TIME
+PORT1 = {'node': 1, 'slot': 2, 'cardPort': 1}
+PORT2 = {'node': 0, 'slot': 2, 'cardPort': 1}
+
+
+class FakeArray(object):
+
+    def __init__(self):
+        self.vluns = [
+            {'volumeName': 'vol1', 'lun': 1, 'hostname': 'host1',
+             'portPos': PORT1, 'active': True},
+            {'volumeName': 'vol1', 'lun': 1, 'hostname': 'host1',
+             'portPos': PORT2, 'active': True},
+            {'volumeName': 'vol2', 'lun': 2, 'hostname': 'host1',
+             'portPos': PORT1, 'active': True},
+            {'volumeName': 'vol2', 'lun': 1, 'hostname': 'host2',
+             'portPos': PORT1, 'active': True},
+            {'volumeName': 'vol3', 'lun': 5, 'portPos': PORT2,
+             'active': True}]
+        self.requests = 0
+
+    def get_vluns(self):
+        self.requests += 1
+        return {'total': len(self.vluns),
+                'members': copy.deepcopy(self.vluns)}
+
+    def get_volume_vluns(self, name):
+        self.requests += 1
+        members = [copy.deepcopy(vlun) for vlun in self.vluns
+                   if vlun['volumeName'] == name]
+        return {'total': len(members), 'members': members}
+
+
+class VLUNIndexTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.array = FakeArray()
+        self.index = vlunindex.VLUNIndex(self.array.get_vluns,
+                                         self.array.get_volume_vluns, ttl=60)
+
+    def volumes(self, host):
+        return [(vlun['volumeName'], vlun['lun'])
+                for vlun in self.index.find_host(host)]
+
+    def test_find(self):
+        self.assertEqual(self.volumes('host1'),
+                         [('vol1', 1), ('vol1', 1), ('vol2', 2)])
+        self.assertEqual([vlun['hostname'] for vlun in
+                          self.index.find_volume('vol2')], ['host1', 'host2'])
+        self.assertEqual(self.index.find('host2', 1)['volumeName'], 'vol2')
+        self.assertIsNone(self.index.find('host2', 2))
+        self.assertEqual(self.index.find_volume('vol3')[0]['lun'], 5)
+        self.assertEqual(self.array.requests, 1)
+        self.assertEqual(self.index.get_stats(),
+                         {'built': True, 'builds': 1, 'hits': 4,
+                          'vluns': 5, 'hosts': 2, 'volumes': 3})
+
+        # Callers get copies.
+        self.index.find_volume('vol3')[0]['lun'] = 9
+        self.assertEqual(self.index.find_volume('vol3')[0]['lun'], 5)
+
+    def test_refresh_volume(self):
+        self.volumes('host1')
+
+        self.array.vluns.append({'volumeName': 'vol4', 'lun': 3,
+                                 'hostname': 'host2', 'portPos': PORT1})
+        self.index.refresh_volume('vol4')
+        self.array.vluns.pop(2)
+        self.index.refresh_volume('vol2')
+        self.assertEqual(self.volumes('host1'), [('vol1', 1), ('vol1', 1)])
+        # The VLUNs read back go to the end.
+        self.assertEqual(self.volumes('host2'), [('vol4', 3), ('vol2', 1)])
+        self.assertEqual(self.index.builds, 1)
+
+        # VLUNs that can not be read back clear the index.
+        self.index.get_volume_vluns = mock.Mock(
+            side_effect=exceptions.Timeout())
+        self.index.refresh_volume('vol1')
+        self.assertFalse(self.index.built)
+
+    def test_discard(self):
+        self.volumes('host1')
+
+        self.index.discard('vol1', 1, 'host1', PORT2)
+        self.assertEqual(self.volumes('host1'), [('vol1', 1), ('vol2', 2)])
+        self.index.discard('vol2', 1, 'host2')
+        self.assertEqual(self.volumes('host2'), [])
+        self.assertIsNone(self.index.find('host2', 1))
+        self.index.discard('vol3', 5, port=PORT2)
+        self.assertEqual(self.index.find_volume('vol3'), [])
+        # A different LUN is kept.
+        self.index.discard('vol2', 1)
+        self.assertEqual(self.volumes('host1'), [('vol1', 1), ('vol2', 2)])
+
+    def test_rename(self):
+        self.volumes('host1')
+
+        self.index.rename(host='host1', new_host='renamed')
+        self.index.rename(volume='vol2', new_volume='vol5')
+        self.assertEqual(self.volumes('host1'), [])
+        self.assertEqual(self.volumes('renamed'),
+                         [('vol1', 1), ('vol1', 1), ('vol5', 2)])
+        self.assertEqual(self.index.find('renamed', 2)['volumeName'], 'vol5')
+        self.assertEqual(self.index.find_volume('vol2'), [])
+
+    def test_not_built(self):
+        self.index.refresh_volume('vol1')
+        self.index.discard('vol1', 1)
+        self.index.rename(host='host1', new_host='renamed')
+        self.assertEqual(self.array.requests, 0)
+        self.assertFalse(vlunindex.VLUNIndex(None, None).enabled)
+
+
+class HPE3ParClientVLUNIndexTestCase(hpe3parbase.HPE3ParClientBaseTestCase):
+
+    def setUp(self):
+        super(HPE3ParClientVLUNIndexTestCase, self).setUp()
+        url = self.flask_url if self.unitTest else self.url_3par
+        self.icl = client.HPE3ParClient(url, vlun_index_ttl=300)
+        self.icl.login(self.user, self.password)
+        try:
+            self.cl.createCPG(CPG_NAME1, self.CPG_OPTIONS)
+        except Exception:
+            pass
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.createVolume(name, CPG_NAME1, 1024)
+            except Exception:
+                pass
+        for name in (HOST_NAME1, HOST_NAME2):
+            try:
+                self.cl.createHost(name, None, None, {})
+            except Exception:
+                pass
+
+    def tearDown(self):
+        for volume, lun, host in ((VOLUME_NAME1, 1, HOST_NAME1),
+                                  (VOLUME_NAME2, 2, HOST_NAME1)):
+            try:
+                self.cl.deleteVLUN(volume, lun, host)
+            except Exception:
+                pass
+        for name in (HOST_NAME1, HOST_NAME2):
+            try:
+                self.cl.deleteHost(name)
+            except Exception:
+                pass
+        for name in (VOLUME_NAME1, VOLUME_NAME2):
+            try:
+                self.cl.deleteVolume(name)
+            except Exception:
+                pass
+        try:
+            self.cl.deleteCPG(CPG_NAME1)
+        except Exception:
+            pass
+        self.icl.logout()
+        super(HPE3ParClientVLUNIndexTestCase, self).tearDown()
+
+    def test_attach_detach(self):
+        self.printHeader('attach_detach')
+
+        self.icl.createVLUN(VOLUME_NAME1, 1, HOST_NAME1)
+        self.assertEqual(self.icl.getVLUN(VOLUME_NAME1)['lun'], 1)
+
+        with mock.patch.object(self.icl.http, 'get',
+                               wraps=self.icl.http.get) as get:
+            self.icl.createVLUN(VOLUME_NAME2, 2, HOST_NAME1)
+            # Only the VLUNs of the new export were read back.
+            self.assertEqual(get.call_count, 1)
+            self.assertEqual(
+                sorted(vlun['volumeName'] for vlun in
+                       self.icl.getHostVLUNs(HOST_NAME1)),
+                [VOLUME_NAME1, VOLUME_NAME2])
+            self.assertEqual(
+                self.icl.vlun_index.find(HOST_NAME1, 2)['volumeName'],
+                VOLUME_NAME2)
+
+            self.icl.deleteVLUN(VOLUME_NAME1, 1, HOST_NAME1)
+            self.assertRaises(exceptions.HTTPNotFound, self.icl.getVLUN,
+                              VOLUME_NAME1)
+            self.assertIsNone(self.icl.vlun_index.find(HOST_NAME1, 1))
+            self.assertEqual(get.call_count, 1)
+
+            # A host without VLUNs is still looked up.
+            with self.assertRaises(exceptions.HTTPNotFound) as cm:
+                self.icl.getHostVLUNs(HOST_NAME2)
+            self.assertEqual(cm.exception.get_code(), 'NON_EXISTENT_VLUNS')
+            self.assertEqual(get.call_args[0][0], '/hosts/%s' % HOST_NAME2)
+        self.assertRaises(exceptions.HTTPNotFound, self.icl.getHostVLUNs,
+                          'VLUNINDEX_NO_SUCH_HOST')
+        self.assertEqual(self.icl.vlun_index.builds, 1)
+
+        self.printFooter('attach_detach')
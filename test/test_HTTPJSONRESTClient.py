@@ -14,6 +14,10 @@
 
 """Test class of 3PAR Client handling HTTPJSONRESTClient."""
 
+import json
+import math
+import threading
+import time
 import unittest
 import mock
 import requests
@@ -86,7 +90,7 @@ class HTTPJSONRESTClientTestCase(unittest.TestCase):
         http_method = 'fake this'
         http_url = 'http://fake-url:0000'
 
-        with mock.patch('requests.request', retest, create=True):
+        with mock.patch.object(self.http.session, 'request', retest):
             # Test timeout exception
             retest.side_effect = requests.exceptions.Timeout
             self.assertRaises(exceptions.Timeout,
@@ -128,3 +132,333 @@ class HTTPJSONRESTClientTestCase(unittest.TestCase):
             self.assertRaises(requests.exceptions.ConnectionError,
                               self.http.request,
                               http_url, http_method)
+
+    def test_session_pool(self):
+        adapter = self.http.session.get_adapter('https://fake-url:0000')
+        self.assertEqual(adapter._pool_connections, 10)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertFalse(adapter._pool_block)
+
+        pooled = http.HTTPJSONRESTClient('http://fake-url:0000',
+                                         pool_connections=2, pool_maxsize=4,
+                                         pool_block=True)
+        adapter = pooled.session.get_adapter('http://fake-url:0000')
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertTrue(adapter._pool_block)
+
+    def test_keep_alive(self):
+        retest = mock.Mock()
+        retest.side_effect = requests.exceptions.HTTPError
+        http_url = 'http://fake-url:0000'
+
+        with mock.patch.object(self.http.session, 'request', retest):
+            self.assertRaises(exceptions.HTTPError, self.http.request,
+                              http_url, 'GET')
+            headers = retest.call_args[1]['headers']
+            self.assertNotIn('Connection', headers)
+
+            self.http.keep_alive = False
+            self.assertRaises(exceptions.HTTPError, self.http.request,
+                              http_url, 'GET')
+            headers = retest.call_args[1]['headers']
+            self.assertEqual(headers['Connection'], 'close')
+
+    def test_get_pool_stats(self):
+        self.assertEqual(self.http.get_pool_stats(),
+                         {'hits': 0, 'misses': 0, 'pools': 0})
+
+        pool = mock.Mock(num_connections=2, num_requests=7)
+        adapter = self.http.session.get_adapter('http://fake-url:0000')
+        with mock.patch.object(adapter.poolmanager, 'pools',
+                               {'fake-url': pool}):
+            self.assertEqual(self.http.get_pool_stats(),
+                             {'hits': 5, 'misses': 2, 'pools': 1})
+
+    def test_latency_stats(self):
+        resp = mock.Mock(status=200)
+        self.http.request = mock.Mock(return_value=(resp, None))
+
+        self.http._time_request(self.http.api_url + '/volumes/vol1', 'GET')
+        self.http._time_request(self.http.api_url + '/volumes/vol2', 'GET')
+        self.http.request.side_effect = exceptions.HTTPNotFound()
+        self.assertRaises(exceptions.HTTPNotFound, self.http._time_request,
+                          self.http.api_url + '/volumes/vol3', 'GET')
+
+        stats = self.http.get_latency_stats()
+        self.assertEqual(list(stats.keys()), ['GET /volumes/{name}'])
+        self.assertEqual(stats['GET /volumes/{name}']['count'], 3)
+        self.assertEqual(stats['GET /volumes/{name}']['statuses'],
+                         {200: 2, 404: 1})
+
+        self.http.reset_latency_stats()
+        self.assertEqual(self.http.get_latency_stats(), {})
+
+    def test_latency_stats_no_http_status(self):
+        # Timeout has no http_status, it is recorded without a status.
+        self.http.request = mock.Mock(side_effect=exceptions.Timeout())
+        self.assertRaises(exceptions.Timeout, self.http._time_request,
+                          self.http.api_url + '/volumes/vol1', 'GET')
+
+        stats = self.http.get_latency_stats()
+        self.assertEqual(stats['GET /volumes/{name}']['count'], 1)
+        self.assertEqual(stats['GET /volumes/{name}']['statuses'],
+                         {None: 1})
+
+    def test_json_loads(self):
+        self.assertEqual(http.json_loads(b'{"name": "vol1", "id": 1}'),
+                         {'name': 'vol1', 'id': 1})
+        self.assertEqual(http.json_loads('{"name": "vol1"}'),
+                         {'name': 'vol1'})
+        # orjson rejects NaN, json does not.
+        self.assertTrue(math.isnan(http.json_loads(b'[NaN]')[0]))
+        self.assertRaises(ValueError, http.json_loads, b'<html></html>')
+
+    def test_decode_stats(self):
+        events = []
+        self.http.metrics.register(
+            lambda event, data: events.append((event, data)))
+
+        headers = requests.structures.CaseInsensitiveDict()
+        response = mock.Mock(status_code=200, headers=headers,
+                             content=b'{"members": [{"name": "vol1"}]}',
+                             url='http://fake-url:0000/volumes')
+        with mock.patch.object(self.http.session, 'request',
+                               mock.Mock(return_value=response)):
+            resp, body = self.http.get('/volumes')
+            self.assertEqual(body, {'members': [{'name': 'vol1'}]})
+
+            # A body that is not JSON is returned as text.
+            response.content = b'<html>Bad Gateway</html>'
+            resp, body = self.http.get('/volumes')
+            self.assertEqual(body, u'<html>Bad Gateway</html>')
+
+        stats = self.http.get_decode_stats()
+        self.assertEqual(stats['GET /volumes']['count'], 2)
+        self.assertGreaterEqual(events[0][1]['decode_time'], 0)
+        self.assertLessEqual(events[0][1]['decode_time'],
+                             events[0][1]['latency'])
+
+        self.http.reset_latency_stats()
+        self.assertEqual(self.http.get_decode_stats(), {})
+
+    def test_timings_ring_buffer(self):
+        resp = mock.Mock(status=200)
+        self.http.request = mock.Mock(return_value=(resp, None))
+
+        # Raw timings are opt-in.
+        self.http._time_request(self.http.api_url + '/volumes', 'GET')
+        self.assertEqual(self.http.get_timings(), [])
+
+        bounded = http.HTTPJSONRESTClient('http://fake-url:0000',
+                                          max_timings=2)
+        bounded.request = self.http.request
+        for name in ('vol1', 'vol2', 'vol3'):
+            bounded._time_request(bounded.api_url + '/volumes/' + name,
+                                  'GET')
+        timings = bounded.get_timings()
+        self.assertEqual([t[0] for t in timings],
+                         ['GET http://fake-url:0000/volumes/vol2',
+                          'GET http://fake-url:0000/volumes/vol3'])
+
+    def test_metrics_hooks(self):
+        events = []
+        self.http.metrics.register(
+            lambda event, data: events.append((event, data)))
+
+        headers = requests.structures.CaseInsensitiveDict()
+        response = mock.Mock(status_code=200, headers=headers,
+                             content=b'{"a": 1}',
+                             url='http://fake-url:0000/volumes')
+        with mock.patch.object(self.http.session, 'request',
+                               mock.Mock(return_value=response)):
+            self.http.post('/volumes', body={'name': 'vol1'})
+
+        self.assertEqual(len(events), 1)
+        event, data = events[0]
+        self.assertEqual(event, 'http_request')
+        self.assertEqual(data['method'], 'POST')
+        self.assertEqual(data['route'], '/volumes')
+        self.assertEqual(data['status'], 200)
+        self.assertEqual(data['retries'], 0)
+        self.assertEqual(data['bytes_sent'], len('{"name": "vol1"}'))
+        self.assertEqual(data['bytes_received'], 8)
+
+    def _run_concurrent_gets(self, url, uncached, count=5):
+        """GET url from count threads, while uncached blocks the first."""
+        release = threading.Event()
+        results = []
+        errors = []
+
+        def slow_uncached(*args, **kwargs):
+            release.wait(10)
+            return uncached(*args, **kwargs)
+
+        def get():
+            try:
+                results.append(self.http.get(url))
+            except Exception as ex:
+                errors.append(ex)
+
+        with mock.patch.object(self.http, '_cs_request_uncached',
+                               side_effect=slow_uncached) as mock_uncached:
+            threads = [threading.Thread(target=get) for i in range(count)]
+            for thread in threads:
+                thread.start()
+            # Wait until every thread has joined the request in flight.
+            for i in range(1000):
+                if self.http.get_coalesce_stats()['coalesced'] == count - 1:
+                    break
+                threading.Event().wait(0.01)
+            release.set()
+            for thread in threads:
+                thread.join(10)
+        return mock_uncached, results, errors
+
+    def test_coalesce_gets(self):
+        mock_uncached, results, errors = self._run_concurrent_gets(
+            '/vluns', lambda url, method: ({}, {'members': [1]}))
+
+        self.assertEqual(mock_uncached.call_count, 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(results), 5)
+        for resp, body in results:
+            self.assertEqual(body, {'members': [1]})
+        # Every caller got its own copy.
+        self.assertEqual(len(set(id(body) for resp, body in results)), 5)
+        self.assertEqual(self.http.get_coalesce_stats(),
+                         {'requests': 1, 'coalesced': 4, 'in_flight': 0})
+
+    def test_coalesce_gets_error(self):
+        def not_found(url, method):
+            raise exceptions.HTTPNotFound({'code': 23, 'desc': 'not found'})
+
+        mock_uncached, results, errors = self._run_concurrent_gets(
+            '/hosts/host1', not_found)
+
+        self.assertEqual(mock_uncached.call_count, 1)
+        self.assertEqual(results, [])
+        self.assertEqual(len(errors), 5)
+        for ex in errors:
+            self.assertIsInstance(ex, exceptions.HTTPNotFound)
+            self.assertEqual(ex.get_code(), 23)
+
+    def test_coalesce_gets_sequential(self):
+        with mock.patch.object(self.http, '_cs_request_uncached',
+                               return_value=({}, {})) as mock_uncached:
+            self.http.get('/vluns')
+            self.http.get('/vluns')
+            self.http.post('/vluns', body={})
+
+        # Only calls that overlap are coalesced.
+        self.assertEqual(mock_uncached.call_count, 3)
+        self.assertEqual(self.http.get_coalesce_stats()['coalesced'], 0)
+
+    def test_coalesce_gets_after_write(self):
+        sent = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def uncached(url, method, **kwargs):
+            if method == 'GET' and not sent.is_set():
+                sent.set()
+                release.wait(5)
+                return {}, {'sizeMiB': 1024}
+            return {}, {'sizeMiB': 2048}
+
+        def get(results):
+            results.append(self.http.get('/volumes/vol1')[1])
+
+        before, after = [], []
+        with mock.patch.object(self.http, '_cs_request_uncached',
+                               side_effect=uncached):
+            thread = threading.Thread(target=get, args=(before,))
+            thread.start()
+            self.assertTrue(sent.wait(5))
+            self.http.put('/volumes/vol1', body={'sizeMiB': 2048})
+
+            # Sent after the grow, so it doesn't wait for the GET sent
+            # before it.
+            after_thread = threading.Thread(target=get, args=(after,))
+            after_thread.start()
+            after_thread.join(5)
+            self.assertEqual(after, [{'sizeMiB': 2048}])
+            release.set()
+            thread.join(5)
+
+        self.assertEqual(before, [{'sizeMiB': 1024}])
+        self.assertEqual(self.http.get_coalesce_stats(),
+                         {'requests': 2, 'coalesced': 0, 'in_flight': 0})
+
+    def _fake_array(self, login_delay=0):
+        """A session.request that only takes the latest session key."""
+        array = {'key': None, 'logins': 0, 'requests': []}
+        lock = threading.Lock()
+
+        def request(method, url, data=None, headers=None, **kwargs):
+            path = url[len(self.http.api_url):]
+            with lock:
+                array['requests'].append((method, path))
+            if path == '/credentials':
+                time.sleep(login_delay)
+                with lock:
+                    array['logins'] += 1
+                    array['key'] = 'key%d' % array['logins']
+                status, body = 201, {'key': array['key']}
+            elif headers.get(self.http.SESSION_COOKIE_NAME) != array['key']:
+                status, body = 401, {'code': 6, 'desc': 'invalid session'}
+            else:
+                status, body = 200, {'path': path}
+            return mock.Mock(status_code=status,
+                             headers=requests.structures.CaseInsensitiveDict(),
+                             content=json.dumps(body).encode('utf-8'),
+                             url=url)
+
+        return array, mock.patch.object(self.http.session, 'request',
+                                        side_effect=request)
+
+    def test_single_flight_reauth(self):
+        array, patch = self._fake_array(login_delay=0.2)
+        results = []
+        with patch:
+            self.http.authenticate('user', 'pass')
+            # The array forgets the session.
+            array['key'] = 'expired'
+
+            def get(i):
+                results.append(self.http.get('/volumes/vol%d' % i)[1])
+
+            threads = [threading.Thread(target=get, args=(i,))
+                       for i in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(len(results), 5)
+        # One login, not one per thread.
+        self.assertEqual(array['logins'], 2)
+        self.assertEqual(self.http.session_key, 'key2')
+
+    def test_proactive_refresh(self):
+        self.http.session_max_age = 600
+        array, patch = self._fake_array()
+        events = []
+        self.http.metrics.register(
+            lambda event, data: events.append((event, data)))
+        with patch:
+            self.http.authenticate('user', 'pass')
+            self.http.get('/volumes')
+            with mock.patch('time.time', return_value=time.time() + 601):
+                self.http.get('/volumes')
+
+        # Logged in again before the request, not after a 401, and the
+        # old session deleted.
+        self.assertEqual(array['requests'],
+                         [('POST', '/credentials'), ('GET', '/volumes'),
+                          ('POST', '/credentials'),
+                          ('DELETE', '/credentials/key1'),
+                          ('GET', '/volumes')])
+        reauths = [data for event, data in events if event == 'http_reauth']
+        self.assertEqual(reauths, [{'method': 'GET', 'route': '/volumes',
+                                    'proactive': True}])